@@ -1,12 +1,16 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, Dict, Iterable, List, Optional
 
 from .enums import SeatClass
+from .observable import Observable
+
+# буквы мест ряда слева направо; пробел — проход
+DEFAULT_SEAT_LAYOUT = "ABC DEF"
 
 
 @dataclass
-class Seat:
+class Seat(Observable):
     seat_number: str
     seat_class: SeatClass
     is_available: bool = True
@@ -16,14 +20,108 @@ class Seat:
         if not self.is_available:
             raise ValueError("Seat already reserved")
         self.is_available = False
+        self._notify("is_available")
 
     def release(self) -> None:
         self.is_available = True
+        self._notify("is_available")
 
     def is_premium(self) -> bool:
         return self.seat_class in {SeatClass.BUSINESS, SeatClass.FIRST}
 
 
+@dataclass
+class SeatMap:
+    """Compact seat map: seat number -> slot, plus a free-seat bitset per class.
+
+    ``layout`` lists a row's seat letters from left to right with a space for
+    each aisle, e.g. ``"ABC DEF"`` or ``"AC DEFG HK"``.
+    """
+
+    _seats: List[Seat] = field(default_factory=list)
+    _slots: Dict[str, int] = field(default_factory=dict)
+    _free: Dict[SeatClass, int] = field(default_factory=dict)
+    layout: str = DEFAULT_SEAT_LAYOUT
+
+    @classmethod
+    def of(cls, seats: Iterable[Seat], layout: str = DEFAULT_SEAT_LAYOUT) -> "SeatMap":
+        seat_map = cls(layout=layout)
+        for seat in seats:
+            seat_map.add(seat)
+        return seat_map
+
+    def add(self, seat: Seat) -> int:
+        if seat.seat_number in self._slots:
+            raise ValueError(f"Seat {seat.seat_number} already exists")
+        slot = len(self._seats)
+        self._seats.append(seat)
+        self._slots[seat.seat_number] = slot
+        self._free.setdefault(seat.seat_class, 0)
+        self._set_bit(seat, slot)
+        seat.add_observer(self._on_seat_changed)
+        return slot
+
+    def slot_of(self, seat_number: str) -> Optional[int]:
+        return self._slots.get(seat_number)
+
+    def seat(self, seat_number: str) -> Optional[Seat]:
+        slot = self._slots.get(seat_number)
+        return self._seats[slot] if slot is not None else None
+
+    def is_available(self, seat_number: str) -> bool:
+        slot = self._slots.get(seat_number)
+        if slot is None:
+            return False
+        return bool(self._free.get(self._seats[slot].seat_class, 0) >> slot & 1)
+
+    def available_count(self, seat_class: Optional[SeatClass] = None) -> int:
+        if seat_class is not None:
+            return self._free.get(seat_class, 0).bit_count()
+        return sum(bits.bit_count() for bits in self._free.values())
+
+    def available(self, seat_class: Optional[SeatClass] = None) -> List[Seat]:
+        if seat_class is not None:
+            bits = self._free.get(seat_class, 0)
+        else:
+            bits = 0
+            for class_bits in self._free.values():
+                bits |= class_bits
+        seats: List[Seat] = []
+        while bits:
+            lowest = bits & -bits
+            seats.append(self._seats[lowest.bit_length() - 1])
+            bits ^= lowest
+        return seats
+
+    def column_of(self, letter: str) -> Optional[int]:
+        """Position of ``letter`` across the row, or ``None`` if the layout has no such seat."""
+        column = self.layout.replace(" ", "").find(letter)
+        return column if column >= 0 and len(letter) == 1 else None
+
+    def seat_blocks(self) -> List[int]:
+        """Column bitmasks of the seat groups between aisles."""
+        blocks: List[int] = []
+        column = 0
+        for group in self.layout.split():
+            blocks.append(((1 << len(group)) - 1) << column)
+            column += len(group)
+        return blocks
+
+    def __len__(self) -> int:
+        return len(self._seats)
+
+    def _set_bit(self, seat: Seat, slot: int) -> None:
+        if seat.is_available:
+            self._free[seat.seat_class] |= 1 << slot
+        else:
+            self._free[seat.seat_class] &= ~(1 << slot)
+
+    def _on_seat_changed(self, seat: Seat, attribute: str) -> None:
+        slot = self._slots.get(seat.seat_number)
+        if slot is not None and self._seats[slot] is seat:
+            self._set_bit(seat, slot)
+
+
 @dataclass
 class Aircraft:
     registration: str
@@ -33,12 +131,38 @@ class Aircraft:
     manufacturer: str = ""
     range_km: int = 0
     in_service: bool = True
+    seat_layout: str = DEFAULT_SEAT_LAYOUT
+    seat_map: SeatMap = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.seat_map = SeatMap.of(self.seats, self.seat_layout)
 
     def add_seat(self, seat: Seat) -> None:
+        self.seat_map.add(seat)
         self.seats.append(seat)
 
     def available_seats(self) -> List[Seat]:
-        return [s for s in self.seats if s.is_available]
+        return self.seat_map.available()
+
+    def available_seat_count(self, seat_class: Optional[SeatClass] = None) -> int:
+        return self.seat_map.available_count(seat_class)
+
+    def find_seat(self, seat_number: str) -> Optional[Seat]:
+        return self.seat_map.seat(seat_number)
+
+    def reserve_seat(self, seat_number: str) -> Seat:
+        seat = self.seat_map.seat(seat_number)
+        if seat is None:
+            raise ValueError(f"Unknown seat {seat_number}")
+        seat.reserve()
+        return seat
+
+    def release_seat(self, seat_number: str) -> Seat:
+        seat = self.seat_map.seat(seat_number)
+        if seat is None:
+            raise ValueError(f"Unknown seat {seat_number}")
+        seat.release()
+        return seat
 
     def add_flight_hours(self, hours: int) -> None:
         if hours <= 0:
@@ -50,3 +174,13 @@ class Aircraft:
 
     def is_long_haul(self) -> bool:
         return self.range_km >= 6000
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # карта мест восстанавливается из списка мест, наблюдатели не сериализуются
+        state = dict(self.__dict__)
+        state.pop("seat_map", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.seat_map = SeatMap.of(self.seats)
@@ -2,6 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
+from . import events
 from .enums import BaggageStatus
 
 
@@ -26,14 +27,21 @@ class BaggageItem:
     def check_in(self, location: str) -> None:
         self.status = BaggageStatus.CHECKED_IN
         self.location = location
+        if events.has_sinks():
+            events.publish(events.BaggageCheckedIn(self.tag.tag_id, self.tag.booking_id, location, self.weight_kg))
 
     def mark_loaded(self, location: str) -> None:
         self.status = BaggageStatus.LOADED
         self.location = location
+        if events.has_sinks():
+            events.publish(events.BaggageLoaded(self.tag.tag_id, location))
 
     def mark_lost(self) -> None:
+        last_location = self.location
         self.status = BaggageStatus.LOST
         self.location = None
+        if events.has_sinks():
+            events.publish(events.BaggageLost(self.tag.tag_id, last_location))
 
     def volume_liters(self) -> float:
         return round(self.length_cm * self.width_cm * self.height_cm / 1000.0, 2)
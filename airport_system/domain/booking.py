@@ -3,7 +3,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List
 
+from . import events
 from .enums import BookingStatus
+from .payment import Payment
 
 
 @dataclass
@@ -23,21 +25,38 @@ class Booking:
             raise ValueError("Only newly created bookings can be confirmed")
         self.status = BookingStatus.CONFIRMED
         self.touch()
+        if events.has_sinks():
+            events.publish(events.BookingConfirmed(self.booking_id, self.passenger_id, self.flight_id))
 
     def cancel(self) -> None:
         if self.status in (BookingStatus.CANCELLED, BookingStatus.COMPLETED):
             raise ValueError("Booking already finalized")
         self.status = BookingStatus.CANCELLED
         self.touch()
+        if events.has_sinks():
+            events.publish(events.BookingCancelled(self.booking_id, self.passenger_id, self.flight_id))
+
+    def complete(self) -> None:
+        if self.status in (BookingStatus.CANCELLED, BookingStatus.COMPLETED):
+            raise ValueError("Booking already finalized")
+        was_confirmed = self.status != BookingStatus.CREATED
+        self.status = BookingStatus.COMPLETED
+        self.touch()
+        if events.has_sinks():
+            events.publish(
+                events.BookingCompleted(self.booking_id, self.passenger_id, self.flight_id, was_confirmed)
+            )
 
     def add_ticket(self, ticket_id: str) -> None:
         if ticket_id not in self.ticket_ids:
             self.ticket_ids.append(ticket_id)
             self.touch()
 
-    def add_payment(self, payment_id: str) -> None:
-        if payment_id not in self.payment_ids:
-            self.payment_ids.append(payment_id)
+    def add_payment(self, payment: Payment) -> None:
+        if payment.booking_id != self.booking_id or not payment.is_successful():
+            raise ValueError(f"Payment {payment.payment_id} is not a completed payment of {self.booking_id}")
+        if payment.payment_id not in self.payment_ids:
+            self.payment_ids.append(payment.payment_id)
             self.touch()
 
     def mark_checked_in(self) -> None:
@@ -0,0 +1,138 @@
+from __future__ import annotations
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from ..utils.time_utils import now_utc
+
+if TYPE_CHECKING:
+    from .payment import Money
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    occurred_at: datetime = field(default_factory=now_utc, kw_only=True, compare=False)
+
+
+@dataclass(frozen=True)
+class BookingConfirmed(DomainEvent):
+    booking_id: str
+    passenger_id: str
+    flight_id: str
+
+
+@dataclass(frozen=True)
+class BookingCancelled(DomainEvent):
+    booking_id: str
+    passenger_id: str
+    flight_id: str
+
+
+@dataclass(frozen=True)
+class BookingCompleted(DomainEvent):
+    booking_id: str
+    passenger_id: str
+    flight_id: str
+    was_confirmed: bool = False
+
+
+@dataclass(frozen=True)
+class FlightDelayed(DomainEvent):
+    flight_id: str
+    minutes: int
+    departure_time: datetime
+    previous_departure_time: datetime
+
+
+@dataclass(frozen=True)
+class FlightDeparted(DomainEvent):
+    flight_id: str
+    departure_time: datetime
+    was_delayed: bool = False
+    delay_minutes: int = 0
+
+
+@dataclass(frozen=True)
+class FlightArrived(DomainEvent):
+    flight_id: str
+    arrival_time: datetime
+
+
+@dataclass(frozen=True)
+class FlightCancelled(DomainEvent):
+    flight_id: str
+    departure_time: datetime
+
+
+@dataclass(frozen=True)
+class BaggageCheckedIn(DomainEvent):
+    tag_id: str
+    booking_id: str
+    location: str
+    weight_kg: float
+
+
+@dataclass(frozen=True)
+class BaggageLoaded(DomainEvent):
+    tag_id: str
+    location: str
+
+
+@dataclass(frozen=True)
+class BaggageLost(DomainEvent):
+    tag_id: str
+    last_location: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PaymentCompleted(DomainEvent):
+    payment_id: str
+    booking_id: str
+    amount: "Money"
+
+
+@dataclass(frozen=True)
+class PaymentDeclined(DomainEvent):
+    payment_id: str
+    booking_id: str
+    amount: "Money"
+
+
+@dataclass(frozen=True)
+class PaymentRefunded(DomainEvent):
+    payment_id: str
+    booking_id: str
+    amount: "Money"
+
+
+EventSink = Callable[[DomainEvent], None]
+
+# кортеж заменяется целиком, поэтому публикация не требует блокировки
+_sinks: Tuple[EventSink, ...] = ()
+
+
+def add_sink(sink: EventSink) -> None:
+    global _sinks
+    if sink not in _sinks:
+        _sinks = _sinks + (sink,)
+
+
+def remove_sink(sink: EventSink) -> None:
+    global _sinks
+    _sinks = tuple(s for s in _sinks if s != sink)
+
+
+def has_sinks() -> bool:
+    return bool(_sinks)
+
+
+def publish(event: DomainEvent) -> None:
+    """Hand ``event`` to every sink; a failing sink is logged and never fails the publisher."""
+    for sink in _sinks:
+        try:
+            sink(event)
+        except Exception:
+            logger.exception("Event sink failed on %s", type(event).__name__)
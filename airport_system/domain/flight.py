@@ -4,11 +4,13 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from .aircraft import Aircraft
+from . import events
 from .enums import FlightStatus
+from .observable import Observable
 
 
 @dataclass
-class Flight:
+class Flight(Observable):
     flight_id: str
     origin: str
     destination: str
@@ -19,20 +21,36 @@ class Flight:
     gate_id: Optional[str] = None
     terminal_code: Optional[str] = None
     distance_km: int = 0
+    delay_minutes: int = 0
 
     def delay(self, minutes: int) -> None:
         if minutes <= 0:
             raise ValueError("Delay minutes must be positive")
         delta = timedelta(minutes=minutes)
+        previous = self.departure_time
         self.departure_time = self.departure_time + delta
         self.arrival_time = self.arrival_time + delta
         self.status = FlightStatus.DELAYED
+        self.delay_minutes += minutes
+        self._notify("departure_time")
+        if events.has_sinks():
+            events.publish(events.FlightDelayed(self.flight_id, minutes, self.departure_time, previous))
 
     def depart(self) -> None:
+        was_delayed = self.status == FlightStatus.DELAYED
         self.status = FlightStatus.DEPARTED
+        if events.has_sinks():
+            events.publish(events.FlightDeparted(self.flight_id, self.departure_time, was_delayed, self.delay_minutes))
 
     def arrive(self) -> None:
         self.status = FlightStatus.ARRIVED
+        if events.has_sinks():
+            events.publish(events.FlightArrived(self.flight_id, self.arrival_time))
+
+    def cancel(self) -> None:
+        self.status = FlightStatus.CANCELLED
+        if events.has_sinks():
+            events.publish(events.FlightCancelled(self.flight_id, self.departure_time))
 
     def assign_gate(self, gate_id: str, terminal_code: str) -> None:
         self.gate_id = gate_id
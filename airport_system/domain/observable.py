@@ -0,0 +1,30 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List
+
+
+Observer = Callable[[Any, str], None]
+
+
+class Observable:
+    """Mixin that lets collaborators react to in-place changes of a domain object.
+
+    Observers are called as ``observer(obj, attribute)`` after the change and are
+    never pickled or copied together with the object.
+    """
+
+    def add_observer(self, observer: Observer) -> None:
+        self.__dict__.setdefault("_observers", []).append(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        observers: List[Observer] = self.__dict__.get("_observers", [])
+        if observer in observers:
+            observers.remove(observer)
+
+    def _notify(self, attribute: str) -> None:
+        for observer in list(self.__dict__.get("_observers", ())):
+            observer(self, attribute)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state.pop("_observers", None)
+        return state
@@ -1,33 +1,135 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Protocol
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple, Union
 
+from . import events
 from .enums import PaymentStatus
+from ..utils.time_utils import now_utc
 
 
-@dataclass
+Amount = Union[int, float, str, Decimal]
+
+
+def _to_minor(amount: Amount, precision: int) -> int:
+    if isinstance(amount, int):
+        return amount * 10 ** precision
+    # через Decimal(str(...)), чтобы 1.005 округлялось как записано, а не как хранится во float
+    return int(Decimal(str(amount)).scaleb(precision).to_integral_value(ROUND_HALF_UP))
+
+
+@dataclass(init=False)
 class Money:
-    amount: float
-    currency: str = "USD"
-    precision: int = 2
+    """Amount held as an exact integer number of minor units (cents for ``precision=2``).
+
+    ``Money(12.34)`` is converted once; arithmetic then works on integers.
+    ``amount`` gives the value back in major units.
+    """
+
+    minor_units: int
+    currency: str
+    precision: int
+
+    def __init__(self, amount: Amount, currency: str = "USD", precision: int = 2) -> None:
+        self.minor_units = _to_minor(amount, precision)
+        self.currency = currency
+        self.precision = precision
+
+    @classmethod
+    def from_minor(cls, minor_units: int, currency: str = "USD", precision: int = 2) -> "Money":
+        money = cls.__new__(cls)
+        money.minor_units = minor_units
+        money.currency = currency
+        money.precision = precision
+        return money
+
+    @property
+    def amount(self) -> float:
+        return self.minor_units / 10 ** self.precision
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.minor_units).scaleb(-self.precision)
 
     def allocate(self, parts: int) -> float:
         if parts <= 0:
             raise ValueError("Parts must be positive")
         return round(self.amount / parts, self.precision)
 
+    def split(self, parts: int) -> List["Money"]:
+        """``parts`` shares that differ by at most one minor unit and sum to exactly this amount."""
+        if parts <= 0:
+            raise ValueError("Parts must be positive")
+        return self.allocate_ratios([1] * parts)
+
+    def allocate_ratios(self, ratios: Sequence[int]) -> List["Money"]:
+        """Split in proportion to ``ratios`` by the largest-remainder method.
+
+        Leftover minor units go to the shares with the largest fractional
+        parts (earlier shares first on ties), so a zero ratio gets nothing.
+        """
+        total = sum(ratios)
+        if not ratios or total <= 0 or any(r < 0 for r in ratios):
+            raise ValueError("Ratios must be non-negative with a positive sum")
+        shares = [self.minor_units * r // total for r in ratios]
+        leftover = self.minor_units - sum(shares)
+        by_remainder = sorted(range(len(ratios)), key=lambda i: -(self.minor_units * ratios[i] % total))
+        for index in by_remainder[:leftover]:
+            shares[index] += 1
+        return [Money.from_minor(share, self.currency, self.precision) for share in shares]
+
     def add(self, other: "Money") -> "Money":
-        if self.currency != other.currency:
-            raise ValueError("Currency mismatch")
-        return Money(self.amount + other.amount, self.currency, self.precision)
+        self._check_compatible(other)
+        return Money.from_minor(self.minor_units + other.minor_units, self.currency, self.precision)
 
     def subtract(self, other: "Money") -> "Money":
+        self._check_compatible(other)
+        return Money.from_minor(self.minor_units - other.minor_units, self.currency, self.precision)
+
+    __add__ = add
+    __sub__ = subtract
+
+    def percentage(self, percent: float) -> "Money":
+        minor = (Decimal(self.minor_units) * Decimal(str(percent)) / 100).to_integral_value(ROUND_HALF_UP)
+        return Money.from_minor(int(minor), self.currency, self.precision)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # журналы и SQLite, записанные до перехода на минорные единицы, хранят ``amount``
+        if "minor_units" not in state:
+            state = dict(state)
+            state["minor_units"] = _to_minor(state.pop("amount"), state.get("precision", 2))
+        self.__dict__.update(state)
+
+    def _check_compatible(self, other: "Money") -> None:
         if self.currency != other.currency:
             raise ValueError("Currency mismatch")
-        return Money(self.amount - other.amount, self.currency, self.precision)
+        if self.precision != other.precision:
+            raise ValueError("Precision mismatch")
 
-    def percentage(self, percent: float) -> "Money":
-        return Money(self.amount * percent / 100.0, self.currency, self.precision)
+
+_minor_units_of = attrgetter("minor_units")
+_kind_of = attrgetter("currency", "precision")
+
+
+def sum_money(amounts: Iterable[Money], currency: str = "USD", precision: int = 2) -> Money:
+    """Exact total of same-currency amounts; an empty input gives zero in ``currency``."""
+    amounts = list(amounts)
+    if set(map(_kind_of, amounts)) - {(currency, precision)}:
+        raise ValueError("Currency mismatch")
+    return Money.from_minor(sum(map(_minor_units_of, amounts)), currency, precision)
+
+
+def totals_by_currency(amounts: Iterable[Money]) -> Dict[str, Money]:
+    """Exact per-currency totals, e.g. for settlement reports."""
+    minor: Dict[str, int] = {}
+    precision: Dict[str, int] = {}
+    for money in amounts:
+        known = precision.setdefault(money.currency, money.precision)
+        if known != money.precision:
+            raise ValueError("Precision mismatch")
+        minor[money.currency] = minor.get(money.currency, 0) + money.minor_units
+    return {currency: Money.from_minor(units, currency, precision[currency]) for currency, units in minor.items()}
 
 
 class PaymentMethod(Protocol):
@@ -59,18 +161,34 @@ class Payment:
     status: PaymentStatus = PaymentStatus.PENDING
     provider: str = "CARD"
     metadata: Dict[str, str] = field(default_factory=dict)
+    idempotency_key: Optional[str] = None
+    status_history: List[Tuple[datetime, PaymentStatus]] = field(default_factory=list, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.status_history:
+            self.status_history.append((now_utc(), self.status))
 
     def mark_completed(self) -> None:
-        self.status = PaymentStatus.COMPLETED
+        self._set_status(PaymentStatus.COMPLETED)
+        if events.has_sinks():
+            events.publish(events.PaymentCompleted(self.payment_id, self.booking_id, self.amount))
 
     def mark_declined(self) -> None:
-        self.status = PaymentStatus.DECLINED
+        self._set_status(PaymentStatus.DECLINED)
+        if events.has_sinks():
+            events.publish(events.PaymentDeclined(self.payment_id, self.booking_id, self.amount))
 
     def mark_refunded(self) -> None:
-        self.status = PaymentStatus.REFUNDED
+        self._set_status(PaymentStatus.REFUNDED)
+        if events.has_sinks():
+            events.publish(events.PaymentRefunded(self.payment_id, self.booking_id, self.amount))
 
     def is_successful(self) -> bool:
         return self.status == PaymentStatus.COMPLETED
 
     def add_metadata(self, key: str, value: str) -> None:
         self.metadata[key] = value
+
+    def _set_status(self, status: PaymentStatus) -> None:
+        self.status = status
+        self.status_history.append((now_utc(), status))
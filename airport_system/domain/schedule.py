@@ -1,7 +1,8 @@
 from __future__ import annotations
+import random
 from dataclasses import dataclass, field
-from datetime import date
-from typing import Dict, List
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from .flight import Flight
 
@@ -11,9 +12,15 @@ class DailySchedule:
     day: date
     flights: List[Flight] = field(default_factory=list)
     notes: str = ""
+    # AirportSchedule, владеющий днём, индексирует добавленные напрямую рейсы
+    _on_add: Optional[Callable[["DailySchedule", Flight], None]] = field(
+        default=None, repr=False, compare=False
+    )
 
     def add_flight(self, flight: Flight) -> None:
         self.flights.append(flight)
+        if self._on_add is not None:
+            self._on_add(self, flight)
 
     def flights_from(self, origin: str) -> List[Flight]:
         return [f for f in self.flights if f.origin == origin]
@@ -24,13 +31,31 @@ class DailySchedule:
 
 @dataclass
 class AirportSchedule:
+    """Flights bucketed by departure date.
+
+    ``flight_id -> (day, position)`` makes removal a swap with the last entry
+    of the day, so the order inside a day is not preserved. Delays move the
+    flight to its new day through the flight's observer hook. Flights passed
+    in ``days`` are indexed on construction, and flights added through a
+    day's :meth:`DailySchedule.add_flight` are indexed as they arrive; the
+    day lists must not be mutated in any other way.
+    """
+
     days: Dict[date, DailySchedule] = field(default_factory=dict)
+    _positions: Dict[str, Tuple[date, int]] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for day, schedule in self.days.items():
+            schedule._on_add = self._on_day_added
+            for index, flight in enumerate(schedule.flights):
+                self._positions[flight.flight_id] = (day, index)
+                flight.add_observer(self._on_flight_changed)
 
     def add_flight(self, flight: Flight) -> None:
-        day = flight.departure_time.date()
-        if day not in self.days:
-            self.days[day] = DailySchedule(day)
-        self.days[day].add_flight(flight)
+        if flight.flight_id in self._positions:
+            self.remove_flight(flight.flight_id)
+        self._place(flight)
+        flight.add_observer(self._on_flight_changed)
 
     def flights_on(self, day: date) -> List[Flight]:
         schedule = self.days.get(day)
@@ -39,6 +64,191 @@ class AirportSchedule:
     def total_flights(self) -> int:
         return sum(len(d.flights) for d in self.days.values())
 
-    def remove_flight(self, flight_id: str) -> None:
-        for schedule in self.days.values():
-            schedule.flights = [f for f in schedule.flights if f.flight_id != flight_id]
+    def remove_flight(self, flight_id: str) -> Optional[Flight]:
+        flight = self._take(flight_id)
+        if flight is not None:
+            flight.remove_observer(self._on_flight_changed)
+        return flight
+
+    def reschedule(self, flight: Flight) -> None:
+        """Move ``flight`` to the bucket of its current departure date."""
+        position = self._positions.get(flight.flight_id)
+        if position is not None and position[0] != flight.departure_time.date():
+            self._take(flight.flight_id)
+            self._place(flight)
+
+    def _place(self, flight: Flight) -> None:
+        day = flight.departure_time.date()
+        schedule = self.days.get(day)
+        if schedule is None:
+            schedule = self.days[day] = DailySchedule(day, _on_add=self._on_day_added)
+        self._positions[flight.flight_id] = (day, len(schedule.flights))
+        schedule.flights.append(flight)
+
+    def _take(self, flight_id: str) -> Optional[Flight]:
+        position = self._positions.get(flight_id)
+        if position is None:
+            return None
+        del self._positions[flight_id]
+        day, index = position
+        flights = self.days[day].flights
+        flight = flights[index]
+        last = flights.pop()
+        if last is not flight:
+            flights[index] = last
+            self._positions[last.flight_id] = (day, index)
+        return flight
+
+    def _on_day_added(self, schedule: DailySchedule, flight: Flight) -> None:
+        # рейс уже добавлен в конец списка дня: убираем прежнюю запись и индексируем новую
+        schedule.flights.pop()
+        self.remove_flight(flight.flight_id)
+        self._positions[flight.flight_id] = (schedule.day, len(schedule.flights))
+        schedule.flights.append(flight)
+        flight.add_observer(self._on_flight_changed)
+
+    def _on_flight_changed(self, flight: Any, attribute: str) -> None:
+        if attribute == "departure_time":
+            self.reschedule(flight)
+
+
+_Key = Tuple[datetime, str]
+
+
+class _Node:
+    __slots__ = ("key", "flight", "end", "priority", "max_end", "left", "right")
+
+    def __init__(self, key: _Key, flight: Flight) -> None:
+        self.key = key
+        self.flight = flight
+        self.end = flight.arrival_time
+        self.priority = random.random()
+        self.max_end = self.end
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+    def refresh(self) -> None:
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _split(node: Optional[_Node], key: _Key, inclusive: bool) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split into keys ``< key`` (``<= key`` when inclusive) and the rest."""
+    if node is None:
+        return None, None
+    if node.key < key or (inclusive and node.key == key):
+        node.right, right = _split(node.right, key, inclusive)
+        node.refresh()
+        return node, right
+    left, node.left = _split(node.left, key, inclusive)
+    node.refresh()
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.refresh()
+        return left
+    right.left = _merge(left, right.left)
+    right.refresh()
+    return right
+
+
+@dataclass
+class IntervalSchedule:
+    """Flights indexed by their ``[departure, arrival)`` interval.
+
+    A treap ordered by departure time and augmented with the latest arrival of
+    each subtree answers window queries in O(log n + k) and inserts/removes in
+    O(log n). Flights spanning midnight belong to every day they are airborne
+    in. Delays are picked up through the flight's observer hook.
+    """
+
+    _root: Optional[_Node] = field(default=None, repr=False)
+    _keys: Dict[str, _Key] = field(default_factory=dict, repr=False)
+    _by_origin: Dict[str, Dict[str, Flight]] = field(default_factory=dict, repr=False)
+    _by_destination: Dict[str, Dict[str, Flight]] = field(default_factory=dict, repr=False)
+
+    def __contains__(self, flight_id: object) -> bool:
+        return flight_id in self._keys
+
+    def size(self) -> int:
+        return len(self._keys)
+
+    def add_flight(self, flight: Flight) -> None:
+        if flight.flight_id in self._keys:
+            self.remove_flight(flight.flight_id)
+        self._insert(flight)
+        self._by_origin.setdefault(flight.origin, {})[flight.flight_id] = flight
+        self._by_destination.setdefault(flight.destination, {})[flight.flight_id] = flight
+        flight.add_observer(self._on_flight_changed)
+
+    def remove_flight(self, flight_id: str) -> Optional[Flight]:
+        flight = self._delete(flight_id)
+        if flight is None:
+            return None
+        self._by_origin.get(flight.origin, {}).pop(flight_id, None)
+        self._by_destination.get(flight.destination, {}).pop(flight_id, None)
+        flight.remove_observer(self._on_flight_changed)
+        return flight
+
+    def reschedule(self, flight: Flight) -> None:
+        """Re-key ``flight`` after its times were changed in place."""
+        if self._delete(flight.flight_id) is not None:
+            self._insert(flight)
+
+    def between(self, start: datetime, end: datetime) -> List[Flight]:
+        """Flights airborne or departing in ``[start, end)``, by departure."""
+        return list(self._overlapping(self._root, start, end))
+
+    def flights_on(self, day: date) -> List[Flight]:
+        start = datetime.combine(day, time.min)
+        return self.between(start, start + timedelta(days=1))
+
+    def flights_from(self, origin: str) -> List[Flight]:
+        return sorted(self._by_origin.get(origin, {}).values(), key=self._key_of)
+
+    def flights_to(self, destination: str) -> List[Flight]:
+        return sorted(self._by_destination.get(destination, {}).values(), key=self._key_of)
+
+    def _insert(self, flight: Flight) -> None:
+        key = self._key_of(flight)
+        left, right = _split(self._root, key, inclusive=False)
+        self._root = _merge(_merge(left, _Node(key, flight)), right)
+        self._keys[flight.flight_id] = key
+
+    def _delete(self, flight_id: str) -> Optional[Flight]:
+        key = self._keys.pop(flight_id, None)
+        if key is None:
+            return None
+        left, rest = _split(self._root, key, inclusive=False)
+        middle, right = _split(rest, key, inclusive=True)
+        self._root = _merge(left, right)
+        return middle.flight if middle is not None else None
+
+    def _overlapping(self, node: Optional[_Node], start: datetime, end: datetime) -> Iterator[Flight]:
+        if node is None or node.max_end <= start:
+            return
+        yield from self._overlapping(node.left, start, end)
+        if node.key[0] >= end:
+            return
+        if node.end > start:
+            yield node.flight
+        yield from self._overlapping(node.right, start, end)
+
+    def _on_flight_changed(self, flight: Any, attribute: str) -> None:
+        if attribute in ("departure_time", "arrival_time"):
+            self.reschedule(flight)
+
+    @staticmethod
+    def _key_of(flight: Flight) -> _Key:
+        return flight.departure_time, flight.flight_id
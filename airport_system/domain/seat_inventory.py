@@ -0,0 +1,122 @@
+from __future__ import annotations
+import heapq
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .aircraft import DEFAULT_SEAT_LAYOUT, Seat, SeatMap
+from .enums import SeatClass
+
+_SEAT_NUMBER = re.compile(r"^(\d+)([A-Z])$")
+
+
+@dataclass
+class SeatHold:
+    hold_id: str
+    flight_id: str
+    seat_numbers: Tuple[str, ...]
+    expires_at: datetime
+    confirmed: bool = False
+
+    def is_expired(self, now: datetime) -> bool:
+        return not self.confirmed and now >= self.expires_at
+
+
+@dataclass
+class FlightSeatInventory:
+    """Seat availability of one flight, independent of the shared Aircraft seats."""
+
+    flight_id: str
+    seat_map: SeatMap = field(default_factory=SeatMap)
+    holds: Dict[str, SeatHold] = field(default_factory=dict)
+    # ряд -> битовая маска свободных мест (бит = позиция места в ряду по схеме салона), отдельно по классам
+    _row_free: Dict[SeatClass, Dict[int, int]] = field(default_factory=dict, repr=False)
+    _expiry: List[Tuple[datetime, str]] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def for_seats(
+        cls, flight_id: str, seats: Iterable[Seat], layout: str = DEFAULT_SEAT_LAYOUT
+    ) -> "FlightSeatInventory":
+        inventory = cls(flight_id, SeatMap(layout=layout))
+        for seat in seats:
+            inventory.add_seat(Seat(seat.seat_number, seat.seat_class, is_exit_row=seat.is_exit_row))
+        return inventory
+
+    def add_seat(self, seat: Seat) -> None:
+        self.seat_map.add(seat)
+        seat.add_observer(self._on_seat_changed)
+        self._on_seat_changed(seat, "is_available")
+
+    def available_count(self, seat_class: Optional[SeatClass] = None) -> int:
+        return self.seat_map.available_count(seat_class)
+
+    def unavailable(self, seat_numbers: Iterable[str]) -> List[str]:
+        return [number for number in seat_numbers if not self.seat_map.is_available(number)]
+
+    def hold(self, hold: SeatHold) -> None:
+        missing = self.unavailable(hold.seat_numbers)
+        if missing:
+            raise ValueError(f"Seats not available: {', '.join(missing)}")
+        for number in hold.seat_numbers:
+            seat = self.seat_map.seat(number)
+            if seat is not None:
+                seat.reserve()
+        self.holds[hold.hold_id] = hold
+        heapq.heappush(self._expiry, (hold.expires_at, hold.hold_id))
+
+    def confirm(self, hold_id: str) -> SeatHold:
+        hold = self.holds.pop(hold_id)
+        hold.confirmed = True
+        return hold
+
+    def release(self, hold_id: str) -> Optional[SeatHold]:
+        hold = self.holds.pop(hold_id, None)
+        if hold is not None:
+            for number in hold.seat_numbers:
+                seat = self.seat_map.seat(number)
+                if seat is not None:
+                    seat.release()
+        return hold
+
+    def expire(self, now: datetime) -> List[SeatHold]:
+        expired: List[SeatHold] = []
+        while self._expiry and self._expiry[0][0] <= now:
+            _, hold_id = heapq.heappop(self._expiry)
+            hold = self.holds.get(hold_id)
+            if hold is not None and hold.is_expired(now):
+                self.release(hold_id)
+                expired.append(hold)
+        return expired
+
+    def find_adjacent(self, count: int, seat_class: SeatClass) -> Optional[List[str]]:
+        """First run of ``count`` free side-by-side seats in one row, never across an aisle."""
+        if count <= 0:
+            raise ValueError("Seat count must be positive")
+        letters = self.seat_map.layout.replace(" ", "")
+        blocks = self.seat_map.seat_blocks()
+        for row in sorted(self._row_free.get(seat_class, {})):
+            free = self._row_free[seat_class][row]
+            for block in blocks:
+                mask = free & block
+                run = mask
+                for shift in range(1, count):
+                    run &= mask >> shift
+                if run:
+                    start = (run & -run).bit_length() - 1
+                    return [f"{row}{letters[start + i]}" for i in range(count)]
+        return None
+
+    def _on_seat_changed(self, seat: Seat, attribute: str) -> None:
+        match = _SEAT_NUMBER.match(seat.seat_number)
+        if not match:
+            return
+        column = self.seat_map.column_of(match.group(2))
+        if column is None:
+            return
+        row, bit = int(match.group(1)), 1 << column
+        rows = self._row_free.setdefault(seat.seat_class, {})
+        if seat.is_available:
+            rows[row] = rows.get(row, 0) | bit
+        else:
+            rows[row] = rows.get(row, 0) & ~bit
@@ -1,12 +1,15 @@
 from __future__ import annotations
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
 from .enums import SecurityLevel
+from .observable import Observable
 
 
 @dataclass
-class Gate:
+class Gate(Observable):
     gate_id: str
     terminal_code: str
     is_open: bool = True
@@ -15,41 +18,198 @@ class Gate:
 
     def assign_flight(self, flight_id: str) -> None:
         self.current_flight_id = flight_id
+        self._notify("current_flight_id")
 
     def clear_flight(self) -> None:
         self.current_flight_id = None
+        self._notify("current_flight_id")
 
     def close(self) -> None:
         self.is_open = False
+        self._notify("is_open")
 
     def open(self) -> None:
         self.is_open = True
+        self._notify("is_open")
 
     def is_free(self) -> bool:
         return self.is_open and self.current_flight_id is None
 
 
+@dataclass
+class GatePool:
+    """Set of gates with O(1) add, discard and pick; removal swaps in the last gate."""
+
+    _gates: List[Gate] = field(default_factory=list)
+    _positions: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, gate: Gate) -> None:
+        if gate.gate_id not in self._positions:
+            self._positions[gate.gate_id] = len(self._gates)
+            self._gates.append(gate)
+
+    def discard(self, gate_id: str) -> None:
+        index = self._positions.pop(gate_id, None)
+        if index is None:
+            return
+        last = self._gates.pop()
+        if last.gate_id != gate_id:
+            self._gates[index] = last
+            self._positions[last.gate_id] = index
+
+    def peek(self) -> Optional[Gate]:
+        return self._gates[-1] if self._gates else None
+
+    def count(self) -> int:
+        return len(self._gates)
+
+    def __contains__(self, gate_id: object) -> bool:
+        return gate_id in self._positions
+
+
+@dataclass
+class GateTimeline:
+    """Non-overlapping ``[start, end)`` occupancy intervals of one gate, sorted by start."""
+
+    gate_id: str
+    _starts: List[datetime] = field(default_factory=list, repr=False)
+    _slots: List[Tuple[datetime, datetime, str]] = field(default_factory=list, repr=False)
+    _start_of: Dict[str, datetime] = field(default_factory=dict, repr=False)
+
+    def book(self, start: datetime, end: datetime, flight_id: str, buffer: timedelta = timedelta(0)) -> None:
+        if end <= start:
+            raise ValueError("Occupancy must end after it starts")
+        if flight_id in self._start_of:
+            raise ValueError(f"Flight {flight_id} already occupies gate {self.gate_id}")
+        if not self.is_free(start, end, buffer):
+            raise ValueError(f"Gate {self.gate_id} is busy between {start} and {end}")
+        index = bisect_right(self._starts, start)
+        self._starts.insert(index, start)
+        self._slots.insert(index, (start, end, flight_id))
+        self._start_of[flight_id] = start
+
+    def release(self, flight_id: str) -> bool:
+        start = self._start_of.pop(flight_id, None)
+        if start is None:
+            return False
+        index = bisect_left(self._starts, start)
+        while self._slots[index][2] != flight_id:
+            index += 1
+        del self._starts[index]
+        del self._slots[index]
+        return True
+
+    def is_free(self, start: datetime, end: datetime, buffer: timedelta = timedelta(0)) -> bool:
+        index = bisect_left(self._starts, start)
+        if index > 0 and self._slots[index - 1][1] + buffer > start:
+            return False
+        return index == len(self._starts) or end + buffer <= self._starts[index]
+
+    def occupied_between(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime, str]]:
+        index = bisect_left(self._starts, start)
+        if index > 0 and self._slots[index - 1][1] > start:
+            index -= 1
+        stop = bisect_left(self._starts, end)
+        return self._slots[index:stop]
+
+    def free_windows(
+        self, start: datetime, end: datetime, min_length: timedelta = timedelta(0)
+    ) -> List[Tuple[datetime, datetime]]:
+        """Gaps between occupancies inside ``[start, end)`` lasting at least ``min_length``."""
+        windows = []
+        cursor = start
+        for slot_start, slot_end, _ in self.occupied_between(start, end):
+            if slot_start > cursor and slot_start - cursor >= min_length:
+                windows.append((cursor, slot_start))
+            cursor = max(cursor, slot_end)
+        if end > cursor and end - cursor >= min_length:
+            windows.append((cursor, end))
+        return windows
+
+    def count(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, flight_id: object) -> bool:
+        return flight_id in self._start_of
+
+
 @dataclass
 class Terminal:
+    """Terminal whose free gates are kept in pools split by international capability.
+
+    Gates report ``assign_flight``/``clear_flight``/``open``/``close`` to the
+    terminal, so finding, acquiring and counting free gates never scans.
+    """
+
     code: str
     gates: List[Gate] = field(default_factory=list)
     name: str = ""
     security_level: SecurityLevel = SecurityLevel.PUBLIC
+    _gates_by_id: Dict[str, Gate] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _free: Dict[bool, GatePool] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._free = {False: GatePool(), True: GatePool()}
+        for gate in self.gates:
+            self._track(gate)
 
     def add_gate(self, gate: Gate) -> None:
         self.gates.append(gate)
+        self._track(gate)
 
-    def find_free_gate(self) -> Optional[Gate]:
-        for gate in self.gates:
-            if gate.is_free():
+    def get_gate(self, gate_id: str) -> Optional[Gate]:
+        return self._gates_by_id.get(gate_id)
+
+    def find_free_gate(self, international: bool = False) -> Optional[Gate]:
+        """Any free gate able to serve the flight; domestic flights get domestic gates first."""
+        if not international:
+            gate = self._free[False].peek()
+            if gate is not None:
                 return gate
-        return None
+        return self._free[True].peek()
+
+    def acquire_gate(self, flight_id: str, international: bool = False) -> Optional[Gate]:
+        gate = self.find_free_gate(international)
+        if gate is not None:
+            gate.assign_flight(flight_id)
+        return gate
+
+    def release_gate(self, gate_id: str) -> None:
+        gate = self._gates_by_id.get(gate_id)
+        if gate is not None:
+            gate.clear_flight()
 
     def is_international_terminal(self) -> bool:
         return any(g.supports_international for g in self.gates)
 
-    def available_gates_count(self) -> int:
-        return sum(1 for g in self.gates if g.is_free())
+    def available_gates_count(self, international: Optional[bool] = None) -> int:
+        if international is None:
+            return self._free[False].count() + self._free[True].count()
+        return self._free[international].count()
+
+    def _track(self, gate: Gate) -> None:
+        self._gates_by_id[gate.gate_id] = gate
+        gate.add_observer(self._on_gate_changed)
+        self._on_gate_changed(gate, "is_open")
+
+    def _on_gate_changed(self, gate: Any, attribute: str) -> None:
+        pool = self._free[gate.supports_international]
+        if gate.is_free():
+            pool.add(gate)
+        else:
+            pool.discard(gate.gate_id)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # пулы и подписки на гейты восстанавливаются из списка гейтов
+        state = dict(self.__dict__)
+        state.pop("_gates_by_id", None)
+        state.pop("_free", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._gates_by_id = {}
+        self.__post_init__()
 
 
 @dataclass
@@ -11,9 +11,10 @@ from .payment_exceptions import (
     PaymentDeclinedError,
     InsufficientFundsError,
     CurrencyMismatchError,
+    PaymentGatewayError,
 )
 from .security_exceptions import AccessDeniedError, InvalidBadgeError
-from .baggage_exceptions import BaggageNotFoundError, OverweightBaggageError
+from .baggage_exceptions import BaggageCounterMismatchError, BaggageNotFoundError, OverweightBaggageError
 from .flight_exceptions import FlightNotFoundError, FlightAlreadyDepartedError
 
 __all__ = [
@@ -24,10 +25,12 @@ __all__ = [
     "PaymentDeclinedError",
     "InsufficientFundsError",
     "CurrencyMismatchError",
+    "PaymentGatewayError",
     "AccessDeniedError",
     "InvalidBadgeError",
     "BaggageNotFoundError",
     "OverweightBaggageError",
+    "BaggageCounterMismatchError",
     "FlightNotFoundError",
     "FlightAlreadyDepartedError",
 ]
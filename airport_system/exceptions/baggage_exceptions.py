@@ -7,3 +7,7 @@ class BaggageNotFoundError(AirportError):
 
 class OverweightBaggageError(AirportError):
     pass
+
+
+class BaggageCounterMismatchError(AirportError):
+    pass
@@ -11,3 +11,7 @@ class InsufficientFundsError(AirportError):
 
 class CurrencyMismatchError(AirportError):
     pass
+
+
+class PaymentGatewayError(AirportError):
+    pass
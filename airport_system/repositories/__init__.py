@@ -2,7 +2,37 @@
 Simple in-memory repositories for domain objects.
 """
 from .base import InMemoryRepository
+from .baggage_repository import BaggageRepository
 from .booking_repository import BookingRepository
+from .concurrent_repository import (
+    ConcurrentRepository,
+    ConcurrentBookingRepository,
+    ConcurrentFlightRepository,
+    ConcurrentBaggageRepository,
+)
 from .flight_repository import FlightRepository
+from .journal import FileJournal
+from .payment_ledger import PaymentLedger
+from .sqlite_repository import (
+    SqliteRepository,
+    SqliteBookingRepository,
+    SqliteFlightRepository,
+    SqliteBaggageRepository,
+)
 
-__all__ = ["InMemoryRepository", "BookingRepository", "FlightRepository"]
+__all__ = [
+    "InMemoryRepository",
+    "BaggageRepository",
+    "BookingRepository",
+    "ConcurrentRepository",
+    "ConcurrentBookingRepository",
+    "ConcurrentFlightRepository",
+    "ConcurrentBaggageRepository",
+    "FlightRepository",
+    "FileJournal",
+    "PaymentLedger",
+    "SqliteRepository",
+    "SqliteBookingRepository",
+    "SqliteFlightRepository",
+    "SqliteBaggageRepository",
+]
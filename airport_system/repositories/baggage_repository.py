@@ -0,0 +1,21 @@
+from __future__ import annotations
+from typing import ClassVar, Dict, Iterable, List, Tuple
+
+from .base import InMemoryRepository
+from ..domain.baggage import BaggageItem
+
+
+class BaggageRepository(InMemoryRepository[BaggageItem]):
+    index_on: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "booking": ("tag.booking_id",),
+        "owner": ("owner_id",),
+    }
+
+    def find_by_booking(self, booking_id: str) -> List[BaggageItem]:
+        return self.find_by_index("booking", booking_id)
+
+    def find_by_bookings(self, booking_ids: Iterable[str]) -> Dict[str, List[BaggageItem]]:
+        return self.group_by_index("booking", booking_ids)
+
+    def find_by_owner(self, owner_id: str) -> List[BaggageItem]:
+        return self.find_by_index("owner", owner_id)
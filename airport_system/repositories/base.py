@@ -1,6 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Generic, Iterable, Optional, TypeVar
+from typing import Any, Callable, ClassVar, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from .indexes import HashIndex, SortedIndex
+from .journal import ADD, REMOVE, UPDATE, FileJournal
+from ..domain.observable import Observable, Observer
 
 
 T = TypeVar("T")
@@ -8,16 +12,244 @@ T = TypeVar("T")
 
 @dataclass
 class InMemoryRepository(Generic[T]):
+    # декларативное описание вторичных индексов: имя -> атрибуты элемента
+    index_on: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+    # упорядоченные индексы для диапазонных запросов: имя -> атрибут
+    sorted_index_on: ClassVar[Dict[str, str]] = {}
+
     _items: Dict[str, T] = field(default_factory=dict)
+    journal: Optional[FileJournal] = field(default=None, repr=False, compare=False)
+    _indexes: Dict[str, Union[HashIndex[T], SortedIndex[T]]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    _item_observers: Dict[str, Observer] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.journal is not None:
+            self._items.update(self.journal.load())
+            for item_id, item in self._items.items():
+                self._attach(item_id, item)
+        for name, attributes in self.index_on.items():
+            self.add_index(name, *attributes)
+        for name, attribute in self.sorted_index_on.items():
+            self.add_sorted_index(name, attribute)
 
     def add(self, item_id: str, item: T) -> None:
-        self._items[item_id] = item
+        self._put(item_id, item)
+        self._record(ADD, item_id, item)
+
+    def add_many(self, items: Iterable[Tuple[str, T]]) -> None:
+        pairs = list(items)
+        for item_id, item in pairs:
+            self._put(item_id, item)
+        self._record_many([(ADD, item_id, item) for item_id, item in pairs])
 
     def get(self, item_id: str) -> Optional[T]:
         return self._items.get(item_id)
 
+    def update(self, item_id: str, item: T) -> None:
+        if item_id not in self._items:
+            raise KeyError(item_id)
+        self._put(item_id, item)
+        self._record(UPDATE, item_id, item)
+
     def remove(self, item_id: str) -> None:
-        self._items.pop(item_id, None)
+        if item_id not in self._items:
+            return
+        self._delete(item_id)
+        self._record(REMOVE, item_id)
+
+    def compute(self, item_id: str, fn: Callable[[Optional[T]], Optional[T]]) -> Optional[T]:
+        """Replace the item with ``fn(current)``; ``None`` removes it, an exception leaves it as is."""
+        current = self.get(item_id)
+        result = fn(current)
+        if result is None:
+            if current is not None:
+                self.remove(item_id)
+        elif current is None:
+            self.add(item_id, result)
+        else:
+            self.update(item_id, result)
+        return result
+
+    def compute_many(
+        self, item_ids: Iterable[str], fn: Callable[[str, Optional[T]], Optional[T]]
+    ) -> List[Tuple[Optional[T], Optional[Exception]]]:
+        """``compute`` for many keys with one journal write; returns ``(result, error)`` per key.
+
+        ``fn`` gets the key and the current item; a key whose ``fn`` raises is
+        left as is and its exception is returned instead of raised.
+        """
+        records: List[Tuple[str, str, Optional[T]]] = []
+        outcomes = [self._compute_entry(item_id, fn, records) for item_id in item_ids]
+        self._record_many(records)
+        return outcomes
+
+    def move(self, item_id: str, new_id: str, fn: Callable[[Optional[T], Optional[T]], T]) -> T:
+        """Store ``fn(current, occupant)`` under ``new_id`` and drop ``item_id`` in one step.
+
+        ``occupant`` is the item already held by ``new_id``; if ``fn`` raises,
+        neither key changes.
+        """
+        current = self.get(item_id)
+        occupant = self.get(new_id)
+        result = fn(current, occupant)
+        records: List[Tuple[str, str, Optional[T]]] = []
+        if new_id != item_id and current is not None:
+            self._delete(item_id)
+            records.append((REMOVE, item_id, None))
+        self._put(new_id, result)
+        records.append((ADD if occupant is None else UPDATE, new_id, result))
+        self._record_many(records)
+        return result
+
+    def update_if(self, item_id: str, predicate: Callable[[T], bool], mutate: Callable[[T], None]) -> bool:
+        item = self.get(item_id)
+        if item is None or not predicate(item):
+            return False
+        mutate(item)
+        self.update(item_id, item)
+        return True
 
     def all(self) -> Iterable[T]:
         return list(self._items.values())
+
+    def size(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._items
+
+    def snapshot(self) -> None:
+        if self.journal is not None:
+            self.journal.write_snapshot(self._items)
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+
+    def add_index(self, name: str, *attributes: str) -> None:
+        self._register_index(name, HashIndex(tuple(attributes)))
+
+    def add_sorted_index(self, name: str, attribute: str) -> None:
+        self._register_index(name, SortedIndex(attribute))
+
+    def find_by_index(self, name: str, key: Hashable) -> List[T]:
+        return self._hash_index(name).lookup(key)
+
+    def group_by_index(self, name: str, keys: Iterable[Hashable]) -> Dict[Hashable, List[T]]:
+        """Items for each of ``keys`` in one call; keys without items map to an empty list."""
+        index = self._hash_index(name)
+        return {key: index.lookup(key) for key in keys}
+
+    def count_by_index(self, name: str, key: Hashable) -> int:
+        return self._hash_index(name).count(key)
+
+    def find_in_range(self, name: str, start: Optional[Any] = None, end: Optional[Any] = None) -> List[T]:
+        return self._sorted_index(name).range(start, end)
+
+    def count_in_range(self, name: str, start: Optional[Any] = None, end: Optional[Any] = None) -> int:
+        return self._sorted_index(name).count(start, end)
+
+    def _register_index(self, name: str, index: Union[HashIndex[T], SortedIndex[T]]) -> None:
+        if name in self._indexes:
+            raise ValueError(f"Index {name} already exists")
+        for item_id, item in self._items.items():
+            index.insert(item_id, item)
+        self._indexes[name] = index
+
+    def _put(self, item_id: str, item: T) -> None:
+        previous = self._items.get(item_id)
+        if previous is not item:
+            self._detach(item_id, previous)
+        self._items[item_id] = item
+        self._reindex(item_id, item)
+        if previous is not item:
+            self._attach(item_id, item)
+
+    def _record(self, op: str, item_id: str, item: Optional[T] = None) -> None:
+        if self.journal is None:
+            return
+        self.journal.append(op, item_id, item)
+        if self.journal.should_snapshot():
+            self.journal.write_snapshot(self._items)
+
+    def _record_many(self, records: List[Tuple[str, str, Optional[T]]]) -> None:
+        if self.journal is None or not records:
+            return
+        self.journal.append_many(records)
+        if self.journal.should_snapshot():
+            self.journal.write_snapshot(self._items)
+
+    def _compute_entry(
+        self,
+        item_id: str,
+        fn: Callable[[str, Optional[T]], Optional[T]],
+        records: List[Tuple[str, str, Optional[T]]],
+    ) -> Tuple[Optional[T], Optional[Exception]]:
+        current = self._items.get(item_id)
+        try:
+            result = fn(item_id, current)
+        except Exception as exc:
+            return None, exc
+        if result is None:
+            if current is not None:
+                self._delete(item_id)
+                records.append((REMOVE, item_id, None))
+        else:
+            self._put(item_id, result)
+            records.append((ADD if current is None else UPDATE, item_id, result))
+        return result, None
+
+    def _delete(self, item_id: str) -> None:
+        item = self._items.pop(item_id)
+        self._detach(item_id, item)
+        self._unindex(item_id)
+
+    def _reindex(self, item_id: str, item: T) -> None:
+        for index in self._indexes.values():
+            index.insert(item_id, item)
+
+    def _unindex(self, item_id: str) -> None:
+        for index in self._indexes.values():
+            index.remove(item_id)
+
+    def _attach(self, item_id: str, item: T) -> None:
+        # объекты, изменяющиеся "на месте" (например, Flight.delay), сами сообщают об изменениях
+        if isinstance(item, Observable):
+            observer = self._observer_for(item_id)
+            item.add_observer(observer)
+            self._item_observers[item_id] = observer
+
+    def _detach(self, item_id: str, item: Optional[T]) -> None:
+        observer = self._item_observers.pop(item_id, None)
+        if observer is not None and isinstance(item, Observable):
+            item.remove_observer(observer)
+
+    def _observer_for(self, item_id: str) -> Observer:
+        def on_change(item: Any, attribute: str) -> None:
+            self._on_item_changed(item_id, item, attribute)
+
+        return on_change
+
+    def _on_item_changed(self, item_id: str, item: T, attribute: str) -> None:
+        self._reindex(item_id, item)
+        self._record(UPDATE, item_id, item)
+
+    def _index(self, name: str) -> Union[HashIndex[T], SortedIndex[T]]:
+        index = self._indexes.get(name)
+        if index is None:
+            raise KeyError(f"Unknown index {name}")
+        return index
+
+    def _hash_index(self, name: str) -> HashIndex[T]:
+        index = self._index(name)
+        if not isinstance(index, HashIndex):
+            raise KeyError(f"Index {name} is not a hash index")
+        return index
+
+    def _sorted_index(self, name: str) -> SortedIndex[T]:
+        index = self._index(name)
+        if not isinstance(index, SortedIndex):
+            raise KeyError(f"Index {name} is not a sorted index")
+        return index
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List
+from typing import ClassVar, Dict, Iterable, List, Tuple
 
 from .base import InMemoryRepository
 from ..domain.booking import Booking
@@ -7,8 +7,19 @@ from ..exceptions import BookingNotFoundError
 
 
 class BookingRepository(InMemoryRepository[Booking]):
+    index_on: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "passenger": ("passenger_id",),
+        "flight": ("flight_id",),
+    }
+
     def find_by_passenger(self, passenger_id: str) -> List[Booking]:
-        return [b for b in self.all() if b.passenger_id == passenger_id]
+        return self.find_by_index("passenger", passenger_id)
+
+    def find_by_flight(self, flight_id: str) -> List[Booking]:
+        return self.find_by_index("flight", flight_id)
+
+    def find_by_flights(self, flight_ids: Iterable[str]) -> Dict[str, List[Booking]]:
+        return self.group_by_index("flight", flight_ids)
 
     def get_required(self, booking_id: str) -> Booking:
         booking = self.get(booking_id)
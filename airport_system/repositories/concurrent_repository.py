@@ -0,0 +1,208 @@
+from __future__ import annotations
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .base import InMemoryRepository
+from .journal import ADD
+from .booking_repository import BookingRepository
+from .baggage_repository import BaggageRepository
+from .flight_repository import FlightRepository
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class ConcurrentRepository(InMemoryRepository[T]):
+    """Thread-safe repository with one lock stripe per group of keys.
+
+    ``compute`` and ``update_if`` run the caller's check-then-mutate logic
+    under the stripe of the key only, so unrelated keys proceed in parallel.
+    Reads are lock-free apart from a short index lock. Journal records are
+    queued in stripe order while the stripe is held and written by whichever
+    writer releases its stripe first, one ``append_many`` per drain, so file
+    I/O and fsync never run under a stripe lock.
+    """
+
+    stripes: int = 16
+    _stripe_locks: List[threading.RLock] = field(init=False, repr=False, compare=False)
+    _index_lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+    _journal_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _pending: Deque[Tuple[str, str, Any]] = field(default_factory=deque, init=False, repr=False, compare=False)
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.stripes <= 0:
+            raise ValueError("Stripe count must be positive")
+        self._stripe_locks = [threading.RLock() for _ in range(self.stripes)]
+        super().__post_init__()
+
+    def lock_for(self, item_id: str) -> threading.RLock:
+        return self._stripe_locks[hash(item_id) % self.stripes]
+
+    def add(self, item_id: str, item: T) -> None:
+        with self._writing(item_id):
+            super().add(item_id, item)
+
+    def add_many(self, items: Iterable[Tuple[str, T]]) -> None:
+        """Add items stripe by stripe; the whole batch reaches the journal in one append."""
+        pairs = list(items)
+        with self._journaling():
+            # сегменты захватываются по одному, поэтому порядок захвата не важен
+            for positions in self._by_stripe([item_id for item_id, _ in pairs]).values():
+                with self.lock_for(pairs[positions[0]][0]):
+                    batch = [pairs[position] for position in positions]
+                    for item_id, item in batch:
+                        self._put(item_id, item)
+                    self._record_many([(ADD, item_id, item) for item_id, item in batch])
+
+    def update(self, item_id: str, item: T) -> None:
+        with self._writing(item_id):
+            super().update(item_id, item)
+
+    def remove(self, item_id: str) -> None:
+        with self._writing(item_id):
+            super().remove(item_id)
+
+    def compute(self, item_id: str, fn: Callable[[Optional[T]], Optional[T]]) -> Optional[T]:
+        with self._writing(item_id):
+            return super().compute(item_id, fn)
+
+    def compute_many(
+        self, item_ids: Iterable[str], fn: Callable[[str, Optional[T]], Optional[T]]
+    ) -> List[Tuple[Optional[T], Optional[Exception]]]:
+        ids = list(item_ids)
+        outcomes: List[Tuple[Optional[T], Optional[Exception]]] = [(None, None)] * len(ids)
+        with self._journaling():
+            for positions in self._by_stripe(ids).values():
+                with self.lock_for(ids[positions[0]]):
+                    records: List[Tuple[str, str, Optional[T]]] = []
+                    for position in positions:
+                        outcomes[position] = self._compute_entry(ids[position], fn, records)
+                    self._record_many(records)
+        return outcomes
+
+    def move(self, item_id: str, new_id: str, fn: Callable[[Optional[T], Optional[T]], T]) -> T:
+        # обе полосы захватываются в порядке номеров, чтобы встречные переносы не взаимоблокировались
+        first, second = sorted((hash(item_id) % self.stripes, hash(new_id) % self.stripes))
+        with self._journaling(), self._stripe_locks[first], self._stripe_locks[second]:
+            return super().move(item_id, new_id, fn)
+
+    def update_if(self, item_id: str, predicate: Callable[[T], bool], mutate: Callable[[T], None]) -> bool:
+        with self._writing(item_id):
+            return super().update_if(item_id, predicate, mutate)
+
+    def add_index(self, name: str, *attributes: str) -> None:
+        with self._index_lock:
+            super().add_index(name, *attributes)
+
+    def add_sorted_index(self, name: str, attribute: str) -> None:
+        with self._index_lock:
+            super().add_sorted_index(name, attribute)
+
+    def find_by_index(self, name: str, key: Any) -> List[T]:
+        with self._index_lock:
+            return super().find_by_index(name, key)
+
+    def group_by_index(self, name: str, keys: Iterable[Any]) -> Dict[Any, List[T]]:
+        with self._index_lock:
+            return super().group_by_index(name, keys)
+
+    def count_by_index(self, name: str, key: Any) -> int:
+        with self._index_lock:
+            return super().count_by_index(name, key)
+
+    def find_in_range(self, name: str, start: Optional[Any] = None, end: Optional[Any] = None) -> List[T]:
+        with self._index_lock:
+            return super().find_in_range(name, start, end)
+
+    def count_in_range(self, name: str, start: Optional[Any] = None, end: Optional[Any] = None) -> int:
+        with self._index_lock:
+            return super().count_in_range(name, start, end)
+
+    def snapshot(self) -> None:
+        if self.journal is None:
+            return
+        with self._journal_lock:
+            self._drain_pending()
+            self.journal.write_snapshot(self._items)
+
+    def close(self) -> None:
+        self._flush_journal()
+        super().close()
+
+    @contextmanager
+    def _writing(self, item_id: str) -> Iterator[None]:
+        """Hold the key's stripe; queued journal records are flushed after it is released."""
+        with self._journaling(), self.lock_for(item_id):
+            yield
+
+    @contextmanager
+    def _journaling(self) -> Iterator[None]:
+        # только самый внешний писатель потока сбрасывает очередь — уже без блокировок сегментов
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self._flush_journal()
+
+    def _by_stripe(self, item_ids: List[str]) -> Dict[int, List[int]]:
+        groups: Dict[int, List[int]] = {}
+        for position, item_id in enumerate(item_ids):
+            groups.setdefault(hash(item_id) % self.stripes, []).append(position)
+        return groups
+
+    def _record(self, op: str, item_id: str, item: Optional[T] = None) -> None:
+        # вызывается под блокировкой сегмента: порядок записей по ключу совпадает с порядком изменений
+        if self.journal is not None:
+            self._pending.append((op, item_id, item))
+
+    def _record_many(self, records: List[Tuple[str, str, Optional[T]]]) -> None:
+        if self.journal is not None:
+            self._pending.extend(records)
+
+    def _flush_journal(self) -> None:
+        if self.journal is None:
+            return
+        # берём блокировку даже при пустой очереди: наши записи мог забрать и ещё пишет другой поток
+        with self._journal_lock:
+            self._drain_pending()
+            if self.journal.should_snapshot():
+                self.journal.write_snapshot(self._items)
+
+    def _drain_pending(self) -> None:
+        records = []
+        while self._pending:
+            records.append(self._pending.popleft())
+        if records:
+            self.journal.append_many(records)
+
+    def _reindex(self, item_id: str, item: T) -> None:
+        with self._index_lock:
+            super()._reindex(item_id, item)
+
+    def _unindex(self, item_id: str) -> None:
+        with self._index_lock:
+            super()._unindex(item_id)
+
+    def _on_item_changed(self, item_id: str, item: T, attribute: str) -> None:
+        with self._writing(item_id):
+            super()._on_item_changed(item_id, item, attribute)
+
+
+class ConcurrentBookingRepository(ConcurrentRepository, BookingRepository):
+    pass
+
+
+class ConcurrentFlightRepository(ConcurrentRepository, FlightRepository):
+    pass
+
+
+class ConcurrentBaggageRepository(ConcurrentRepository, BaggageRepository):
+    pass
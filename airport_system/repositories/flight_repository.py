@@ -1,14 +1,24 @@
 from __future__ import annotations
 from datetime import datetime
-from typing import List
+from typing import ClassVar, Dict, List, Tuple
 
 from .base import InMemoryRepository
 from ..domain.flight import Flight
 
 
 class FlightRepository(InMemoryRepository[Flight]):
+    index_on: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "route": ("origin", "destination"),
+    }
+    sorted_index_on: ClassVar[Dict[str, str]] = {
+        "departure": "departure_time",
+    }
+
     def find_active(self, now: datetime) -> List[Flight]:
-        return [f for f in self.all() if f.departure_time >= now]
+        return self.find_in_range("departure", start=now)
+
+    def find_departing_between(self, start: datetime, end: datetime) -> List[Flight]:
+        return self.find_in_range("departure", start, end)
 
     def find_by_route(self, origin: str, destination: str) -> List[Flight]:
-        return [f for f in self.all() if f.origin == origin and f.destination == destination]
+        return self.find_by_index("route", (origin, destination))
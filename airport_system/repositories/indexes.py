@@ -0,0 +1,112 @@
+from __future__ import annotations
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+@dataclass
+class HashIndex(Generic[T]):
+    """Secondary index mapping one or more attribute values to the items holding them."""
+
+    attributes: Tuple[str, ...]
+    _key_of: Callable[[T], Any] = field(init=False, repr=False, compare=False)
+    _buckets: Dict[Hashable, Dict[str, T]] = field(default_factory=dict, repr=False, compare=False)
+    _keys: Dict[str, Hashable] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.attributes:
+            raise ValueError("Index needs at least one attribute")
+        self._key_of = attrgetter(*self.attributes)
+
+    def key_for(self, item: T) -> Hashable:
+        return self._key_of(item)
+
+    def insert(self, item_id: str, item: T) -> None:
+        key = self._key_of(item)
+        old_key = self._keys.get(item_id, _MISSING)
+        if old_key is not _MISSING and old_key != key:
+            self._discard(item_id, old_key)
+        self._keys[item_id] = key
+        self._buckets.setdefault(key, {})[item_id] = item
+
+    def remove(self, item_id: str) -> None:
+        key = self._keys.pop(item_id, _MISSING)
+        if key is not _MISSING:
+            self._discard(item_id, key)
+
+    def lookup(self, key: Hashable) -> List[T]:
+        bucket = self._buckets.get(key)
+        return list(bucket.values()) if bucket else []
+
+    def count(self, key: Hashable) -> int:
+        return len(self._buckets.get(key, ()))
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._keys.clear()
+
+    def _discard(self, item_id: str, key: Hashable) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        bucket.pop(item_id, None)
+        if not bucket:
+            del self._buckets[key]
+
+
+@dataclass
+class SortedIndex(Generic[T]):
+    """Secondary index keeping items ordered by one attribute for range queries."""
+
+    attribute: str
+    _entries: List[Tuple[Any, str]] = field(default_factory=list, repr=False, compare=False)
+    _keys: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    _items: Dict[str, T] = field(default_factory=dict, repr=False, compare=False)
+
+    def insert(self, item_id: str, item: T) -> None:
+        key = getattr(item, self.attribute)
+        old_key = self._keys.get(item_id, _MISSING)
+        if old_key is not _MISSING:
+            if old_key == key:
+                self._items[item_id] = item
+                return
+            self._discard(item_id, old_key)
+        insort(self._entries, (key, item_id))
+        self._keys[item_id] = key
+        self._items[item_id] = item
+
+    def remove(self, item_id: str) -> None:
+        key = self._keys.pop(item_id, _MISSING)
+        if key is not _MISSING:
+            self._discard(item_id, key)
+            del self._items[item_id]
+
+    def range(self, start: Optional[Any] = None, end: Optional[Any] = None) -> List[T]:
+        """Items whose key lies in ``[start, end)``; a missing bound is open."""
+        lo, hi = self._bounds(start, end)
+        return [self._items[item_id] for _, item_id in self._entries[lo:hi]]
+
+    def count(self, start: Optional[Any] = None, end: Optional[Any] = None) -> int:
+        lo, hi = self._bounds(start, end)
+        return hi - lo
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys.clear()
+        self._items.clear()
+
+    def _bounds(self, start: Optional[Any], end: Optional[Any]) -> Tuple[int, int]:
+        lo = 0 if start is None else bisect_left(self._entries, (start,))
+        hi = len(self._entries) if end is None else bisect_left(self._entries, (end,), lo)
+        return lo, hi
+
+    def _discard(self, item_id: str, key: Any) -> None:
+        position = bisect_left(self._entries, (key, item_id))
+        if position < len(self._entries) and self._entries[position] == (key, item_id):
+            del self._entries[position]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+import os
+import pickle
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+ADD = "add"
+UPDATE = "update"
+REMOVE = "remove"
+
+# длина полезной нагрузки и её CRC32 перед каждой записью журнала
+_HEADER = struct.Struct("<II")
+
+
+@dataclass
+class FileJournal:
+    """Append-only journal of repository changes with periodic compacted snapshots.
+
+    The directory holds ``snapshot.pkl`` (the full state at some sequence number)
+    and ``journal.log`` (records written after it). Startup loads the snapshot and
+    replays only the journal tail; a torn record at the end of the log is dropped.
+    """
+
+    directory: Union[str, Path]
+    snapshot_every: int = 1000
+    sync: bool = False
+    _sequence: int = field(default=0, init=False, repr=False)
+    _since_snapshot: int = field(default=0, init=False, repr=False)
+    _log: Optional[BinaryIO] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def snapshot_path(self) -> Path:
+        return Path(self.directory) / "snapshot.pkl"
+
+    @property
+    def log_path(self) -> Path:
+        return Path(self.directory) / "journal.log"
+
+    def load(self) -> Dict[str, Any]:
+        items: Dict[str, Any] = {}
+        snapshot_sequence = 0
+        if self.snapshot_path.exists():
+            with self.snapshot_path.open("rb") as fh:
+                snapshot_sequence, items = pickle.load(fh)
+        self._sequence = snapshot_sequence
+        self._since_snapshot = 0
+        good_offset = 0
+        if self.log_path.exists():
+            for offset, (sequence, op, item_id, item) in self._read_records():
+                good_offset = offset
+                if sequence <= snapshot_sequence:
+                    continue
+                if op == REMOVE:
+                    items.pop(item_id, None)
+                else:
+                    items[item_id] = item
+                self._sequence = sequence
+                self._since_snapshot += 1
+            if good_offset != self.log_path.stat().st_size:
+                with self.log_path.open("r+b") as fh:
+                    fh.truncate(good_offset)
+        self._open_log()
+        return items
+
+    def append(self, op: str, item_id: str, item: Any = None) -> None:
+        self.append_many([(op, item_id, item)])
+
+    def append_many(self, records: Iterable[Tuple[str, str, Any]]) -> None:
+        """Write several records with a single flush (and fsync)."""
+        chunks: List[bytes] = []
+        for op, item_id, item in records:
+            if op not in (ADD, UPDATE, REMOVE):
+                raise ValueError(f"Unknown journal operation {op}")
+            self._sequence += 1
+            payload = pickle.dumps((self._sequence, op, item_id, item), protocol=pickle.HIGHEST_PROTOCOL)
+            chunks.append(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        if not chunks:
+            return
+        log = self._open_log()
+        log.write(b"".join(chunks))
+        log.flush()
+        if self.sync:
+            os.fsync(log.fileno())
+        self._since_snapshot += len(chunks)
+
+    def should_snapshot(self) -> bool:
+        return self.snapshot_every > 0 and self._since_snapshot >= self.snapshot_every
+
+    def write_snapshot(self, items: Dict[str, Any]) -> None:
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with tmp_path.open("wb") as fh:
+            pickle.dump((self._sequence, dict(items)), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # после атомарной замены снимка старые записи журнала больше не нужны
+        self.close()
+        with self.log_path.open("wb"):
+            pass
+        self._since_snapshot = 0
+        self._open_log()
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _open_log(self) -> BinaryIO:
+        if self._log is None:
+            self._log = self.log_path.open("ab")
+        return self._log
+
+    def _read_records(self) -> Iterator[Tuple[int, Tuple[int, str, str, Any]]]:
+        """Yield ``(end_offset, record)`` for every intact record in the log."""
+        with self.log_path.open("rb") as fh:
+            offset = 0
+            while True:
+                header = fh.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                length, checksum = _HEADER.unpack(header)
+                payload = fh.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                offset += _HEADER.size + length
+                yield offset, pickle.loads(payload)
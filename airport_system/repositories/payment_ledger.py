@@ -0,0 +1,76 @@
+from __future__ import annotations
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, ClassVar, Dict, Iterable, List, Optional, Tuple
+
+from .base import InMemoryRepository
+from ..domain.enums import PaymentStatus
+from ..domain.payment import Payment
+
+
+@dataclass
+class PaymentLedger(InMemoryRepository[Payment]):
+    """Payments indexed by booking and by the client's idempotency key.
+
+    :meth:`claim` is the deduplication point: the first request with a key
+    creates the payment, every retry gets the same record back. Nothing is
+    evicted automatically; :meth:`prune` drops settled payments once their
+    keys are past the retry window.
+    """
+
+    index_on: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "booking": ("booking_id",),
+        "idempotency_key": ("idempotency_key",),
+    }
+
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    def claim(self, idempotency_key: str, create: Callable[[], Payment]) -> Tuple[Payment, bool]:
+        """Return ``(payment, created)`` for ``idempotency_key``, creating it on first use."""
+        with self._lock:
+            existing = self.find_by_idempotency_key(idempotency_key)
+            if existing is not None:
+                return existing, False
+            payment = create()
+            payment.idempotency_key = idempotency_key
+            self.add(payment.payment_id, payment)
+            return payment, True
+
+    def compute(self, item_id: str, fn: Callable[[Optional[Payment]], Optional[Payment]]) -> Optional[Payment]:
+        with self._lock:
+            return super().compute(item_id, fn)
+
+    def apply(self, payment: Payment, change: Callable[[Payment], Payment]) -> Payment:
+        """Store ``change`` applied to the ledger's copy of ``payment`` (or to ``payment`` if unrecorded)."""
+        with self._lock:
+            changed = change(self.get(payment.payment_id) or payment)
+            self.compute(payment.payment_id, lambda current: changed)
+            return changed
+
+    def compute_many(
+        self, item_ids: Iterable[str], fn: Callable[[str, Optional[Payment]], Optional[Payment]]
+    ) -> List[Tuple[Optional[Payment], Optional[Exception]]]:
+        with self._lock:
+            return super().compute_many(item_ids, fn)
+
+    def prune(self, settled_before: datetime) -> int:
+        """Remove completed, declined and refunded payments last changed before ``settled_before``."""
+        with self._lock:
+            stale = [
+                p.payment_id
+                for p in self._items.values()
+                if p.status != PaymentStatus.PENDING and p.status_history and p.status_history[-1][0] < settled_before
+            ]
+            self.compute_many(stale, lambda payment_id, current: None)
+            return len(stale)
+
+    def find_by_idempotency_key(self, idempotency_key: str) -> Optional[Payment]:
+        found = self.find_by_index("idempotency_key", idempotency_key)
+        return found[0] if found else None
+
+    def find_by_booking(self, booking_id: str) -> List[Payment]:
+        return self.find_by_index("booking", booking_id)
+
+    def find_by_bookings(self, booking_ids: Iterable[str]) -> Dict[str, List[Payment]]:
+        return {booking_id: self.find_by_booking(booking_id) for booking_id in booking_ids}
@@ -0,0 +1,315 @@
+from __future__ import annotations
+import pickle
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, ClassVar, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+from weakref import WeakValueDictionary
+
+from ..domain.baggage import BaggageItem
+from ..domain.booking import Booking
+from ..domain.flight import Flight
+from ..domain.observable import Observable
+from ..exceptions import BookingNotFoundError
+
+
+T = TypeVar("T")
+
+_MAX_PARAMS = 500
+
+
+def _column_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # фиксированная точность, чтобы строки сортировались как время
+        return value.isoformat(timespec="microseconds")
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+@dataclass
+class SqliteRepository(Generic[T]):
+    """Repository storing pickled items in SQLite with queryable columns.
+
+    Subclasses declare the table, the attribute holding the item id, the
+    columns extracted from each item and the SQL indexes over them. Loaded
+    items are kept in an identity map, so repeated ``get`` calls return the
+    same object while it is in use, and observable items are written back
+    when they change in place.
+    """
+
+    table: ClassVar[str] = "items"
+    id_attribute: ClassVar[str] = ""
+    # имя столбца -> путь к атрибуту элемента
+    columns: ClassVar[Dict[str, str]] = {}
+    # имя индекса -> столбцы
+    sql_indexes: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+
+    path: str = ":memory:"
+    _conn: sqlite3.Connection = field(init=False, repr=False, compare=False)
+    _loaded: "WeakValueDictionary[str, T]" = field(
+        default_factory=WeakValueDictionary, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._conn = sqlite3.connect(self.path)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        column_defs = "".join(f", {name}" for name in self.columns)
+        with self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                f"(id TEXT PRIMARY KEY{column_defs}, payload BLOB NOT NULL)"
+            )
+            for name, index_columns in self.sql_indexes.items():
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.table}_{name} "
+                    f"ON {self.table} ({', '.join(index_columns)})"
+                )
+        self._getters = {name: attrgetter(attribute) for name, attribute in self.columns.items()}
+        self._id_of = attrgetter(self.id_attribute) if self.id_attribute else None
+        names = ["id", *self.columns, "payload"]
+        self._upsert_sql = (
+            f"INSERT OR REPLACE INTO {self.table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+        )
+        assignments = "".join(f"{name} = ?, " for name in self.columns)
+        self._update_sql = f"UPDATE {self.table} SET {assignments}payload = ? WHERE id = ?"
+
+    def add(self, item_id: str, item: T) -> None:
+        with self._conn:
+            self._conn.execute(self._upsert_sql, self._row(item_id, item))
+        self._remember(item_id, item)
+
+    def add_many(self, items: Iterable[Tuple[str, T]]) -> None:
+        """Upsert many items in a single transaction."""
+        pairs = list(items)
+        with self._conn:
+            self._conn.executemany(self._upsert_sql, (self._row(item_id, item) for item_id, item in pairs))
+        for item_id, item in pairs:
+            self._remember(item_id, item)
+
+    def get(self, item_id: str) -> Optional[T]:
+        item = self._loaded.get(item_id)
+        if item is not None:
+            return item
+        row = self._conn.execute(f"SELECT id, payload FROM {self.table} WHERE id = ?", (item_id,)).fetchone()
+        return self._materialize(row) if row else None
+
+    def update(self, item_id: str, item: T) -> None:
+        row = self._row(item_id, item)
+        with self._conn:
+            cursor = self._conn.execute(self._update_sql, row[1:] + row[:1])
+        if cursor.rowcount == 0:
+            raise KeyError(item_id)
+        self._remember(item_id, item)
+
+    def remove(self, item_id: str) -> None:
+        with self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (item_id,))
+        item = self._loaded.pop(item_id, None)
+        if isinstance(item, Observable):
+            item.remove_observer(self._on_item_changed)
+
+    def compute(self, item_id: str, fn: Callable[[Optional[T]], Optional[T]]) -> Optional[T]:
+        current = self.get(item_id)
+        result = fn(current)
+        if result is None:
+            if current is not None:
+                self.remove(item_id)
+        else:
+            self.add(item_id, result)
+        return result
+
+    def compute_many(
+        self, item_ids: Iterable[str], fn: Callable[[str, Optional[T]], Optional[T]]
+    ) -> List[Tuple[Optional[T], Optional[Exception]]]:
+        """``compute`` for many keys in a single transaction; returns ``(result, error)`` per key."""
+        outcomes: List[Tuple[Optional[T], Optional[Exception]]] = []
+        written: List[Tuple[str, Optional[T]]] = []
+        with self._conn:
+            for item_id in item_ids:
+                current = self.get(item_id)
+                try:
+                    result = fn(item_id, current)
+                except Exception as exc:
+                    outcomes.append((None, exc))
+                    continue
+                if result is not None:
+                    self._conn.execute(self._upsert_sql, self._row(item_id, result))
+                    written.append((item_id, result))
+                elif current is not None:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (item_id,))
+                    written.append((item_id, None))
+                outcomes.append((result, None))
+        for item_id, item in written:
+            if item is not None:
+                self._remember(item_id, item)
+            elif isinstance(self._loaded.get(item_id), Observable):
+                self._loaded.pop(item_id).remove_observer(self._on_item_changed)
+            else:
+                self._loaded.pop(item_id, None)
+        return outcomes
+
+    def move(self, item_id: str, new_id: str, fn: Callable[[Optional[T], Optional[T]], T]) -> T:
+        """Store ``fn(current, occupant)`` under ``new_id`` and drop ``item_id`` in one transaction."""
+        current = self.get(item_id)
+        result = fn(current, self.get(new_id))
+        with self._conn:
+            if new_id != item_id:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (item_id,))
+            self._conn.execute(self._upsert_sql, self._row(new_id, result))
+        if new_id != item_id:
+            previous = self._loaded.pop(item_id, None)
+            if isinstance(previous, Observable):
+                previous.remove_observer(self._on_item_changed)
+        self._remember(new_id, result)
+        return result
+
+    def update_if(self, item_id: str, predicate: Callable[[T], bool], mutate: Callable[[T], None]) -> bool:
+        item = self.get(item_id)
+        if item is None or not predicate(item):
+            return False
+        mutate(item)
+        self.update(item_id, item)
+        return True
+
+    def all(self) -> Iterable[T]:
+        return self._select()
+
+    def size(self) -> int:
+        return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def __contains__(self, item_id: object) -> bool:
+        row = self._conn.execute(f"SELECT 1 FROM {self.table} WHERE id = ?", (item_id,)).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _select(self, where: str = "", params: Sequence[Any] = (), order_by: str = "rowid") -> List[T]:
+        sql = f"SELECT id, payload FROM {self.table}"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order_by}"
+        params = tuple(_column_value(p) for p in params)
+        return [self._materialize(row) for row in self._conn.execute(sql, params)]
+
+    def _select_grouped(self, column: str, keys: Iterable[Any]) -> Dict[Any, List[T]]:
+        """Items whose ``column`` is one of ``keys``, grouped by key, with one query per chunk of keys."""
+        keys = list(dict.fromkeys(keys))
+        grouped: Dict[Any, List[T]] = {key: [] for key in keys}
+        getter = self._getters[column]
+        # SQLite ограничивает число параметров запроса
+        for start in range(0, len(keys), _MAX_PARAMS):
+            chunk = keys[start:start + _MAX_PARAMS]
+            for item in self._select(f"{column} IN ({', '.join('?' * len(chunk))})", chunk):
+                grouped[getter(item)].append(item)
+        return grouped
+
+    def _row(self, item_id: str, item: T) -> Tuple[Any, ...]:
+        values = tuple(_column_value(getter(item)) for getter in self._getters.values())
+        return (item_id,) + values + (pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL),)
+
+    def _materialize(self, row: Tuple[str, bytes]) -> T:
+        item_id, payload = row
+        item = self._loaded.get(item_id)
+        if item is None:
+            item = pickle.loads(payload)
+            self._remember(item_id, item)
+        return item
+
+    def _remember(self, item_id: str, item: T) -> None:
+        previous = self._loaded.get(item_id)
+        if previous is item:
+            return
+        if isinstance(previous, Observable):
+            previous.remove_observer(self._on_item_changed)
+        self._loaded[item_id] = item
+        if isinstance(item, Observable) and self._id_of is not None:
+            item.add_observer(self._on_item_changed)
+
+    def _on_item_changed(self, item: T, attribute: str) -> None:
+        item_id = self._id_of(item)
+        with self._conn:
+            self._conn.execute(self._upsert_sql, self._row(item_id, item))
+
+
+class SqliteBookingRepository(SqliteRepository[Booking]):
+    table: ClassVar[str] = "bookings"
+    id_attribute: ClassVar[str] = "booking_id"
+    columns: ClassVar[Dict[str, str]] = {
+        "passenger_id": "passenger_id",
+        "flight_id": "flight_id",
+        "status": "status",
+    }
+    sql_indexes: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "passenger": ("passenger_id",),
+        "flight": ("flight_id",),
+    }
+
+    def find_by_passenger(self, passenger_id: str) -> List[Booking]:
+        return self._select("passenger_id = ?", (passenger_id,))
+
+    def find_by_flight(self, flight_id: str) -> List[Booking]:
+        return self._select("flight_id = ?", (flight_id,))
+
+    def find_by_flights(self, flight_ids: Iterable[str]) -> Dict[str, List[Booking]]:
+        return self._select_grouped("flight_id", flight_ids)
+
+    def get_required(self, booking_id: str) -> Booking:
+        booking = self.get(booking_id)
+        if not booking:
+            raise BookingNotFoundError(f"Booking {booking_id} not found")
+        return booking
+
+
+class SqliteFlightRepository(SqliteRepository[Flight]):
+    table: ClassVar[str] = "flights"
+    id_attribute: ClassVar[str] = "flight_id"
+    columns: ClassVar[Dict[str, str]] = {
+        "origin": "origin",
+        "destination": "destination",
+        "departure_time": "departure_time",
+        "status": "status",
+    }
+    sql_indexes: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "route": ("origin", "destination"),
+        "departure": ("departure_time",),
+    }
+
+    def find_active(self, now: datetime) -> List[Flight]:
+        return self._select("departure_time >= ?", (now,), order_by="departure_time, id")
+
+    def find_departing_between(self, start: datetime, end: datetime) -> List[Flight]:
+        return self._select(
+            "departure_time >= ? AND departure_time < ?", (start, end), order_by="departure_time, id"
+        )
+
+    def find_by_route(self, origin: str, destination: str) -> List[Flight]:
+        return self._select("origin = ? AND destination = ?", (origin, destination))
+
+
+class SqliteBaggageRepository(SqliteRepository[BaggageItem]):
+    table: ClassVar[str] = "baggage"
+    id_attribute: ClassVar[str] = "tag.tag_id"
+    columns: ClassVar[Dict[str, str]] = {
+        "booking_id": "tag.booking_id",
+        "owner_id": "owner_id",
+        "status": "status",
+    }
+    sql_indexes: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "booking": ("booking_id",),
+        "owner": ("owner_id",),
+    }
+
+    def find_by_booking(self, booking_id: str) -> List[BaggageItem]:
+        return self._select("booking_id = ?", (booking_id,))
+
+    def find_by_bookings(self, booking_ids: Iterable[str]) -> Dict[str, List[BaggageItem]]:
+        return self._select_grouped("booking_id", booking_ids)
+
+    def find_by_owner(self, owner_id: str) -> List[BaggageItem]:
+        return self._select("owner_id = ?", (owner_id,))
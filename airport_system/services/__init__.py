@@ -1,16 +1,39 @@
 """
 Application services orchestrating domain logic.
 """
-from .booking_service import BookingService
-from .payment_service import PaymentService
+from .booking_service import BookingResult, BookingService
+from .currency_converter import CurrencyConverter, RateTable
+from .payment_service import PaymentResult, PaymentService
+from .async_payment_service import AsyncPaymentService, CircuitBreaker
 from .baggage_service import BaggageService
+from .baggage_scan_pipeline import ScanIngestionPipeline, ScanRecord
 from .security_service import SecurityService
 from .flight_service import FlightService
+from .gate_allocation_service import GateAllocationService
+from .gate_occupancy_service import GateOccupancyService
+from .event_bus import EventBus
+from .statistics_service import StatisticsService
+from .statistics_aggregator import StatisticsAggregator
+from .seat_inventory_service import SeatInventoryService
 
 __all__ = [
+    "BookingResult",
     "BookingService",
+    "CurrencyConverter",
+    "RateTable",
+    "PaymentResult",
     "PaymentService",
+    "AsyncPaymentService",
+    "CircuitBreaker",
     "BaggageService",
+    "ScanIngestionPipeline",
+    "ScanRecord",
     "SecurityService",
     "FlightService",
+    "GateAllocationService",
+    "GateOccupancyService",
+    "EventBus",
+    "StatisticsService",
+    "StatisticsAggregator",
+    "SeatInventoryService",
 ]
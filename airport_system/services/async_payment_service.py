@@ -0,0 +1,159 @@
+from __future__ import annotations
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from ..domain.enums import PaymentStatus
+from ..domain.payment import CardPayment, Money, Payment
+from ..exceptions import (
+    AirportError,
+    CurrencyMismatchError,
+    InsufficientFundsError,
+    PaymentDeclinedError,
+    PaymentGatewayError,
+)
+from ..repositories.payment_ledger import PaymentLedger
+from ..utils import id_generator
+from .payment_gateway import AsyncPaymentGateway, AuthorizationRequest
+from .payment_service import PaymentResult, PaymentService
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """Stops calling a failing gateway for ``reset_after`` seconds.
+
+    After ``failure_threshold`` consecutive failures the breaker opens; once the
+    pause has passed a single trial call is let through, and its outcome either
+    closes the breaker or opens it again.
+    """
+
+    failure_threshold: int = 5
+    reset_after: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    failures: int = 0
+    _opened_at: Optional[float] = field(default=None, repr=False)
+    _trial_in_flight: bool = field(default=False, repr=False)
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if self.clock() - self._opened_at >= self.reset_after:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self._opened_at = self.clock()
+        self._trial_in_flight = False
+
+
+@dataclass
+class AsyncPaymentService:
+    """asyncio counterpart of :class:`PaymentService` for a remote gateway.
+
+    At most ``max_in_flight`` authorizations run at once, each bounded by
+    ``timeout`` seconds; timeouts and gateway errors feed the circuit breaker
+    and leave the payment pending. For a pooled gateway the limit is capped at
+    its ``pool_size`` so the timeout never includes waiting for a connection.
+    Payments are recorded in ``ledger`` and deduplicated by idempotency key
+    exactly as in the synchronous service.
+    """
+
+    gateway: AsyncPaymentGateway
+    currency: str = "USD"
+    timeout: float = 2.0
+    max_in_flight: int = 100
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    ledger: PaymentLedger = field(default_factory=PaymentLedger)
+    _in_flight: Set[str] = field(default_factory=set, init=False, repr=False)
+    _limiter: Optional[asyncio.Semaphore] = field(default=None, init=False, repr=False)
+
+    async def charge_card(
+        self, booking_id: str, amount: Money, card: CardPayment, idempotency_key: Optional[str] = None
+    ) -> Payment:
+        """Charge ``card``; a retry with the same ``idempotency_key`` returns the original outcome."""
+        if amount.currency != self.currency:
+            raise CurrencyMismatchError("Unsupported currency")
+        if amount.minor_units <= 0:
+            raise InsufficientFundsError("Amount must be positive")
+        if idempotency_key is None:
+            payment = Payment(payment_id=id_generator.next_id("PAY"), booking_id=booking_id, amount=amount)
+            self.ledger.add(payment.payment_id, payment)
+        else:
+            payment, created = self.ledger.claim(
+                idempotency_key,
+                lambda: Payment(payment_id=id_generator.next_id("PAY"), booking_id=booking_id, amount=amount),
+            )
+            if not created:
+                if payment.booking_id != booking_id or payment.amount != amount:
+                    raise ValueError(f"Idempotency key {idempotency_key} was used for a different payment")
+                if payment.status == PaymentStatus.DECLINED:
+                    raise PaymentDeclinedError("Card authorisation failed")
+                if payment.status != PaymentStatus.PENDING:
+                    return payment
+        # повтор, пришедший во время авторизации, не должен списать второй раз
+        if payment.payment_id in self._in_flight:
+            raise PaymentGatewayError(f"Payment {payment.payment_id} is already being authorised")
+        self._in_flight.add(payment.payment_id)
+        try:
+            authorised = await self._authorize(AuthorizationRequest(payment.payment_id, amount, card))
+        finally:
+            self._in_flight.discard(payment.payment_id)
+        payment = self.ledger.apply(payment, lambda current: PaymentService._settle(current, authorised))
+        if not authorised:
+            raise PaymentDeclinedError("Card authorisation failed")
+        return payment
+
+    async def charge_many(self, items: Iterable[Tuple[str, Money, CardPayment]]) -> List[PaymentResult]:
+        """Run many ``charge_card`` calls concurrently; outcomes are reported per item."""
+
+        async def charge(index: int, booking_id: str, amount: Money, card: CardPayment) -> PaymentResult:
+            try:
+                return PaymentResult(index, await self.charge_card(booking_id, amount, card))
+            except AirportError as exc:
+                return PaymentResult(index, error=exc)
+
+        return list(await asyncio.gather(*(charge(i, *item) for i, item in enumerate(items))))
+
+    async def _authorize(self, request: AuthorizationRequest) -> bool:
+        if self._limiter is None:
+            # ожидание свободного соединения пула не должно съедать таймаут запроса
+            pool_size = getattr(self.gateway, "pool_size", self.max_in_flight)
+            self._limiter = asyncio.Semaphore(min(self.max_in_flight, pool_size))
+        async with self._limiter:
+            if not self.breaker.allow():
+                raise PaymentGatewayError("Payment gateway circuit is open")
+            succeeded = False
+            try:
+                approvals = await asyncio.wait_for(self.gateway.authorize_many([request]), self.timeout)
+                succeeded = True
+            except asyncio.TimeoutError as exc:
+                raise PaymentGatewayError("Payment gateway timed out") from exc
+            finally:
+                # отмена и любые другие сбои тоже освобождают пробный вызов
+                if succeeded:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.record_failure()
+            return approvals[0]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import AsyncIterable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.time_utils import as_utc, now_utc
+from .baggage_service import BaggageService
+
+
+@dataclass(frozen=True)
+class ScanRecord:
+    tag_id: str
+    location: str
+    scanned_at: datetime = field(default_factory=now_utc)
+
+
+@dataclass
+class ScanMetrics:
+    received: int = 0
+    duplicates: int = 0
+    applied: int = 0
+    missed: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+
+    def throughput(self) -> float:
+        if self.elapsed_seconds == 0:
+            return 0.0
+        return round(self.received / self.elapsed_seconds, 2)
+
+
+@dataclass
+class ScanIngestionPipeline:
+    """Streams belt scans into :class:`BaggageService` in micro-batches.
+
+    Repeated reads of the same tag at the same location inside
+    ``dedupe_window`` are dropped. Unknown tags go to ``on_miss`` instead of
+    raising ``BaggageNotFoundError``. Naive timestamps are read as UTC.
+
+    With ``max_delay`` set, a partial batch is flushed once it has waited that
+    long on ``clock``: :meth:`run_async` flushes it while waiting for the next
+    scan, and synchronous callers can drive the same check with :meth:`poll`.
+    """
+
+    service: BaggageService
+    dedupe_window: timedelta = timedelta(seconds=5)
+    batch_size: int = 500
+    on_miss: Optional[Callable[[ScanRecord], None]] = None
+    clock: Callable[[], datetime] = now_utc
+    metrics: ScanMetrics = field(default_factory=ScanMetrics)
+    max_delay: Optional[timedelta] = None
+    _batch: List[ScanRecord] = field(default_factory=list, repr=False)
+    # когда в пустую пачку пришло первое чтение
+    _batch_since: Optional[datetime] = field(default=None, repr=False)
+    _last_seen: Dict[Tuple[str, str], datetime] = field(default_factory=dict, repr=False)
+    _seen_order: Deque[Tuple[datetime, Tuple[str, str]]] = field(default_factory=deque, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        if self.max_delay is not None and self.max_delay <= timedelta(0):
+            raise ValueError("Max delay must be positive")
+
+    def run(self, records: Iterable[ScanRecord]) -> ScanMetrics:
+        started = time.perf_counter()
+        try:
+            for record in records:
+                self.offer(record)
+            self.flush()
+        finally:
+            self.metrics.elapsed_seconds += time.perf_counter() - started
+        return self.metrics
+
+    async def run_async(self, records: AsyncIterable[ScanRecord]) -> ScanMetrics:
+        started = time.perf_counter()
+        iterator = records.__aiter__()
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                done, _ = await asyncio.wait({pending}, timeout=self._flush_timeout())
+                if not done:
+                    # источник молчит дольше max_delay — отдаём неполную пачку
+                    self.flush()
+                    continue
+                next_record, pending = pending, None
+                try:
+                    record = next_record.result()
+                except StopAsyncIteration:
+                    break
+                self.offer(record)
+            self.flush()
+        finally:
+            if pending is not None:
+                pending.cancel()
+            self.metrics.elapsed_seconds += time.perf_counter() - started
+        return self.metrics
+
+    def offer(self, record: ScanRecord) -> None:
+        self.metrics.received += 1
+        if self._is_duplicate(record):
+            self.metrics.duplicates += 1
+            return
+        if not self._batch:
+            self._batch_since = as_utc(self.clock())
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size or self._overdue():
+            self.flush()
+
+    def poll(self) -> bool:
+        """Flush the partial batch if it has waited ``max_delay``; returns whether it did."""
+        if not self._overdue():
+            return False
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        self._batch_since = None
+        missing = set(self.service.load_many((r.tag_id, r.location) for r in batch))
+        for record in batch:
+            if record.tag_id in missing:
+                self.metrics.missed += 1
+                if self.on_miss is not None:
+                    self.on_miss(record)
+            else:
+                self.metrics.applied += 1
+        self.metrics.batches += 1
+        lag = (as_utc(self.clock()) - min(as_utc(r.scanned_at) for r in batch)).total_seconds()
+        self.metrics.last_lag_seconds = lag
+        self.metrics.max_lag_seconds = max(self.metrics.max_lag_seconds, lag)
+
+    def _overdue(self) -> bool:
+        if self.max_delay is None or self._batch_since is None:
+            return False
+        return as_utc(self.clock()) - self._batch_since >= self.max_delay
+
+    def _flush_timeout(self) -> Optional[float]:
+        if self.max_delay is None or self._batch_since is None:
+            return None
+        remaining = self._batch_since + self.max_delay - as_utc(self.clock())
+        return max(remaining.total_seconds(), 0.0)
+
+    def _is_duplicate(self, record: ScanRecord) -> bool:
+        scanned_at = as_utc(record.scanned_at)
+        horizon = scanned_at - self.dedupe_window
+        # забываем чтения, вышедшие за окно, чтобы словарь не рос бесконечно
+        while self._seen_order and self._seen_order[0][0] < horizon:
+            seen_at, key = self._seen_order.popleft()
+            if self._last_seen.get(key) == seen_at:
+                del self._last_seen[key]
+        key = (record.tag_id, record.location)
+        last = self._last_seen.get(key)
+        if last is not None and scanned_at - last < self.dedupe_window:
+            return True
+        self._last_seen[key] = scanned_at
+        self._seen_order.append((scanned_at, key))
+        return False
@@ -1,45 +1,159 @@
 from __future__ import annotations
+import math
+import threading
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from ..domain.baggage import BaggageItem, BaggageTag
 from ..domain.enums import BaggageStatus
-from ..exceptions import BaggageNotFoundError, OverweightBaggageError
+from ..exceptions import BaggageCounterMismatchError, BaggageNotFoundError, OverweightBaggageError
+from ..repositories.baggage_repository import BaggageRepository
 
 
 @dataclass
 class BaggageService:
     max_weight_kg: float = 32.0
-    _items: Dict[str, BaggageItem] = field(default_factory=dict)
+    baggage: BaggageRepository = field(default_factory=BaggageRepository)
+    # при включении каждое чтение агрегатов сверяется с полным пересчётом
+    consistency_check: bool = False
+    _status_counts: Counter = field(default_factory=Counter, init=False, repr=False)
+    _total_weight: float = field(default=0.0, init=False, repr=False)
+    _counter_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
-    def check_in_baggage(self, tag_id: str, booking_id: str, weight_kg: float, location: str) -> BaggageItem:
+    def __post_init__(self) -> None:
+        self._status_counts, self._total_weight = self._recount()
+
+    def check_in_baggage(
+        self, tag_id: str, booking_id: str, weight_kg: float, location: str, owner_id: str = ""
+    ) -> BaggageItem:
         if weight_kg > self.max_weight_kg:
             raise OverweightBaggageError("Baggage overweight")
         tag = BaggageTag(tag_id=tag_id, booking_id=booking_id)
-        item = BaggageItem(tag=tag, weight_kg=weight_kg)
+        item = BaggageItem(tag=tag, weight_kg=weight_kg, owner_id=owner_id)
         item.check_in(location)
-        self._items[tag_id] = item
-        return item
+
+        def store(existing: Optional[BaggageItem]) -> BaggageItem:
+            if existing is not None:
+                self._track(existing.status, None, -existing.weight_kg)
+            self._track(None, item.status, item.weight_kg)
+            return item
+
+        return self.baggage.compute(tag_id, store)
 
     def load_to_aircraft(self, tag_id: str, location: str) -> BaggageItem:
-        item = self._items.get(tag_id)
-        if not item:
-            raise BaggageNotFoundError(f"Baggage with tag {tag_id} not found")
-        item.mark_loaded(location)
-        return item
+        def load(item: Optional[BaggageItem]) -> BaggageItem:
+            item = self._require(tag_id, item)
+            previous = item.status
+            item.mark_loaded(location)
+            self._track(previous, item.status)
+            return item
+
+        return self.baggage.compute(tag_id, load)
+
+    def load_many(self, scans: Iterable[Tuple[str, str]]) -> List[str]:
+        """Apply ``(tag_id, location)`` loads as one repository batch; unknown tags are returned, not raised."""
+        locations: Dict[str, List[str]] = {}
+        for tag_id, location in scans:
+            locations.setdefault(tag_id, []).append(location)
+
+        def load(tag_id: str, item: Optional[BaggageItem]) -> Optional[BaggageItem]:
+            if item is None:
+                return None
+            for location in locations[tag_id]:
+                previous = item.status
+                item.mark_loaded(location)
+                self._track(previous, item.status)
+            return item
+
+        missing: List[str] = []
+        for tag_id, (item, error) in zip(locations, self.baggage.compute_many(list(locations), load)):
+            if error is not None:
+                raise error
+            if item is None:
+                missing.append(tag_id)
+        return missing
 
     def mark_lost(self, tag_id: str) -> BaggageItem:
-        item = self._items.get(tag_id)
-        if not item:
-            raise BaggageNotFoundError(f"Baggage with tag {tag_id} not found")
-        item.mark_lost()
-        return item
+        def lose(item: Optional[BaggageItem]) -> BaggageItem:
+            item = self._require(tag_id, item)
+            previous = item.status
+            item.mark_lost()
+            self._track(previous, item.status)
+            return item
+
+        return self.baggage.compute(tag_id, lose)
+
+    def remove_baggage(self, tag_id: str) -> BaggageItem:
+        removed: List[BaggageItem] = []
+
+        def drop(item: Optional[BaggageItem]) -> None:
+            item = self._require(tag_id, item)
+            self._track(item.status, None, -item.weight_kg)
+            removed.append(item)
+            return None
+
+        self.baggage.compute(tag_id, drop)
+        return removed[0]
+
+    def retag_baggage(self, tag_id: str, new_tag_id: str, booking_id: Optional[str] = None) -> BaggageItem:
+        """Move a bag to a new tag and optionally to another booking."""
+
+        def retag(item: Optional[BaggageItem], occupant: Optional[BaggageItem]) -> BaggageItem:
+            item = self._require(tag_id, item)
+            if new_tag_id != tag_id and occupant is not None:
+                raise ValueError(f"Tag {new_tag_id} is already in use")
+            item.tag = BaggageTag(
+                tag_id=new_tag_id,
+                booking_id=booking_id if booking_id is not None else item.tag.booking_id,
+                priority=item.tag.priority,
+            )
+            return item
+
+        return self.baggage.move(tag_id, new_tag_id, retag)
 
     def count_by_status(self, status: BaggageStatus) -> int:
-        return sum(1 for item in self._items.values() if item.status == status)
+        if self.consistency_check:
+            self.verify_counters()
+        return self._status_counts[status]
 
     def total_weight(self) -> float:
-        return sum(item.weight_kg for item in self._items.values())
+        if self.consistency_check:
+            self.verify_counters()
+        return self._total_weight
+
+    def verify_counters(self) -> None:
+        counts, weight = self._recount()
+        with self._counter_lock:
+            expected = {status: n for status, n in counts.items() if n}
+            actual = {status: n for status, n in self._status_counts.items() if n}
+            if expected != actual or not math.isclose(weight, self._total_weight, abs_tol=1e-6):
+                raise BaggageCounterMismatchError(
+                    f"Counters {actual}, {self._total_weight} kg differ from recount {expected}, {weight} kg"
+                )
 
     def find_by_booking(self, booking_id: str) -> List[BaggageItem]:
-        return [item for item in self._items.values() if item.tag.booking_id == booking_id]
+        return self.baggage.find_by_booking(booking_id)
+
+    def find_by_owner(self, owner_id: str) -> List[BaggageItem]:
+        return self.baggage.find_by_owner(owner_id)
+
+    def _recount(self) -> Tuple[Counter, float]:
+        items = list(self.baggage.all())
+        return Counter(item.status for item in items), math.fsum(item.weight_kg for item in items)
+
+    def _track(
+        self, previous: Optional[BaggageStatus], current: Optional[BaggageStatus], weight_delta: float = 0.0
+    ) -> None:
+        with self._counter_lock:
+            if previous is not None:
+                self._status_counts[previous] -= 1
+            if current is not None:
+                self._status_counts[current] += 1
+            self._total_weight += weight_delta
+
+    @staticmethod
+    def _require(tag_id: str, item: Optional[BaggageItem]) -> BaggageItem:
+        if not item:
+            raise BaggageNotFoundError(f"Baggage with tag {tag_id} not found")
+        return item
@@ -1,17 +1,36 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from ..domain.booking import Booking
 from ..domain.enums import BookingStatus
-from ..exceptions import BookingAlreadyPaidError, BookingNotFoundError
+from ..exceptions import BookingAlreadyPaidError, BookingNotFoundError, PaymentDeclinedError
 from ..repositories.booking_repository import BookingRepository
+from ..repositories.payment_ledger import PaymentLedger
 from ..utils import id_generator
+from ..utils.validation import ensure_not_empty
+
+
+@dataclass
+class BookingResult:
+    """Outcome of one item of a bulk operation; ``index`` is its position in the input."""
+
+    index: int
+    booking: Optional[Booking] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 @dataclass
 class BookingService:
     bookings: BookingRepository
+    bulk_batch_size: int = 1000
+    # оплата принимается только по завершённому платежу из этого журнала
+    payments: PaymentLedger = field(default_factory=PaymentLedger)
 
     def create_booking(self, passenger_id: str, flight_id: str) -> Booking:
         booking_id = id_generator.next_id("BKG")
@@ -20,29 +39,105 @@ class BookingService:
         return booking
 
     def confirm_booking(self, booking_id: str) -> Booking:
-        booking = self.bookings.get(booking_id)
-        if not booking:
-            raise BookingNotFoundError(f"Booking {booking_id} not found")
-        booking.confirm()
-        return booking
+        def confirm(booking: Optional[Booking]) -> Booking:
+            booking = self._require(booking_id, booking)
+            booking.confirm()
+            return booking
+
+        return self.bookings.compute(booking_id, confirm)
 
     def mark_paid(self, booking_id: str, payment_id: str) -> Booking:
-        booking = self.bookings.get(booking_id)
-        if not booking:
-            raise BookingNotFoundError(f"Booking {booking_id} not found")
-        if booking.status in (BookingStatus.CANCELLED, BookingStatus.COMPLETED):
-            raise BookingAlreadyPaidError("Cannot pay for finalised booking")
-        booking.add_payment(payment_id)
-        booking.status = BookingStatus.COMPLETED
-        booking.touch()
-        return booking
+        # проверка статуса и оплата выполняются атомарно относительно других потоков
+        def pay(booking: Optional[Booking]) -> Booking:
+            booking = self._require(booking_id, booking)
+            if booking.status == BookingStatus.COMPLETED and payment_id in booking.payment_ids:
+                return booking
+            if booking.status in (BookingStatus.CANCELLED, BookingStatus.COMPLETED):
+                raise BookingAlreadyPaidError("Cannot pay for finalised booking")
+            payment = self.payments.get(payment_id)
+            if payment is None or payment.booking_id != booking_id or not payment.is_successful():
+                raise PaymentDeclinedError(f"Payment {payment_id} is not a completed payment of {booking_id}")
+            booking.add_payment(payment)
+            booking.complete()
+            return booking
+
+        return self.bookings.compute(booking_id, pay)
 
     def cancel_booking(self, booking_id: str) -> Booking:
-        booking = self.bookings.get(booking_id)
-        if not booking:
-            raise BookingNotFoundError(f"Booking {booking_id} not found")
-        booking.cancel()
-        return booking
+        def cancel(booking: Optional[Booking]) -> Booking:
+            booking = self._require(booking_id, booking)
+            booking.cancel()
+            return booking
+
+        return self.bookings.compute(booking_id, cancel)
 
     def get_bookings_for_passenger(self, passenger_id: str) -> List[Booking]:
         return self.bookings.find_by_passenger(passenger_id)
+
+    def create_bookings_bulk(self, rows: Iterable[Sequence[str]]) -> List[BookingResult]:
+        """Create bookings from ``(passenger_id, flight_id)`` rows, e.g. parsed CSV lines."""
+        results: List[BookingResult] = []
+        for batch in self._batches(enumerate(rows)):
+            valid: List[Tuple[int, str, str]] = []
+            for index, row in batch:
+                try:
+                    values = tuple(row)
+                    if len(values) != 2:
+                        raise ValueError("Row must contain passenger_id and flight_id")
+                    passenger_id, flight_id = (str(value).strip() for value in values)
+                    ensure_not_empty(passenger_id, "passenger_id")
+                    ensure_not_empty(flight_id, "flight_id")
+                except (TypeError, ValueError) as exc:
+                    results.append(BookingResult(index, error=exc))
+                    continue
+                valid.append((index, passenger_id, flight_id))
+            if not valid:
+                continue
+            booking_ids = id_generator.next_ids("BKG", len(valid))
+            created = [
+                BookingResult(index, Booking(booking_id=booking_id, passenger_id=passenger_id, flight_id=flight_id))
+                for booking_id, (index, passenger_id, flight_id) in zip(booking_ids, valid)
+            ]
+            self.bookings.add_many((r.booking.booking_id, r.booking) for r in created)
+            results.extend(created)
+        results.sort(key=lambda r: r.index)
+        return results
+
+    def confirm_bookings_bulk(self, booking_ids: Iterable[str]) -> List[BookingResult]:
+        return self._apply_bulk(booking_ids, Booking.confirm)
+
+    def cancel_bookings_bulk(self, booking_ids: Iterable[str]) -> List[BookingResult]:
+        return self._apply_bulk(booking_ids, Booking.cancel)
+
+    def _apply_bulk(self, booking_ids: Iterable[str], transition: Callable[[Booking], None]) -> List[BookingResult]:
+        """Apply ``transition`` with one repository write (and journal append) per batch.
+
+        Every failure, expected or not, is reported on its item: the rest of
+        the batch is already persisted, so raising would hide what succeeded.
+        """
+
+        def apply(booking_id: str, booking: Optional[Booking]) -> Booking:
+            booking = self._require(booking_id, booking)
+            transition(booking)
+            return booking
+
+        results: List[BookingResult] = []
+        for batch in self._batches(enumerate(booking_ids)):
+            outcomes = self.bookings.compute_many([booking_id for _, booking_id in batch], apply)
+            for (index, _), (booking, error) in zip(batch, outcomes):
+                results.append(BookingResult(index, booking, error))
+        return results
+
+    def _batches(self, items: Iterable[Tuple[int, Sequence[str]]]) -> Iterator[List[Tuple[int, Sequence[str]]]]:
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, self.bulk_batch_size))
+            if not batch:
+                return
+            yield batch
+
+    @staticmethod
+    def _require(booking_id: str, booking: Optional[Booking]) -> Booking:
+        if not booking:
+            raise BookingNotFoundError(f"Booking {booking_id} not found")
+        return booking
@@ -0,0 +1,142 @@
+from __future__ import annotations
+import json
+import os
+from dataclasses import dataclass, field
+from decimal import Decimal
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from ..domain.payment import Money, sum_money
+from ..exceptions import CurrencyMismatchError
+
+
+@dataclass
+class RateTable:
+    """Units of each currency per one ``base`` unit, plus non-default precisions.
+
+    The file snapshot is JSON::
+
+        {"base": "USD", "as_of": "2030-01-01", "rates": {"EUR": "0.92", "JPY": "151.2"},
+         "precision": {"JPY": 0}}
+    """
+
+    base: str
+    rates: Dict[str, Decimal]
+    precision: Dict[str, int] = field(default_factory=dict)
+    as_of: str = ""
+    # кэш кросс-курсов живёт вместе с курсами и заменяется вместе с таблицей
+    _factors: Dict[Tuple[str, int, str], Tuple[int, int]] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RateTable":
+        with Path(path).open("r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        rates = {code: Decimal(str(rate)) for code, rate in data["rates"].items()}
+        rates[data["base"]] = Decimal(1)
+        if any(rate <= 0 for rate in rates.values()):
+            raise ValueError("Exchange rates must be positive")
+        precision = {code: int(digits) for code, digits in data.get("precision", {}).items()}
+        return cls(data["base"], rates, precision, data.get("as_of", ""))
+
+    def precision_of(self, currency: str) -> int:
+        return self.precision.get(currency, 2)
+
+    def rate_of(self, currency: str) -> Decimal:
+        rate = self.rates.get(currency)
+        if rate is None:
+            raise CurrencyMismatchError(f"No exchange rate for {currency}")
+        return rate
+
+    def factor(self, source: str, source_precision: int, target: str) -> Tuple[int, int]:
+        """Exact ``(numerator, denominator)`` turning source minor units into target minor units."""
+        key = (source, source_precision, target)
+        factor = self._factors.get(key)
+        if factor is None:
+            # минорные единицы источника -> минорные единицы цели одной точной дробью
+            ratio = Fraction(self.rate_of(target)) / Fraction(self.rate_of(source))
+            ratio *= Fraction(10) ** (self.precision_of(target) - source_precision)
+            factor = self._factors[key] = (ratio.numerator, ratio.denominator)
+        return factor
+
+
+@dataclass
+class CurrencyConverter:
+    """Converts :class:`Money` between currencies using a :class:`RateTable`.
+
+    Cross rates are derived through the base currency once and cached as exact
+    integer ratios between minor units, so each conversion is a multiply and a
+    half-up integer division. The cache belongs to the :class:`RateTable`, and
+    every call reads ``table`` once, so :meth:`reload` swaps rates and cached
+    factors together without a lock. Amounts already in the target currency
+    are rescaled to the table's precision for it.
+    """
+
+    table: RateTable
+    path: Optional[Path] = None
+    _mtime: Optional[float] = field(default=None, repr=False)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "CurrencyConverter":
+        path = Path(path)
+        converter = cls(RateTable.load(path), path)
+        converter._mtime = os.stat(path).st_mtime
+        return converter
+
+    def reload(self) -> bool:
+        """Re-read the rate file if it changed; returns whether rates were replaced."""
+        if self.path is None:
+            return False
+        mtime = os.stat(self.path).st_mtime
+        if mtime == self._mtime:
+            return False
+        self.table = RateTable.load(self.path)
+        self._mtime = mtime
+        return True
+
+    def supports(self, currency: str) -> bool:
+        return currency in self.table.rates
+
+    def rate(self, source: str, target: str) -> Decimal:
+        table = self.table
+        return table.rate_of(target) / table.rate_of(source)
+
+    def convert(self, money: Money, target: str) -> Money:
+        table = self.table
+        precision = table.precision_of(target)
+        if money.currency == target and money.precision == precision:
+            return money
+        numerator, denominator = table.factor(money.currency, money.precision, target)
+        minor_units = _divide_half_up(money.minor_units * numerator, denominator)
+        return Money.from_minor(minor_units, target, precision)
+
+    def convert_many(self, amounts: Iterable[Money], target: str) -> List[Money]:
+        """Convert a batch; the cross rate is looked up once per source currency."""
+        table = self.table
+        precision = table.precision_of(target)
+        factors: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        result: List[Money] = []
+        for money in amounts:
+            if money.currency == target and money.precision == precision:
+                result.append(money)
+                continue
+            key = (money.currency, money.precision)
+            factor = factors.get(key)
+            if factor is None:
+                factor = factors[key] = table.factor(money.currency, money.precision, target)
+            minor_units = _divide_half_up(money.minor_units * factor[0], factor[1])
+            result.append(Money.from_minor(minor_units, target, precision))
+        return result
+
+    def sum(self, amounts: Iterable[Money], target: str) -> Money:
+        """Exact total of mixed-currency amounts in ``target``."""
+        converted = self.convert_many(amounts, target)
+        precision = converted[0].precision if converted else self.table.precision_of(target)
+        return sum_money(converted, target, precision)
+
+
+def _divide_half_up(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import asyncio
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple, Type
+
+from ..domain import events
+from ..domain.events import DomainEvent
+
+
+logger = logging.getLogger(__name__)
+
+BatchHandler = Callable[[List[DomainEvent]], None]
+AsyncBatchHandler = Callable[[List[DomainEvent]], Awaitable[None]]
+
+
+@dataclass
+class Subscription:
+    """Bounded per-subscriber queue; the oldest events are dropped on overflow."""
+
+    event_types: Tuple[Type[DomainEvent], ...]
+    batch_size: int = 100
+    max_queue: int = 10000
+    dropped: int = 0
+    delivered: int = 0
+    _queue: Deque[DomainEvent] = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.batch_size <= 0 or self.max_queue < self.batch_size:
+            raise ValueError("Queue must hold at least one positive batch")
+        self._queue = deque(maxlen=self.max_queue)
+
+    def accepts(self, event: DomainEvent) -> bool:
+        return not self.event_types or isinstance(event, self.event_types)
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def offer(self, event: DomainEvent) -> None:
+        with self._lock:
+            if len(self._queue) == self.max_queue:
+                self.dropped += 1
+            self._queue.append(event)
+
+    def _take_batch(self) -> List[DomainEvent]:
+        with self._lock:
+            count = min(self.batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+
+@dataclass
+class SyncSubscription(Subscription):
+    handler: Optional[BatchHandler] = None
+    failed: int = 0
+
+    def offer(self, event: DomainEvent) -> None:
+        super().offer(event)
+        if len(self._queue) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            try:
+                self.handler(batch)
+            except Exception:
+                # сбой подписчика не должен срывать переход состояния у издателя
+                logger.exception("Event subscriber failed on a batch of %d events", len(batch))
+                self.failed += len(batch)
+                continue
+            self.delivered += len(batch)
+
+
+@dataclass
+class AsyncSubscription(Subscription):
+    """Queue drained by :meth:`run` on an asyncio loop; ``offer`` is safe from any thread."""
+
+    handler: Optional[AsyncBatchHandler] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = field(default=None, init=False, repr=False)
+    _wakeup: Optional[asyncio.Event] = field(default=None, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+
+    def offer(self, event: DomainEvent) -> None:
+        super().offer(event)
+        self._wake()
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        try:
+            while True:
+                batch = self._take_batch()
+                if batch:
+                    await self.handler(batch)
+                    self.delivered += len(batch)
+                    continue
+                if self._closed:
+                    return
+                await self._wakeup.wait()
+                self._wakeup.clear()
+        finally:
+            self._loop = None
+
+    def close(self) -> None:
+        """Stop :meth:`run` once the queue is drained."""
+        self._closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # цикл закрылся между проверкой и вызовом; события дождутся следующего run()
+            pass
+
+
+@dataclass
+class EventBus:
+    """In-process publish/subscribe bus for domain events."""
+
+    _subscriptions: List[Subscription] = field(default_factory=list)
+
+    def subscribe(
+        self,
+        handler: BatchHandler,
+        *event_types: Type[DomainEvent],
+        batch_size: int = 100,
+        max_queue: int = 10000,
+    ) -> SyncSubscription:
+        subscription = SyncSubscription(tuple(event_types), batch_size, max_queue, handler=handler)
+        self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def subscribe_async(
+        self,
+        handler: AsyncBatchHandler,
+        *event_types: Type[DomainEvent],
+        batch_size: int = 100,
+        max_queue: int = 10000,
+    ) -> AsyncSubscription:
+        subscription = AsyncSubscription(tuple(event_types), batch_size, max_queue, handler=handler)
+        self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def publish(self, event: DomainEvent) -> None:
+        for subscription in self._subscriptions:
+            if subscription.accepts(event):
+                try:
+                    subscription.offer(event)
+                except Exception:
+                    logger.exception("Event subscription failed to accept %s", type(event).__name__)
+
+    def flush(self) -> None:
+        for subscription in self._subscriptions:
+            if isinstance(subscription, SyncSubscription):
+                subscription.flush()
+
+    def attach(self) -> None:
+        """Start receiving events published by domain objects."""
+        events.add_sink(self.publish)
+
+    def detach(self) -> None:
+        events.remove_sink(self.publish)
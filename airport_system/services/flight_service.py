@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import Callable, ClassVar, Dict, List, Optional
 
 from ..domain.enums import FlightStatus
 from ..domain.flight import Flight
@@ -13,29 +13,54 @@ from ..repositories.flight_repository import FlightRepository
 class FlightService:
     flights: FlightRepository
 
+    # переходы, о которых рейс сам публикует доменные события
+    _transitions: ClassVar[Dict[FlightStatus, Callable[[Flight], None]]] = {
+        FlightStatus.DEPARTED: Flight.depart,
+        FlightStatus.ARRIVED: Flight.arrive,
+        FlightStatus.CANCELLED: Flight.cancel,
+    }
+
     def schedule_flight(self, flight: Flight) -> None:
-        if self.flights.get(flight.flight_id):
-            raise ValueError("Flight already exists")
-        self.flights.add(flight.flight_id, flight)
+        def schedule(existing: Optional[Flight]) -> Flight:
+            if existing:
+                raise ValueError("Flight already exists")
+            return flight
+
+        self.flights.compute(flight.flight_id, schedule)
 
     def update_status(self, flight_id: str, status: FlightStatus) -> Flight:
-        flight = self.flights.get(flight_id)
-        if not flight:
-            raise FlightNotFoundError(f"Flight {flight_id} not found")
-        if flight.status == FlightStatus.DEPARTED and status != FlightStatus.ARRIVED:
-            raise FlightAlreadyDepartedError("Cannot change status of departed flight")
-        flight.status = status
-        return flight
+        def change(flight: Optional[Flight]) -> Flight:
+            flight = self._require(flight_id, flight)
+            if flight.status == FlightStatus.DEPARTED and status != FlightStatus.ARRIVED:
+                raise FlightAlreadyDepartedError("Cannot change status of departed flight")
+            transition = self._transitions.get(status)
+            if transition is not None:
+                transition(flight)
+            else:
+                flight.status = status
+            return flight
+
+        return self.flights.compute(flight_id, change)
 
     def upcoming_flights(self, now: datetime) -> List[Flight]:
         return self.flights.find_active(now)
 
+    def departures_between(self, start: datetime, end: datetime) -> List[Flight]:
+        return self.flights.find_departing_between(start, end)
+
     def cancel_flight(self, flight_id: str) -> Flight:
-        flight = self.flights.get(flight_id)
-        if not flight:
-            raise FlightNotFoundError(f"Flight {flight_id} not found")
-        flight.status = FlightStatus.CANCELLED
-        return flight
+        def cancel(flight: Optional[Flight]) -> Flight:
+            flight = self._require(flight_id, flight)
+            flight.cancel()
+            return flight
+
+        return self.flights.compute(flight_id, cancel)
 
     def find_by_route(self, origin: str, destination: str) -> List[Flight]:
         return self.flights.find_by_route(origin, destination)
+
+    @staticmethod
+    def _require(flight_id: str, flight: Optional[Flight]) -> Flight:
+        if not flight:
+            raise FlightNotFoundError(f"Flight {flight_id} not found")
+        return flight
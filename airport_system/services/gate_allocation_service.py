@@ -0,0 +1,204 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ..domain.enums import FlightStatus
+from ..domain.flight import Flight
+from ..domain.terminal import Gate, Terminal
+from ..exceptions import FlightNotFoundError
+from .gate_occupancy_service import GateOccupancyService
+
+# окно занятости не может быть пустым, даже при нулевом turnaround
+_MIN_OCCUPANCY = timedelta(minutes=1)
+
+
+@dataclass
+class GateAllocationService:
+    """Assigns a day of flights to contact gates without overlaps.
+
+    A flight occupies its gate for ``turnaround`` before departure, or after
+    arrival when it lands at ``airport_code``; consecutive occupants of a gate
+    are kept ``buffer`` apart. Allocation is a best-fit sweep by end time:
+    each flight takes the compatible gate that became free most recently, an
+    aircraft's previous gate is preferred to avoid towing, and international
+    gates are kept for international flights where possible. Flights that do
+    not fit go to remote stands. On interchangeable gates the sweep leaves the
+    fewest flights remote; with the international split and gate reuse it is
+    a heuristic. Delays reassign the affected flight only, never onto a
+    closed gate.
+
+    Windows are booked in ``occupancy``, a private :class:`GateOccupancyService`
+    unless a shared one is passed; windows already booked there by others are
+    respected. A window lasts at least one minute, even with no turnaround.
+    """
+
+    terminals: Sequence[Terminal]
+    airport_code: Optional[str] = None
+    domestic_airports: FrozenSet[str] = frozenset()
+    turnaround: timedelta = timedelta(minutes=45)
+    buffer: timedelta = timedelta(minutes=10)
+    # по умолчанию — собственный реестр, создаётся в __post_init__
+    occupancy: GateOccupancyService = field(default=None)  # type: ignore[assignment]
+    _gates: List[Gate] = field(default_factory=list, init=False, repr=False)
+    _flights: Dict[str, Flight] = field(default_factory=dict, init=False, repr=False)
+    _assigned: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _windows: Dict[str, Tuple[datetime, datetime]] = field(default_factory=dict, init=False, repr=False)
+    _remote: Set[str] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.occupancy is None:
+            self.occupancy = GateOccupancyService(self.terminals)
+
+    def allocate(self, flights: Iterable[Flight]) -> Dict[str, str]:
+        """Replace the current plan with one for ``flights``; returns flight_id -> gate_id."""
+        self.release()
+        self._gates = [g for t in self.terminals for g in t.gates if g.is_open]
+        international_gates = [i for i, g in enumerate(self._gates) if g.supports_international]
+        domestic_gates = [i for i, g in enumerate(self._gates) if not g.supports_international]
+        # (освободится в, -индекс гейта): best-fit бисекцией, при равенстве — меньший индекс
+        pools: Dict[bool, List[Tuple[datetime, int]]] = {
+            True: sorted((datetime.min, -i) for i in international_gates),
+            False: sorted((datetime.min, -i) for i in domestic_gates),
+        }
+        free_at = [datetime.min] * len(self._gates)
+        last_gate: Dict[str, int] = {}
+
+        movements = []
+        for flight in flights:
+            if flight.status == FlightStatus.CANCELLED:
+                continue
+            start, end = self._window(flight)
+            movements.append((start, end, flight))
+        movements.sort(key=lambda m: (m[1], m[0], m[2].flight_id))
+
+        for start, end, flight in movements:
+            self._track(flight, start, end)
+            international = self._is_international(flight)
+            latest = start - self.buffer
+            gate = last_gate.get(flight.aircraft.registration)
+            if gate is None or free_at[gate] > latest or not self._compatible(gate, international):
+                gate = None if international else self._best_fit(pools[False], latest)
+                if gate is None:
+                    gate = self._best_fit(pools[True], latest)
+            if gate is not None and not self._is_free(gate, start, end):
+                # гейт занят бронированием из общего реестра
+                gate = self._first_free(None, international, start, end)
+            if gate is None:
+                self._remote.add(flight.flight_id)
+                continue
+            pool = pools[self._gates[gate].supports_international]
+            del pool[bisect_left(pool, (free_at[gate], -gate))]
+            free_at[gate] = max(free_at[gate], end)
+            insort(pool, (free_at[gate], -gate))
+            self._book(gate, flight.flight_id, start, end)
+            last_gate[flight.aircraft.registration] = gate
+        return self.assignments()
+
+    def reassign(self, flight: Flight) -> Optional[str]:
+        """Re-place ``flight`` after its times changed; other flights keep their gates."""
+        if flight.flight_id not in self._flights:
+            raise FlightNotFoundError(f"Flight {flight.flight_id} is not allocated")
+        previous = self._assigned.pop(flight.flight_id, None)
+        if previous is not None:
+            self.occupancy.release(flight.flight_id)
+        self._remote.discard(flight.flight_id)
+        start, end = self._window(flight)
+        self._windows[flight.flight_id] = (start, end)
+
+        # гейты, добавленные после allocate, дописываются в конец: индексы остаются прежними
+        known = {g.gate_id for g in self._gates}
+        self._gates += [g for t in self.terminals for g in t.gates if g.is_open and g.gate_id not in known]
+        gate = self._first_free(previous, self._is_international(flight), start, end)
+        if gate is None:
+            self._remote.add(flight.flight_id)
+            return None
+        self._book(gate, flight.flight_id, start, end)
+        return self._gates[gate].gate_id
+
+    def assignments(self) -> Dict[str, str]:
+        return {flight_id: self._gates[gate].gate_id for flight_id, gate in self._assigned.items()}
+
+    def gate_for(self, flight_id: str) -> Optional[Gate]:
+        gate = self._assigned.get(flight_id)
+        return self._gates[gate] if gate is not None else None
+
+    def remote_flights(self) -> List[str]:
+        return sorted(self._remote)
+
+    def tow_count(self) -> int:
+        """Number of times an aircraft has to move between contact gates."""
+        by_aircraft: Dict[str, List[Tuple[datetime, int]]] = {}
+        for flight_id, gate in self._assigned.items():
+            registration = self._flights[flight_id].aircraft.registration
+            by_aircraft.setdefault(registration, []).append((self._windows[flight_id][0], gate))
+        tows = 0
+        for movements in by_aircraft.values():
+            movements.sort()
+            tows += sum(1 for (_, a), (_, b) in zip(movements, movements[1:]) if a != b)
+        return tows
+
+    def apply(self) -> None:
+        """Write the planned gates onto the flights."""
+        for flight_id, gate in self._assigned.items():
+            self._flights[flight_id].assign_gate(self._gates[gate].gate_id, self._gates[gate].terminal_code)
+
+    def release(self) -> None:
+        """Forget the current plan and stop following delays."""
+        for flight in self._flights.values():
+            flight.remove_observer(self._on_flight_changed)
+        for flight_id in self._assigned:
+            self.occupancy.release(flight_id)
+        self._flights.clear()
+        self._assigned.clear()
+        self._windows.clear()
+        self._remote.clear()
+
+    def _track(self, flight: Flight, start: datetime, end: datetime) -> None:
+        self._flights[flight.flight_id] = flight
+        self._windows[flight.flight_id] = (start, end)
+        flight.add_observer(self._on_flight_changed)
+
+    def _window(self, flight: Flight) -> Tuple[datetime, datetime]:
+        turnaround = max(self.turnaround, _MIN_OCCUPANCY)
+        if self.airport_code is not None and flight.destination == self.airport_code:
+            return flight.arrival_time, flight.arrival_time + turnaround
+        return flight.departure_time - turnaround, flight.departure_time
+
+    def _is_free(self, gate: int, start: datetime, end: datetime) -> bool:
+        return self.occupancy.is_free(self._gates[gate].gate_id, start, end, self.buffer)
+
+    def _first_free(
+        self, preferred: Optional[int], international: bool, start: datetime, end: datetime
+    ) -> Optional[int]:
+        candidates = [preferred] if preferred is not None else []
+        candidates += [i for i, g in enumerate(self._gates) if not g.supports_international]
+        candidates += [i for i, g in enumerate(self._gates) if g.supports_international]
+        for gate in candidates:
+            if not self._gates[gate].is_open:
+                continue
+            if self._compatible(gate, international) and self._is_free(gate, start, end):
+                return gate
+        return None
+
+    def _book(self, gate: int, flight_id: str, start: datetime, end: datetime) -> None:
+        self.occupancy.book(self._gates[gate].gate_id, flight_id, start, end, self.buffer)
+        self._assigned[flight_id] = gate
+
+    def _is_international(self, flight: Flight) -> bool:
+        if not self.domestic_airports:
+            return False
+        return flight.origin not in self.domestic_airports or flight.destination not in self.domestic_airports
+
+    def _compatible(self, gate: int, international: bool) -> bool:
+        return not international or self._gates[gate].supports_international
+
+    @staticmethod
+    def _best_fit(pool: List[Tuple[datetime, int]], latest: datetime) -> Optional[int]:
+        index = bisect_right(pool, (latest, float("inf"))) - 1
+        return -pool[index][1] if index >= 0 else None
+
+    def _on_flight_changed(self, flight: Any, attribute: str) -> None:
+        if attribute in ("departure_time", "arrival_time"):
+            self.reassign(flight)
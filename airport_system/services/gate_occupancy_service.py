@@ -0,0 +1,126 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..domain.terminal import Gate, GateTimeline, Terminal
+
+Window = Tuple[datetime, datetime]
+
+
+@dataclass
+class GateOccupancyService:
+    """Airport-wide occupancy timelines of every gate, for what-if planning.
+
+    Each gate keeps a :class:`GateTimeline`; a free check is two bisections, and
+    :meth:`free_gates_many` answers a batch of windows gate by gate. Gates added
+    to a terminal later are picked up on the next call. A gate given a flight
+    through :meth:`Gate.assign_flight` without a window booked here is busy for
+    every window until it is cleared. Hand the service to
+    :class:`GateAllocationService` to have its plans booked here too.
+    """
+
+    terminals: Sequence[Terminal]
+    buffer: timedelta = timedelta(0)
+    _gates: List[Gate] = field(default_factory=list, init=False, repr=False)
+    _timelines: Dict[str, GateTimeline] = field(default_factory=dict, init=False, repr=False)
+    _gate_of_flight: Dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    # гейт -> рейс, поставленный на гейт без забронированного окна
+    _held: Dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._sync()
+
+    def timeline(self, gate_id: str) -> GateTimeline:
+        timeline = self._timelines.get(gate_id)
+        if timeline is None:
+            self._sync()
+            timeline = self._timelines.get(gate_id)
+            if timeline is None:
+                raise KeyError(gate_id)
+        return timeline
+
+    def book(
+        self, gate_id: str, flight_id: str, start: datetime, end: datetime, buffer: Optional[timedelta] = None
+    ) -> None:
+        """Occupy ``gate_id`` over ``[start, end)``; ``buffer`` overrides the service's own spacing."""
+        if flight_id in self._gate_of_flight:
+            raise ValueError(f"Flight {flight_id} already occupies gate {self._gate_of_flight[flight_id]}")
+        self.timeline(gate_id).book(start, end, flight_id, self.buffer if buffer is None else buffer)
+        self._gate_of_flight[flight_id] = gate_id
+        if self._held.get(gate_id) == flight_id:
+            del self._held[gate_id]
+
+    def release(self, flight_id: str) -> bool:
+        gate_id = self._gate_of_flight.pop(flight_id, None)
+        if gate_id is None:
+            return False
+        return self._timelines[gate_id].release(flight_id)
+
+    def gate_of(self, flight_id: str) -> Optional[str]:
+        return self._gate_of_flight.get(flight_id)
+
+    def is_free(self, gate_id: str, start: datetime, end: datetime, buffer: Optional[timedelta] = None) -> bool:
+        timeline = self.timeline(gate_id)
+        if gate_id in self._held:
+            return False
+        return timeline.is_free(start, end, self.buffer if buffer is None else buffer)
+
+    def free_gates(self, start: datetime, end: datetime, international: Optional[bool] = None) -> List[Gate]:
+        return self.free_gates_many([(start, end)], international)[0]
+
+    def free_gates_many(self, windows: Sequence[Window], international: Optional[bool] = None) -> List[List[Gate]]:
+        """Open gates free for each window, optionally limited to one side of the international split."""
+        self._sync()
+        results: List[List[Gate]] = [[] for _ in windows]
+        buffer = self.buffer
+        for gate in self._gates:
+            if not gate.is_open or gate.gate_id in self._held:
+                continue
+            if international is not None and gate.supports_international != international:
+                continue
+            is_free = self._timelines[gate.gate_id].is_free
+            for result, (start, end) in zip(results, windows):
+                if is_free(start, end, buffer):
+                    result.append(gate)
+        return results
+
+    def free_windows(
+        self, start: datetime, end: datetime, min_length: timedelta = timedelta(0)
+    ) -> Dict[str, List[Window]]:
+        """Free gaps of every open gate inside ``[start, end)``."""
+        self._sync()
+        result: Dict[str, List[Window]] = {}
+        for gate in self._gates:
+            if not gate.is_open or gate.gate_id in self._held:
+                continue
+            windows = self._timelines[gate.gate_id].free_windows(start, end, min_length)
+            if windows:
+                result[gate.gate_id] = windows
+        return result
+
+    def _sync(self) -> None:
+        gates = [gate for terminal in self.terminals for gate in terminal.gates]
+        if [gate.gate_id for gate in gates] == [gate.gate_id for gate in self._gates]:
+            return
+        # расписание убранного гейта сохраняем, чтобы его рейсы можно было освободить
+        current = {gate.gate_id for gate in gates}
+        for gate in self._gates:
+            if gate.gate_id not in current:
+                gate.remove_observer(self._on_gate_changed)
+                self._held.pop(gate.gate_id, None)
+        known = {gate.gate_id for gate in self._gates}
+        for gate in gates:
+            if gate.gate_id not in known:
+                self._timelines.setdefault(gate.gate_id, GateTimeline(gate.gate_id))
+                gate.add_observer(self._on_gate_changed)
+                self._on_gate_changed(gate, "current_flight_id")
+        self._gates = gates
+
+    def _on_gate_changed(self, gate: Any, attribute: str) -> None:
+        if attribute != "current_flight_id":
+            return
+        self._held.pop(gate.gate_id, None)
+        flight_id = gate.current_flight_id
+        if flight_id is not None and self._gate_of_flight.get(flight_id) != gate.gate_id:
+            self._held[gate.gate_id] = flight_id
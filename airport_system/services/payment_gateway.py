@@ -0,0 +1,216 @@
+from __future__ import annotations
+import asyncio
+import json
+import ssl
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from ..domain.payment import CardPayment, Money
+from ..exceptions import PaymentGatewayError
+
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass(frozen=True)
+class AuthorizationRequest:
+    payment_id: str
+    amount: Money
+    card: CardPayment
+
+
+class PaymentGateway(Protocol):
+    def authorize_many(self, requests: Sequence[AuthorizationRequest]) -> List[bool]:
+        """Approve or decline every request, in order, in one round trip."""
+        ...
+
+
+class AsyncPaymentGateway(Protocol):
+    async def authorize_many(self, requests: Sequence[AuthorizationRequest]) -> List[bool]:
+        ...
+
+
+@dataclass
+class InProcessGateway:
+    """Authorizes with :meth:`CardPayment.authorize` without leaving the process."""
+
+    calls: int = 0
+
+    def authorize_many(self, requests: Sequence[AuthorizationRequest]) -> List[bool]:
+        self.calls += 1
+        return [request.card.authorize(request.amount) for request in requests]
+
+
+@dataclass
+class HttpPaymentGateway:
+    """Posts a whole batch as one JSON request.
+
+    The body is ``{"authorizations": [...]}``; the gateway answers with
+    ``{"results": [{"payment_id": ..., "approved": ...}]}``. Requests missing
+    from the answer count as declined.
+    """
+
+    url: str
+    timeout: float = 5.0
+    calls: int = 0
+
+    def authorize_many(self, requests: Sequence[AuthorizationRequest]) -> List[bool]:
+        body = _encode_batch(requests)
+        http_request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        self.calls += 1
+        try:
+            with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+                payload = json.load(response)
+            return _decode_results(requests, payload)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise PaymentGatewayError(f"Payment gateway request failed: {exc}") from exc
+
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class _StaleConnection(Exception):
+    """A pooled keep-alive connection failed before any byte of the response arrived."""
+
+
+@dataclass
+class AsyncHttpPaymentGateway:
+    """asyncio client for the same JSON protocol as :class:`HttpPaymentGateway`.
+
+    Keeps up to ``pool_size`` HTTP/1.1 keep-alive connections open and reuses
+    them across requests; callers beyond that wait for a free connection. A
+    request interrupted mid-flight (e.g. by a timeout) closes its connection.
+    ``https`` URLs are spoken over TLS with the default certificate checks.
+    Only a request whose pooled connection turned out to be closed before any
+    response arrived is retried; anything else may already have been captured
+    by the gateway and is reported as :class:`PaymentGatewayError`.
+    """
+
+    url: str
+    pool_size: int = 10
+    calls: int = 0
+    connections_opened: int = 0
+    _idle: List[_Connection] = field(default_factory=list, init=False, repr=False)
+    _slots: Optional[asyncio.Semaphore] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.pool_size <= 0:
+            raise ValueError("Pool size must be positive")
+        parts = urlsplit(self.url)
+        if parts.scheme not in _DEFAULT_PORTS:
+            raise ValueError(f"Unsupported payment gateway URL scheme: {parts.scheme!r}")
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port or _DEFAULT_PORTS[parts.scheme]
+        self._path = parts.path or "/"
+        self._ssl = ssl.create_default_context() if parts.scheme == "https" else None
+
+    async def authorize_many(self, requests: Sequence[AuthorizationRequest]) -> List[bool]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        body = _encode_batch(requests)
+        self.calls += 1
+        async with self._slots:
+            try:
+                payload = await self._exchange(body, reuse=True)
+            except _StaleConnection:
+                # сервер закрыл простаивающее соединение, не ответив, — повторяем один раз на новом
+                payload = await self._exchange(body, reuse=False)
+        try:
+            return _decode_results(requests, json.loads(payload))
+        except (ValueError, KeyError, TypeError) as exc:
+            raise PaymentGatewayError(f"Payment gateway request failed: {exc}") from exc
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _exchange(self, body: bytes, reuse: bool) -> bytes:
+        reader, writer, reused = await self._connect(reuse)
+        keep_alive = False
+        received = False
+        try:
+            writer.write(
+                (
+                    f"POST {self._path} HTTP/1.1\r\nHost: {self._host}:{self._port}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    "Connection: keep-alive\r\n\r\n"
+                ).encode("ascii")
+                + body
+            )
+            await writer.drain()
+            try:
+                status_line = await reader.readuntil(b"\r\n")
+            except asyncio.IncompleteReadError as exc:
+                received = bool(exc.partial)
+                raise
+            received = True
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readuntil(b"\r\n")
+                if line == b"\r\n":
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if "content-length" not in headers:
+                raise PaymentGatewayError("Payment gateway response has no Content-Length")
+            payload = await reader.readexactly(int(headers["content-length"]))
+            status = status_line.split(b" ", 2)
+            if len(status) < 2 or status[1] != b"200":
+                raise PaymentGatewayError(f"Payment gateway answered {status_line.decode('latin-1').strip()}")
+            keep_alive = headers.get("connection", "").lower() != "close"
+            return payload
+        except (asyncio.IncompleteReadError, OSError) as exc:
+            if reused and not received:
+                raise _StaleConnection() from exc
+            raise PaymentGatewayError(f"Payment gateway request failed: {exc}") from exc
+        finally:
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+
+    async def _connect(self, reuse: bool) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        while reuse and self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        try:
+            reader, writer = await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+        except OSError as exc:
+            raise PaymentGatewayError(f"Cannot connect to payment gateway: {exc}") from exc
+        self.connections_opened += 1
+        return reader, writer, False
+
+
+def _encode_batch(requests: Sequence[AuthorizationRequest]) -> bytes:
+    return json.dumps(
+        {
+            "authorizations": [
+                {
+                    "payment_id": r.payment_id,
+                    "amount": r.amount.amount,
+                    "currency": r.amount.currency,
+                    "card_number": r.card.card_number,
+                    "holder_name": r.card.holder_name,
+                    "expiration": r.card.expiration,
+                }
+                for r in requests
+            ]
+        }
+    ).encode("utf-8")
+
+
+def _decode_results(requests: Sequence[AuthorizationRequest], payload: Dict[str, Any]) -> List[bool]:
+    approved = {item["payment_id"]: bool(item["approved"]) for item in payload["results"]}
+    return [approved.get(r.payment_id, False) for r in requests]
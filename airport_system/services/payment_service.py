@@ -1,44 +1,173 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List
+import threading
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
 from ..domain.enums import PaymentStatus
-from ..domain.payment import CardPayment, Money, Payment
-from ..exceptions import CurrencyMismatchError, InsufficientFundsError, PaymentDeclinedError
+from ..domain.payment import CardPayment, Money, Payment, totals_by_currency
+from ..exceptions import (
+    CurrencyMismatchError,
+    InsufficientFundsError,
+    PaymentDeclinedError,
+    PaymentGatewayError,
+)
+from ..repositories.payment_ledger import PaymentLedger
 from ..utils import id_generator
+from .currency_converter import CurrencyConverter
+from .payment_gateway import AuthorizationRequest, InProcessGateway, PaymentGateway
+
+
+@dataclass
+class PaymentResult:
+    """Outcome of one item of a batch charge; ``index`` is its position in the input."""
+
+    index: int
+    payment: Optional[Payment] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 @dataclass
 class PaymentService:
+    """Card charges recorded in a :class:`PaymentLedger`.
+
+    Every status change is written through the ledger, so a journaled ledger
+    recovers settled payments and idempotent retries after a restart. The
+    ledger keeps every payment until :meth:`PaymentLedger.prune` drops settled
+    ones; long-running processes should prune past their retry window.
+    """
+
     currency: str = "USD"
+    gateway: PaymentGateway = field(default_factory=InProcessGateway)
+    batch_size: int = 100
+    ledger: PaymentLedger = field(default_factory=PaymentLedger)
+    # если задан, платежи в другой валюте пересчитываются в ``currency``, а не отклоняются
+    converter: Optional[CurrencyConverter] = None
+    _in_flight: Set[str] = field(default_factory=set, init=False, repr=False)
+    _in_flight_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
-    def charge_card(self, booking_id: str, amount: Money, card: CardPayment) -> Payment:
-        if amount.currency != self.currency:
-            raise CurrencyMismatchError("Unsupported currency")
-        if amount.amount <= 0:
-            raise InsufficientFundsError("Amount must be positive")
-        payment_id = id_generator.next_id("PAY")
-        payment = Payment(payment_id=payment_id, booking_id=booking_id, amount=amount)
-        authorised = card.authorize(amount)
+    def charge_card(
+        self, booking_id: str, amount: Money, card: CardPayment, idempotency_key: Optional[str] = None
+    ) -> Payment:
+        """Charge ``card``; a retry with the same ``idempotency_key`` returns the original outcome."""
+        charged = self._prepare(amount)
+        if idempotency_key is None:
+            payment = self._new_payment(id_generator.next_id("PAY"), booking_id, charged, amount)
+            self.ledger.add(payment.payment_id, payment)
+        else:
+            payment, created = self.ledger.claim(
+                idempotency_key, lambda: self._new_payment(id_generator.next_id("PAY"), booking_id, charged, amount)
+            )
+            if not created:
+                if payment.booking_id != booking_id or self._requested_amount(payment) != amount:
+                    raise ValueError(f"Idempotency key {idempotency_key} was used for a different payment")
+                if payment.status == PaymentStatus.DECLINED:
+                    raise PaymentDeclinedError("Card authorisation failed")
+                if payment.status != PaymentStatus.PENDING:
+                    return payment
+        # одна авторизация на платёж: параллельный повтор не должен списать второй раз
+        with self._in_flight_lock:
+            if payment.payment_id in self._in_flight:
+                raise PaymentGatewayError(f"Payment {payment.payment_id} is already being authorised")
+            self._in_flight.add(payment.payment_id)
+        try:
+            authorised = self.gateway.authorize_many([AuthorizationRequest(payment.payment_id, charged, card)])[0]
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.discard(payment.payment_id)
+        payment = self.ledger.apply(payment, lambda current: self._settle(current, authorised))
         if not authorised:
-            payment.mark_declined()
             raise PaymentDeclinedError("Card authorisation failed")
-        payment.mark_completed()
         return payment
 
+    def charge_cards_bulk(self, items: Iterable[Tuple[str, Money, CardPayment]]) -> List[PaymentResult]:
+        """Charge ``(booking_id, amount, card)`` items with one gateway call per batch.
+
+        Declines and validation errors are reported per item; if the gateway
+        call itself fails, the batch's payments are declined and carry that
+        error, so none is left pending in the ledger.
+        """
+        results: List[PaymentResult] = []
+        iterator = enumerate(items)
+        while True:
+            batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                break
+            valid: List[Tuple[int, str, Money, CardPayment]] = []
+            requested: List[Money] = []
+            prepared = self._prepare_many([amount for _, (_, amount, _) in batch])
+            for (index, (booking_id, amount, card)), charged in zip(batch, prepared):
+                if isinstance(charged, Exception):
+                    results.append(PaymentResult(index, error=charged))
+                    continue
+                valid.append((index, booking_id, charged, card))
+                requested.append(amount)
+            if not valid:
+                continue
+            payment_ids = id_generator.next_ids("PAY", len(valid))
+            payments = [
+                self._new_payment(payment_id, booking_id, charged, original)
+                for payment_id, (_, booking_id, charged, _), original in zip(payment_ids, valid, requested)
+            ]
+            self.ledger.add_many((payment.payment_id, payment) for payment in payments)
+            requests = [
+                AuthorizationRequest(payment.payment_id, amount, card)
+                for payment, (_, _, amount, card) in zip(payments, valid)
+            ]
+            gateway_error: Optional[PaymentGatewayError] = None
+            try:
+                approvals = self.gateway.authorize_many(requests)
+            except PaymentGatewayError as exc:
+                # повтор без ключа идемпотентности их не найдёт: отклоняем, чтобы не зависли в ожидании
+                gateway_error = exc
+                approvals = [False] * len(payments)
+            approved_by_id = {payment.payment_id: approved for payment, approved in zip(payments, approvals)}
+            by_id = {payment.payment_id: payment for payment in payments}
+            settled = self.ledger.compute_many(
+                list(approved_by_id),
+                lambda payment_id, current: self._settle(current or by_id[payment_id], approved_by_id[payment_id]),
+            )
+            for (payment, error), approved, (index, *_) in zip(settled, approvals, valid):
+                if error is None and not approved:
+                    error = gateway_error or PaymentDeclinedError("Card authorisation failed")
+                results.append(PaymentResult(index, payment, error))
+        results.sort(key=lambda r: r.index)
+        return results
+
     def refund_payment(self, payment: Payment) -> Payment:
-        if payment.status != PaymentStatus.COMPLETED:
-            raise PaymentDeclinedError("Only completed payments can be refunded")
-        payment.mark_refunded()
-        return payment
+        """Refund a completed payment; repeating the refund returns the refunded record."""
+
+        def refund(current: Payment) -> Payment:
+            if current.status == PaymentStatus.REFUNDED:
+                return current
+            if current.status != PaymentStatus.COMPLETED:
+                raise PaymentDeclinedError("Only completed payments can be refunded")
+            current.mark_refunded()
+            return current
+
+        return self.ledger.apply(payment, refund)
+
+    def payments_for_bookings(self, booking_ids: Iterable[str]) -> Dict[str, List[Payment]]:
+        return self.ledger.find_by_bookings(booking_ids)
+
+    def settlement_totals(self) -> Dict[str, Money]:
+        """Exact per-currency total of completed payments in the ledger."""
+        return totals_by_currency(p.amount for p in self.ledger.all() if p.status == PaymentStatus.COMPLETED)
 
     def split_payment(self, booking_id: str, total: Money, parts: int, card: CardPayment) -> List[Payment]:
-        share_amount = total.allocate(parts)
-        payments: List[Payment] = []
-        for _ in range(parts):
-            share = Money(amount=share_amount, currency=total.currency, precision=total.precision)
-            payments.append(self.charge_card(booking_id, share, card))
-        return payments
+        """Charge ``total`` in ``parts`` shares; if any share fails, the charged ones are refunded first."""
+        results = self.charge_cards_bulk((booking_id, share, card) for share in total.split(parts))
+        failed = next((result.error for result in results if result.error is not None), None)
+        if failed is not None:
+            for result in results:
+                if result.ok and result.payment is not None:
+                    self.refund_payment(result.payment)
+            raise failed
+        return [result.payment for result in results if result.payment is not None]
 
     def transfer_between_cards(self, from_card: CardPayment, to_card: CardPayment, amount: Money) -> bool:
         # учебный пример перевода денег: авторизуем списание и "зачисление"
@@ -48,3 +177,59 @@ class PaymentService:
             raise PaymentDeclinedError("Source card authorisation failed")
         # для учебных целей зачисление всегда успешно
         return True
+
+    def _prepare(self, amount: Money) -> Money:
+        """The amount to charge in ``currency``, converted when a converter is configured."""
+        if amount.currency != self.currency:
+            if self.converter is None:
+                raise CurrencyMismatchError("Unsupported currency")
+            amount = self.converter.convert(amount, self.currency)
+        if amount.minor_units <= 0:
+            raise InsufficientFundsError("Amount must be positive")
+        return amount
+
+    def _prepare_many(self, amounts: Sequence[Money]) -> List[Union[Money, Exception]]:
+        """:meth:`_prepare` for a batch, converting the foreign amounts with one ``convert_many`` call."""
+        amounts = list(amounts)
+        if self.converter is not None:
+            foreign = [
+                i for i, amount in enumerate(amounts)
+                if amount.currency != self.currency and self.converter.supports(amount.currency)
+            ]
+            converted = self.converter.convert_many([amounts[i] for i in foreign], self.currency)
+            for i, amount in zip(foreign, converted):
+                amounts[i] = amount
+        prepared: List[Union[Money, Exception]] = []
+        for amount in amounts:
+            try:
+                prepared.append(self._prepare(amount))
+            except (CurrencyMismatchError, InsufficientFundsError) as exc:
+                prepared.append(exc)
+        return prepared
+
+    @staticmethod
+    def _settle(payment: Payment, approved: bool) -> Payment:
+        if approved:
+            payment.mark_completed()
+        else:
+            payment.mark_declined()
+        return payment
+
+    @staticmethod
+    def _new_payment(payment_id: str, booking_id: str, charged: Money, requested: Money) -> Payment:
+        payment = Payment(payment_id=payment_id, booking_id=booking_id, amount=charged)
+        if requested.currency != charged.currency:
+            payment.add_metadata("original_amount", str(requested.minor_units))
+            payment.add_metadata("original_currency", requested.currency)
+            payment.add_metadata("original_precision", str(requested.precision))
+        return payment
+
+    @staticmethod
+    def _requested_amount(payment: Payment) -> Money:
+        if "original_currency" not in payment.metadata:
+            return payment.amount
+        return Money.from_minor(
+            int(payment.metadata["original_amount"]),
+            payment.metadata["original_currency"],
+            int(payment.metadata["original_precision"]),
+        )
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..domain.enums import SeatClass
+from ..domain.flight import Flight
+from ..domain.seat_inventory import FlightSeatInventory, SeatHold
+from ..exceptions import FlightNotFoundError, SeatUnavailableError
+from ..utils import id_generator
+from ..utils.time_utils import now_utc
+
+
+@dataclass
+class SeatInventoryService:
+    """Per-flight seat holds; each flight has its own lock, so flights never contend."""
+
+    hold_ttl: timedelta = timedelta(minutes=15)
+    clock: Callable[[], datetime] = now_utc
+    _inventories: Dict[str, FlightSeatInventory] = field(default_factory=dict, repr=False)
+    _locks: Dict[str, threading.Lock] = field(default_factory=dict, repr=False)
+    _registry_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def open_flight(self, flight: Flight) -> FlightSeatInventory:
+        with self._registry_lock:
+            inventory = self._inventories.get(flight.flight_id)
+            if inventory is None:
+                inventory = FlightSeatInventory.for_seats(
+                    flight.flight_id, flight.aircraft.seats, flight.aircraft.seat_layout
+                )
+                self._locks[flight.flight_id] = threading.Lock()
+                self._inventories[flight.flight_id] = inventory
+            return inventory
+
+    def hold_seats(self, flight_id: str, seat_numbers: Sequence[str]) -> SeatHold:
+        if not seat_numbers:
+            raise ValueError("At least one seat must be requested")
+        inventory, lock = self._inventory(flight_id)
+        with lock:
+            now = self.clock()
+            inventory.expire(now)
+            return self._hold(inventory, seat_numbers, now)
+
+    def hold_adjacent(self, flight_id: str, count: int, seat_class: SeatClass) -> SeatHold:
+        inventory, lock = self._inventory(flight_id)
+        with lock:
+            now = self.clock()
+            inventory.expire(now)
+            seats = inventory.find_adjacent(count, seat_class)
+            if seats is None:
+                raise SeatUnavailableError(f"No {count} adjacent {seat_class.name} seats on {flight_id}")
+            return self._hold(inventory, seats, now)
+
+    def find_adjacent(self, flight_id: str, count: int, seat_class: SeatClass) -> Optional[List[str]]:
+        inventory, lock = self._inventory(flight_id)
+        with lock:
+            inventory.expire(self.clock())
+            return inventory.find_adjacent(count, seat_class)
+
+    def confirm_hold(self, hold: SeatHold) -> SeatHold:
+        inventory, lock = self._inventory(hold.flight_id)
+        with lock:
+            inventory.expire(self.clock())
+            if hold.hold_id not in inventory.holds:
+                raise SeatUnavailableError(f"Hold {hold.hold_id} expired or released")
+            return inventory.confirm(hold.hold_id)
+
+    def release_hold(self, hold: SeatHold) -> None:
+        inventory, lock = self._inventory(hold.flight_id)
+        with lock:
+            inventory.release(hold.hold_id)
+
+    def available_count(self, flight_id: str, seat_class: Optional[SeatClass] = None) -> int:
+        inventory, lock = self._inventory(flight_id)
+        with lock:
+            inventory.expire(self.clock())
+            return inventory.available_count(seat_class)
+
+    def _hold(self, inventory: FlightSeatInventory, seat_numbers: Sequence[str], now: datetime) -> SeatHold:
+        unavailable = inventory.unavailable(seat_numbers)
+        if unavailable or len(set(seat_numbers)) != len(seat_numbers):
+            raise SeatUnavailableError(
+                f"Seats not available on {inventory.flight_id}: {', '.join(unavailable) or 'duplicates'}"
+            )
+        hold = SeatHold(
+            hold_id=id_generator.next_id("HLD"),
+            flight_id=inventory.flight_id,
+            seat_numbers=tuple(seat_numbers),
+            expires_at=now + self.hold_ttl,
+        )
+        inventory.hold(hold)
+        return hold
+
+    def _inventory(self, flight_id: str) -> Tuple[FlightSeatInventory, threading.Lock]:
+        inventory = self._inventories.get(flight_id)
+        if inventory is None:
+            raise FlightNotFoundError(f"Flight {flight_id} has no seat inventory")
+        return inventory, self._locks[flight_id]
@@ -0,0 +1,186 @@
+from __future__ import annotations
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Hashable, Iterable, Optional, Set
+
+from ..domain import events
+from ..domain.events import DomainEvent
+from ..domain.statistics import AirportStatistics
+from ..repositories.flight_repository import FlightRepository
+
+
+@dataclass
+class RunningMax:
+    """Per-key counters whose maximum is kept in O(1) under +1/-1 updates."""
+
+    _counts: Counter = field(default_factory=Counter, repr=False)
+    # сколько ключей имеют данное значение счётчика
+    _frequency: Counter = field(default_factory=Counter, repr=False)
+    maximum: int = 0
+
+    def increment(self, key: Hashable) -> None:
+        value = self._counts[key]
+        if value:
+            self._frequency[value] -= 1
+        self._counts[key] = value + 1
+        self._frequency[value + 1] += 1
+        if value + 1 > self.maximum:
+            self.maximum = value + 1
+
+    def decrement(self, key: Hashable) -> None:
+        value = self._counts.get(key, 0)
+        if value == 0:
+            return
+        self._frequency[value] -= 1
+        if value == 1:
+            del self._counts[key]
+        else:
+            self._counts[key] = value - 1
+            self._frequency[value - 1] += 1
+        if value == self.maximum and self._frequency[value] == 0:
+            self.maximum -= 1
+
+    def get(self, key: Hashable) -> int:
+        return self._counts.get(key, 0)
+
+
+@dataclass
+class StatisticsAggregator:
+    """Keeps :class:`AirportStatistics` figures current from domain events.
+
+    Every event is applied in O(1); :meth:`snapshot` only copies counters.
+    A flight counts once it departs or is cancelled and, as in
+    :class:`StatisticsService`, is on time when its ``delay_minutes`` is zero.
+    A booking counts once it is confirmed or paid. ``flights`` is used to
+    attribute bookings to a departure day.
+
+    Only state that a later event can still change is kept: the bookings of
+    flights that have not left yet and the bags that are currently lost.
+    Once its flight departs or is cancelled a booking's count is final.
+    """
+
+    flights: Optional[FlightRepository] = None
+    departed_flights: int = 0
+    on_time_flights: int = 0
+    cancelled_flights: int = 0
+    total_delay_minutes: int = 0
+    passengers: int = 0
+    handled_baggage_items: int = 0
+    lost_baggage_items: int = 0
+    daily_flights: RunningMax = field(default_factory=RunningMax)
+    daily_passengers: RunningMax = field(default_factory=RunningMax)
+    # рейс -> бронирование -> день вылета, пока рейс не улетел
+    _open_bookings: Dict[str, Dict[str, Optional[date]]] = field(default_factory=dict, repr=False)
+    _lost_tags: Set[str] = field(default_factory=set, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def handle(self, batch: Iterable[DomainEvent]) -> None:
+        """Batch handler suitable for :meth:`EventBus.subscribe`."""
+        with self._lock:
+            for event in batch:
+                self._apply(event)
+
+    def apply(self, event: DomainEvent) -> None:
+        with self._lock:
+            self._apply(event)
+
+    @property
+    def avg_delay_minutes(self) -> float:
+        if self.departed_flights == 0:
+            return 0.0
+        return round(self.total_delay_minutes / self.departed_flights, 2)
+
+    def snapshot(self, year: int) -> AirportStatistics:
+        with self._lock:
+            return AirportStatistics(
+                year=year,
+                total_passengers=self.passengers,
+                total_flights=self.departed_flights + self.cancelled_flights,
+                total_cargo_tons=0.0,
+                avg_delay_minutes=self.avg_delay_minutes,
+                cancelled_flights=self.cancelled_flights,
+                diverted_flights=0,
+                on_time_flights=self.on_time_flights,
+                international_flights=0,
+                domestic_flights=0,
+                security_incidents=0,
+                lost_baggage_items=self.lost_baggage_items,
+                handled_baggage_items=self.handled_baggage_items,
+                vip_passengers=0,
+                loyalty_gold=0,
+                loyalty_platinum=0,
+                checkin_counters=0,
+                security_checkpoints=0,
+                terminals=0,
+                gates=0,
+                runways=0,
+                max_daily_flights=self.daily_flights.maximum,
+                max_daily_passengers=self.daily_passengers.maximum,
+                avg_load_factor=0.0,
+                fuel_consumption_tons=0.0,
+            )
+
+    def _apply(self, event: DomainEvent) -> None:
+        if isinstance(event, events.FlightDeparted):
+            self.departed_flights += 1
+            self.total_delay_minutes += event.delay_minutes
+            if event.delay_minutes == 0:
+                self.on_time_flights += 1
+            self.daily_flights.increment(event.departure_time.date())
+            self._open_bookings.pop(event.flight_id, None)
+        elif isinstance(event, events.FlightCancelled):
+            self.cancelled_flights += 1
+            self._open_bookings.pop(event.flight_id, None)
+        elif isinstance(event, events.BookingConfirmed):
+            day = self._count_booking(event.flight_id)
+            self._open_bookings.setdefault(event.flight_id, {})[event.booking_id] = day
+        elif isinstance(event, events.BookingCompleted):
+            # оплаченное бронирование отменить нельзя, поэтому его больше не отслеживаем
+            self._forget_booking(event.flight_id, event.booking_id)
+            if not event.was_confirmed:
+                self._count_booking(event.flight_id)
+        elif isinstance(event, events.BookingCancelled):
+            if event.booking_id not in self._open_bookings.get(event.flight_id, ()):
+                return
+            day = self._forget_booking(event.flight_id, event.booking_id)
+            self.passengers -= 1
+            if day is not None:
+                self.daily_passengers.decrement(day)
+        elif isinstance(event, events.BaggageCheckedIn):
+            self.handled_baggage_items += 1
+            self._found(event.tag_id)
+        elif isinstance(event, events.BaggageLoaded):
+            self._found(event.tag_id)
+        elif isinstance(event, events.BaggageLost):
+            if event.tag_id not in self._lost_tags:
+                self._lost_tags.add(event.tag_id)
+                self.lost_baggage_items += 1
+
+    def _count_booking(self, flight_id: str) -> Optional[date]:
+        day = self._departure_day(flight_id)
+        self.passengers += 1
+        if day is not None:
+            self.daily_passengers.increment(day)
+        return day
+
+    def _forget_booking(self, flight_id: str, booking_id: str) -> Optional[date]:
+        bookings = self._open_bookings.get(flight_id)
+        if not bookings:
+            return None
+        day = bookings.pop(booking_id, None)
+        if not bookings:
+            del self._open_bookings[flight_id]
+        return day
+
+    def _found(self, tag_id: str) -> None:
+        if tag_id in self._lost_tags:
+            self._lost_tags.discard(tag_id)
+            self.lost_baggage_items -= 1
+
+    def _departure_day(self, flight_id: str) -> Optional[date]:
+        if self.flights is None:
+            return None
+        flight = self.flights.get(flight_id)
+        return flight.departure_time.date() if flight is not None else None
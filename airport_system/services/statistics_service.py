@@ -0,0 +1,160 @@
+from __future__ import annotations
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import compress
+from typing import FrozenSet, List, Sequence
+
+from ..domain.enums import BaggageStatus, BookingStatus, FlightStatus
+from ..domain.statistics import AirportStatistics
+from ..domain.terminal import Terminal
+from ..repositories.baggage_repository import BaggageRepository
+from ..repositories.booking_repository import BookingRepository
+from ..repositories.flight_repository import FlightRepository
+
+
+@dataclass
+class FlightColumns:
+    """Column-oriented view of the flights departing in a date range."""
+
+    flight_ids: List[str] = field(default_factory=list)
+    day: array = field(default_factory=lambda: array("l"))
+    status: array = field(default_factory=lambda: array("b"))
+    delay_minutes: array = field(default_factory=lambda: array("l"))
+    distance_km: array = field(default_factory=lambda: array("l"))
+    seats: array = field(default_factory=lambda: array("l"))
+    international: array = field(default_factory=lambda: array("b"))
+    passengers: array = field(default_factory=lambda: array("l"))
+    # вылетевшие или прилетевшие рейсы: только по ним считается пунктуальность
+    flown: array = field(default_factory=lambda: array("b"))
+    has_seats: array = field(default_factory=lambda: array("b"))
+    load_factor: array = field(default_factory=lambda: array("d"))
+    daily_passengers: Counter = field(default_factory=Counter)
+
+    def __len__(self) -> int:
+        return len(self.flight_ids)
+
+
+@dataclass
+class BaggageColumns:
+    status: array = field(default_factory=lambda: array("b"))
+    weight_kg: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+
+@dataclass
+class StatisticsService:
+    """Builds :class:`AirportStatistics` for a date range from column arrays.
+
+    The flights of the range are copied into typed ``array`` columns in one
+    pass, with their bookings and bags fetched by one bulk index lookup per
+    repository (one query each on SQLite); per-flight derived values (load
+    factor, whether it has flown, passengers per day) are filled in by the
+    same pass. Every metric is then a pass over a column using C-level
+    builtins (``sum``, ``array.count``, ``itertools.compress``).
+
+    As in :class:`StatisticsAggregator`, punctuality and the average delay
+    cover only flights that have departed or arrived. Without
+    ``domestic_airports`` flights are not classified, and both the domestic
+    and the international count are zero. Figures the repositories do not
+    track (cargo, fuel, runways, security incidents, loyalty) are left at
+    zero.
+    """
+
+    flights: FlightRepository
+    bookings: BookingRepository
+    baggage: BaggageRepository
+    terminals: Sequence[Terminal] = ()
+    domestic_airports: FrozenSet[str] = frozenset()
+
+    def flight_columns(self, start: datetime, end: datetime) -> FlightColumns:
+        columns = FlightColumns()
+        flights = self.flights.find_departing_between(start, end)
+        bookings = self.bookings.find_by_flights([flight.flight_id for flight in flights])
+        flown = (FlightStatus.DEPARTED, FlightStatus.ARRIVED)
+        for flight in flights:
+            day = flight.departure_time.toordinal()
+            seats = len(flight.aircraft.seats)
+            passengers = sum(1 for b in bookings[flight.flight_id] if b.status != BookingStatus.CANCELLED)
+            columns.flight_ids.append(flight.flight_id)
+            columns.day.append(day)
+            columns.status.append(flight.status.value)
+            columns.delay_minutes.append(flight.delay_minutes)
+            columns.distance_km.append(flight.distance_km)
+            columns.seats.append(seats)
+            columns.international.append(self._is_international(flight.origin, flight.destination))
+            columns.passengers.append(passengers)
+            columns.flown.append(flight.status in flown)
+            columns.has_seats.append(seats > 0)
+            columns.load_factor.append(passengers / seats if seats else 0.0)
+            columns.daily_passengers[day] += passengers
+        return columns
+
+    def baggage_columns(self, flight_ids: Sequence[str]) -> BaggageColumns:
+        columns = BaggageColumns()
+        bookings = self.bookings.find_by_flights(flight_ids)
+        booking_ids = [booking.booking_id for flight_id in flight_ids for booking in bookings[flight_id]]
+        bags = self.baggage.find_by_bookings(booking_ids)
+        for booking_id in booking_ids:
+            for item in bags[booking_id]:
+                columns.status.append(item.status.value)
+                columns.weight_kg.append(item.weight_kg)
+        return columns
+
+    def compute(self, start: datetime, end: datetime) -> AirportStatistics:
+        flights = self.flight_columns(start, end)
+        bags = self.baggage_columns(flights.flight_ids)
+        total = len(flights)
+
+        flown_delays = array("l", compress(flights.delay_minutes, flights.flown))
+        on_time = flown_delays.count(0)
+
+        if self.domestic_airports:
+            international = sum(flights.international)
+            domestic = total - international
+        else:
+            international = domestic = 0
+        total_passengers = sum(flights.passengers)
+
+        with_seats = sum(flights.has_seats)
+        load_factor_total = sum(compress(flights.load_factor, flights.has_seats))
+
+        daily_flights = Counter(flights.day)
+
+        handled = len(bags) - bags.status.count(BaggageStatus.CREATED.value)
+
+        return AirportStatistics(
+            year=start.year,
+            total_passengers=total_passengers,
+            total_flights=total,
+            total_cargo_tons=0.0,
+            avg_delay_minutes=round(sum(flown_delays) / len(flown_delays), 2) if flown_delays else 0.0,
+            cancelled_flights=flights.status.count(FlightStatus.CANCELLED.value),
+            diverted_flights=0,
+            on_time_flights=on_time,
+            international_flights=international,
+            domestic_flights=domestic,
+            security_incidents=0,
+            lost_baggage_items=bags.status.count(BaggageStatus.LOST.value),
+            handled_baggage_items=handled,
+            vip_passengers=0,
+            loyalty_gold=0,
+            loyalty_platinum=0,
+            checkin_counters=0,
+            security_checkpoints=0,
+            terminals=len(self.terminals),
+            gates=sum(len(t.gates) for t in self.terminals),
+            runways=0,
+            max_daily_flights=max(daily_flights.values(), default=0),
+            max_daily_passengers=max(flights.daily_passengers.values(), default=0),
+            avg_load_factor=round(load_factor_total / with_seats, 4) if with_seats else 0.0,
+            fuel_consumption_tons=0.0,
+        )
+
+    def _is_international(self, origin: str, destination: str) -> bool:
+        if not self.domestic_airports:
+            return False
+        return origin not in self.domestic_airports or destination not in self.domestic_airports
@@ -1,9 +1,121 @@
 from __future__ import annotations
-import itertools
+import os
+import threading
+import time
+from typing import Callable, List, Optional
 
 
-_counter = itertools.count(1)
+# 41 бит миллисекунд от эпохи, 10 бит номера процесса, 12 бит счётчика
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class SnowflakeGenerator:
+    """Time-ordered 64-bit ids that need no coordination between workers.
+
+    Each id is ``timestamp | worker_id | sequence``; ids from one generator are
+    strictly increasing, and ids from different worker ids never collide.
+    """
+
+    def __init__(self, worker_id: int, clock: Callable[[], int] = lambda: time.time_ns() // 1_000_000) -> None:
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"Worker id must be between 0 and {MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_int(self) -> int:
+        return self.next_block(1)[0]
+
+    def next_block(self, count: int) -> List[int]:
+        """Reserve ``count`` consecutive ids under a single lock acquisition."""
+        if count <= 0:
+            raise ValueError("Count must be positive")
+        ids: List[int] = []
+        with self._lock:
+            while len(ids) < count:
+                now_ms = self._tick()
+                take = min(count - len(ids), MAX_SEQUENCE + 1 - self._sequence)
+                base = ((now_ms - EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)) | (self.worker_id << SEQUENCE_BITS)
+                ids.extend(range(base + self._sequence, base + self._sequence + take))
+                self._sequence += take
+        return ids
+
+    @staticmethod
+    def timestamp_ms(value: int) -> int:
+        return (value >> (WORKER_BITS + SEQUENCE_BITS)) + EPOCH_MS
+
+    def _tick(self) -> int:
+        now_ms = self._clock()
+        if now_ms < self._last_ms:
+            # часы пошли назад: продолжаем с последней миллисекунды
+            now_ms = self._last_ms
+        if now_ms == self._last_ms:
+            if self._sequence > MAX_SEQUENCE:
+                while now_ms <= self._last_ms:
+                    now_ms = max(self._clock(), self._last_ms)
+                    if now_ms == self._last_ms:
+                        time.sleep(0.0001)
+                self._last_ms, self._sequence = now_ms, 0
+        else:
+            self._last_ms, self._sequence = now_ms, 0
+        return now_ms
+
+
+WORKER_ID_ENV = "AIRPORT_WORKER_ID"
+
+_generator: Optional[SnowflakeGenerator] = None
+_generator_lock = threading.Lock()
+# процесс, создавший генератор: после fork его номер уже занят родителем
+_owner_pid: Optional[int] = None
+
+
+def _default_worker_id() -> int:
+    configured = os.environ.get(WORKER_ID_ENV)
+    if configured is not None:
+        return int(configured)
+    return os.getpid() & MAX_WORKER_ID
+
+
+def _current() -> SnowflakeGenerator:
+    global _generator, _owner_pid
+    generator, owner = _generator, _owner_pid
+    if generator is not None and owner == os.getpid():
+        return generator
+    with _generator_lock:
+        if _generator is not None and _owner_pid != os.getpid():
+            raise RuntimeError(
+                f"Worker id {_generator.worker_id} was inherited from the parent process; "
+                "call configure() with a distinct worker id in every worker process"
+            )
+        if _generator is None:
+            _generator = SnowflakeGenerator(_default_worker_id())
+            _owner_pid = os.getpid()
+        return _generator
+
+
+def configure(worker_id: int, clock: Optional[Callable[[], int]] = None) -> SnowflakeGenerator:
+    """Use an explicit worker id in this process.
+
+    Without it the id comes from ``AIRPORT_WORKER_ID`` or the pid. A process
+    forked after ids were issued must call this with an id of its own before
+    issuing more; otherwise :func:`next_id` raises :class:`RuntimeError`.
+    """
+    global _generator, _owner_pid
+    with _generator_lock:
+        _generator = SnowflakeGenerator(worker_id, clock) if clock else SnowflakeGenerator(worker_id)
+        _owner_pid = os.getpid()
+        return _generator
 
 
 def next_id(prefix: str) -> str:
-    return f"{prefix}{next(_counter)}"
+    return f"{prefix}{_current().next_int()}"
+
+
+def next_ids(prefix: str, count: int) -> List[str]:
+    return [f"{prefix}{value}" for value in _current().next_block(count)]
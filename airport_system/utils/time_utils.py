@@ -6,5 +6,12 @@ def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def as_utc(dt: datetime) -> datetime:
+    """``dt`` as an aware UTC datetime; naive values are taken to be UTC already."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
 def to_iso(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).isoformat()
@@ -0,0 +1,344 @@
+"""Tests for AsyncPaymentService against a local asyncio stand-in gateway."""
+import asyncio
+import json
+import ssl
+
+import pytest
+
+from airport_system.domain.enums import PaymentStatus
+from airport_system.domain.payment import CardPayment, Money
+from airport_system.exceptions import PaymentDeclinedError, PaymentGatewayError
+from airport_system.services.async_payment_service import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    AsyncPaymentService,
+    CircuitBreaker,
+)
+from airport_system.services.payment_gateway import AsyncHttpPaymentGateway
+
+GOOD = CardPayment("1234567890123456", "Ann", "12/30")
+BAD = CardPayment("123", "Bob", "12/30")
+SLOW = CardPayment("1234567890123456", "SLOW", "12/30")
+
+
+class StandInGateway:
+    """Keep-alive HTTP/1.1 server speaking the batch authorization protocol."""
+
+    def __init__(
+        self,
+        close_after_response: bool = False,
+        delay: float = 0.0,
+        drop_silently: bool = False,
+        hang_up: bool = False,
+    ) -> None:
+        self.close_after_response = close_after_response
+        self.delay = delay
+        self.drop_silently = drop_silently
+        self.hang_up = hang_up
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/authorize"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    await reader.readuntil(b"\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                length = 0
+                while True:
+                    line = await reader.readuntil(b"\r\n")
+                    if line == b"\r\n":
+                        break
+                    name, _, value = line.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                batch = json.loads(await reader.readexactly(length))["authorizations"]
+                self.requests += 1
+                if self.hang_up:
+                    return
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    await asyncio.sleep(self.delay)
+                    if any(item["holder_name"] == "SLOW" for item in batch):
+                        await asyncio.sleep(1.0)
+                finally:
+                    self.in_flight -= 1
+                results = [
+                    {"payment_id": item["payment_id"], "approved": len(item["card_number"]) == 16}
+                    for item in batch
+                ]
+                body = json.dumps({"results": results}).encode()
+                connection = "close" if self.close_after_response else "keep-alive"
+                writer.write(
+                    f"HTTP/1.1 200 OK\r\nContent-Length: {len(body)}\r\nConnection: {connection}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+                if self.close_after_response or self.drop_silently:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+
+def _run(scenario):
+    return asyncio.run(scenario())
+
+
+class TestAsyncPaymentService:
+    """Tests for pooled, limited and guarded async charging."""
+
+    def test_many_concurrent_charges_share_pooled_connections(self):
+        """Test hundreds of charges reuse a handful of keep-alive connections."""
+        stand_in = StandInGateway(delay=0.005)
+
+        async def scenario():
+            url = await stand_in.start()
+            gateway = AsyncHttpPaymentGateway(url, pool_size=5)
+            service = AsyncPaymentService(gateway, max_in_flight=50)
+            items = [(f"B{i}", Money(10.0), BAD if i % 10 == 0 else GOOD) for i in range(200)]
+            results = await service.charge_many(items)
+            await gateway.close()
+            await stand_in.stop()
+            return results, gateway
+
+        results, gateway = _run(scenario)
+        assert len(results) == 200
+        assert [r.index for r in results] == list(range(200))
+        assert sum(r.ok for r in results) == 180
+        assert all(isinstance(r.error, PaymentDeclinedError) for r in results if not r.ok)
+        assert all(r.payment.status == PaymentStatus.COMPLETED for r in results if r.ok)
+        assert gateway.connections_opened <= 5
+        assert stand_in.connections <= 5
+        assert stand_in.max_in_flight <= 5
+        assert stand_in.requests == 200
+
+    def test_connection_close_is_honoured(self):
+        """Test connections the server closes are not reused."""
+        stand_in = StandInGateway(close_after_response=True)
+
+        async def scenario():
+            url = await stand_in.start()
+            gateway = AsyncHttpPaymentGateway(url, pool_size=2)
+            service = AsyncPaymentService(gateway)
+            for i in range(3):
+                await service.charge_card(f"B{i}", Money(10.0), GOOD)
+            await stand_in.stop()
+            return gateway
+
+        gateway = _run(scenario)
+        assert gateway.connections_opened == 3
+
+    def test_idempotency_key_deduplicates_retries(self):
+        """Test retries with one key reuse the ledger record instead of charging again."""
+        stand_in = StandInGateway()
+
+        async def scenario():
+            url = await stand_in.start()
+            gateway = AsyncHttpPaymentGateway(url)
+            service = AsyncPaymentService(gateway)
+            first = await service.charge_card("B1", Money(10.0), GOOD, idempotency_key="K1")
+            again = await service.charge_card("B1", Money(10.0), GOOD, idempotency_key="K1")
+            with pytest.raises(PaymentDeclinedError):
+                await service.charge_card("B2", Money(10.0), BAD, idempotency_key="K2")
+            with pytest.raises(PaymentDeclinedError):
+                await service.charge_card("B2", Money(10.0), BAD, idempotency_key="K2")
+            with pytest.raises(ValueError):
+                await service.charge_card("B3", Money(10.0), GOOD, idempotency_key="K1")
+            await gateway.close()
+            await stand_in.stop()
+            return service, first, again
+
+        service, first, again = _run(scenario)
+        assert again is first
+        assert first.status == PaymentStatus.COMPLETED
+        assert service.ledger.find_by_idempotency_key("K2").status == PaymentStatus.DECLINED
+        assert len(service.ledger.find_by_booking("B1")) == 1
+        assert stand_in.requests == 2
+
+    def test_timeout_opens_circuit(self):
+        """Test timeouts trip the breaker and later calls fail fast."""
+        stand_in = StandInGateway()
+        now = [0.0]
+
+        async def scenario():
+            url = await stand_in.start()
+            gateway = AsyncHttpPaymentGateway(url)
+            breaker = CircuitBreaker(failure_threshold=2, reset_after=10.0, clock=lambda: now[0])
+            service = AsyncPaymentService(gateway, timeout=0.05, breaker=breaker)
+            for _ in range(2):
+                with pytest.raises(PaymentGatewayError):
+                    await service.charge_card("B1", Money(10.0), SLOW)
+            assert breaker.state == OPEN
+            requests_before = stand_in.requests
+            with pytest.raises(PaymentGatewayError):
+                await service.charge_card("B1", Money(10.0), GOOD)
+            assert stand_in.requests == requests_before
+
+            now[0] = 11.0
+            assert breaker.state == HALF_OPEN
+            payment = await service.charge_card("B1", Money(10.0), GOOD)
+            assert breaker.state == CLOSED
+            await gateway.close()
+            await stand_in.stop()
+            return payment
+
+        assert _run(scenario).status == PaymentStatus.COMPLETED
+
+    def test_unreachable_gateway(self):
+        """Test connection failures surface as PaymentGatewayError."""
+
+        async def scenario():
+            stand_in = StandInGateway()
+            url = await stand_in.start()
+            await stand_in.stop()
+            service = AsyncPaymentService(AsyncHttpPaymentGateway(url))
+            return await service.charge_many([("B1", Money(10.0), GOOD)])
+
+        results = _run(scenario)
+        assert isinstance(results[0].error, PaymentGatewayError)
+
+    def test_timeout_excludes_waiting_for_a_pooled_connection(self):
+        """Test a healthy but busy gateway is not reported as timing out."""
+        stand_in = StandInGateway(delay=0.05)
+
+        async def scenario():
+            url = await stand_in.start()
+            gateway = AsyncHttpPaymentGateway(url, pool_size=2)
+            service = AsyncPaymentService(gateway, timeout=0.5, max_in_flight=100)
+            results = await service.charge_many([(f"B{i}", Money(10.0), GOOD) for i in range(30)])
+            await gateway.close()
+            await stand_in.stop()
+            return results, service
+
+        results, service = _run(scenario)
+        assert all(r.ok for r in results)
+        assert service.breaker.state == CLOSED
+
+    def test_cancelled_trial_releases_half_open_slot(self):
+        """Test a cancelled trial call counts as a failure instead of blocking the breaker."""
+        stand_in = StandInGateway()
+        now = [0.0]
+
+        async def scenario():
+            url = await stand_in.start()
+            gateway = AsyncHttpPaymentGateway(url)
+            breaker = CircuitBreaker(failure_threshold=1, reset_after=5.0, clock=lambda: now[0])
+            breaker.record_failure()
+            now[0] = 5.0
+            service = AsyncPaymentService(gateway, timeout=5.0, breaker=breaker)
+            trial = asyncio.create_task(service.charge_card("B1", Money(10.0), SLOW))
+            await asyncio.sleep(0.05)
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+            assert breaker.state == OPEN
+            now[0] = 10.0
+            payment = await service.charge_card("B2", Money(10.0), GOOD)
+            await gateway.close()
+            await stand_in.stop()
+            return payment, breaker
+
+        payment, breaker = _run(scenario)
+        assert payment.status == PaymentStatus.COMPLETED
+        assert breaker.state == CLOSED
+
+
+class TestAsyncHttpPaymentGatewayRetry:
+    """Tests for retrying authorizations on stale keep-alive connections."""
+
+    def test_stale_pooled_connection_is_retried(self):
+        """Test a pooled connection closed by the server is replaced transparently."""
+        stand_in = StandInGateway(drop_silently=True)
+
+        async def scenario():
+            url = await stand_in.start()
+            gateway = AsyncHttpPaymentGateway(url, pool_size=1)
+            service = AsyncPaymentService(gateway)
+            await service.charge_card("B1", Money(10.0), GOOD)
+            await asyncio.sleep(0.01)
+            payment = await service.charge_card("B2", Money(10.0), GOOD)
+            await gateway.close()
+            await stand_in.stop()
+            return payment, gateway
+
+        payment, gateway = _run(scenario)
+        assert payment.status == PaymentStatus.COMPLETED
+        assert gateway.connections_opened == 2
+        assert stand_in.requests == 2
+
+    def test_sent_request_on_fresh_connection_is_not_retried(self):
+        """Test a request the gateway received but never answered is not sent twice."""
+        stand_in = StandInGateway(hang_up=True)
+
+        async def scenario():
+            url = await stand_in.start()
+            gateway = AsyncHttpPaymentGateway(url)
+            service = AsyncPaymentService(gateway)
+            with pytest.raises(PaymentGatewayError):
+                await service.charge_card("B1", Money(10.0), GOOD)
+            await stand_in.stop()
+
+        _run(scenario)
+        assert stand_in.requests == 1
+
+
+class TestAsyncHttpPaymentGatewayTransport:
+    """Tests for choosing the transport from the gateway URL."""
+
+    def test_https_connects_over_tls(self, monkeypatch):
+        """Test an https URL opens a TLS connection on port 443."""
+        attempts = []
+
+        async def refuse(host, port, **kwargs):
+            attempts.append((host, port, kwargs.get("ssl")))
+            raise ConnectionRefusedError("refused")
+
+        monkeypatch.setattr(asyncio, "open_connection", refuse)
+        gateway = AsyncHttpPaymentGateway("https://gateway.example/authorize")
+        with pytest.raises(PaymentGatewayError):
+            _run(lambda: AsyncPaymentService(gateway).charge_card("B1", Money(10.0), GOOD))
+        assert [(host, port) for host, port, _ in attempts] == [("gateway.example", 443)]
+        assert isinstance(attempts[0][2], ssl.SSLContext)
+
+    def test_unknown_scheme_is_rejected(self):
+        """Test a URL that is neither http nor https is refused up front."""
+        with pytest.raises(ValueError):
+            AsyncHttpPaymentGateway("ftp://gateway.example/authorize")
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+
+    def test_half_open_allows_single_trial(self):
+        """Test only one trial call passes while half open."""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_after=5.0, clock=lambda: now[0])
+        breaker.record_failure()
+        assert not breaker.allow()
+        now[0] = 5.0
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        now[0] = 10.0
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED and breaker.failures == 0
@@ -1,9 +1,12 @@
 """Extended tests for BaggageService."""
+import threading
+
 import pytest
 
 from airport_system.domain.enums import BaggageStatus
+from airport_system.repositories import ConcurrentBaggageRepository
 from airport_system.services.baggage_service import BaggageService
-from airport_system.exceptions import BaggageNotFoundError
+from airport_system.exceptions import BaggageCounterMismatchError, BaggageNotFoundError
 
 
 class TestBaggageServiceExtended:
@@ -64,3 +67,101 @@ class TestBaggageServiceExtended:
         
         items = service.find_by_booking("NONEXISTENT")
         assert items == []
+
+
+class TestBaggageCounters:
+    """Tests for incrementally maintained baggage aggregates."""
+
+    def test_counters_follow_transitions(self):
+        """Test status counts and weight track every service operation."""
+        service = BaggageService(consistency_check=True)
+        service.check_in_baggage("TAG1", "BKG1", 20.0, "SFO")
+        service.check_in_baggage("TAG2", "BKG1", 15.0, "SFO")
+        service.load_to_aircraft("TAG1", "BELT")
+        service.mark_lost("TAG2")
+        service.check_in_baggage("TAG2", "BKG1", 12.5, "SFO")
+
+        assert service.count_by_status(BaggageStatus.LOADED) == 1
+        assert service.count_by_status(BaggageStatus.CHECKED_IN) == 1
+        assert service.count_by_status(BaggageStatus.LOST) == 0
+        assert service.total_weight() == 32.5
+
+    def test_consistency_check_detects_drift(self):
+        """Test changes made behind the service are caught by a recount."""
+        service = BaggageService()
+        item = service.check_in_baggage("TAG1", "BKG1", 20.0, "SFO")
+        item.mark_lost()
+        assert service.count_by_status(BaggageStatus.CHECKED_IN) == 1
+        with pytest.raises(BaggageCounterMismatchError):
+            service.verify_counters()
+
+    def test_counters_start_from_existing_repository(self):
+        """Test a service over a populated repository starts with correct totals."""
+        first = BaggageService()
+        first.check_in_baggage("TAG1", "BKG1", 20.0, "SFO")
+        second = BaggageService(baggage=first.baggage)
+        assert second.count_by_status(BaggageStatus.CHECKED_IN) == 1
+        assert second.total_weight() == 20.0
+
+
+class TestBaggageIndexes:
+    """Tests for booking and owner lookups on baggage."""
+
+    def test_find_by_booking_and_owner(self):
+        """Test indexed lookups return only matching bags."""
+        service = BaggageService()
+        service.check_in_baggage("TAG1", "BKG1", 10.0, "SFO", owner_id="P1")
+        service.check_in_baggage("TAG2", "BKG1", 10.0, "SFO", owner_id="P2")
+        service.check_in_baggage("TAG3", "BKG2", 10.0, "SFO", owner_id="P1")
+        assert {i.tag.tag_id for i in service.find_by_booking("BKG1")} == {"TAG1", "TAG2"}
+        assert {i.tag.tag_id for i in service.find_by_owner("P1")} == {"TAG1", "TAG3"}
+
+    def test_remove_and_retag_keep_index_fresh(self):
+        """Test removed and re-tagged bags move in the indexes."""
+        service = BaggageService(consistency_check=True)
+        service.check_in_baggage("TAG1", "BKG1", 10.0, "SFO")
+        service.check_in_baggage("TAG2", "BKG1", 12.0, "SFO")
+
+        service.remove_baggage("TAG1")
+        service.retag_baggage("TAG2", "TAG9", booking_id="BKG2")
+
+        assert service.find_by_booking("BKG1") == []
+        assert [i.tag.tag_id for i in service.find_by_booking("BKG2")] == ["TAG9"]
+        assert service.total_weight() == 12.0
+        service.retag_baggage("TAG9", "TAG9", booking_id="BKG3")
+        assert service.find_by_booking("BKG2") == []
+        with pytest.raises(BaggageNotFoundError):
+            service.remove_baggage("TAG1")
+
+    def test_retag_to_used_tag_raises(self):
+        """Test a bag cannot take over another bag's tag."""
+        service = BaggageService()
+        service.check_in_baggage("TAG1", "BKG1", 10.0, "SFO")
+        service.check_in_baggage("TAG2", "BKG1", 10.0, "SFO")
+        with pytest.raises(ValueError):
+            service.retag_baggage("TAG1", "TAG2")
+
+    def test_concurrent_retags_move_the_bag_once(self):
+        """Test racing retags of one bag leave exactly one copy under one tag."""
+        service = BaggageService(baggage=ConcurrentBaggageRepository(stripes=4), consistency_check=True)
+        service.check_in_baggage("TAG1", "BKG1", 10.0, "SFO")
+        barrier = threading.Barrier(8)
+        outcomes = []
+
+        def retag(i: int) -> None:
+            barrier.wait()
+            try:
+                service.retag_baggage("TAG1", f"NEW{i}")
+                outcomes.append(i)
+            except BaggageNotFoundError:
+                pass
+
+        threads = [threading.Thread(target=retag, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(outcomes) == 1
+        assert service.baggage.size() == 1
+        assert [i.tag.tag_id for i in service.find_by_booking("BKG1")] == [f"NEW{outcomes[0]}"]
+        assert service.count_by_status(BaggageStatus.CHECKED_IN) == 1
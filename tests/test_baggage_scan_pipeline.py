@@ -0,0 +1,135 @@
+"""Tests for the baggage scan ingestion pipeline."""
+import asyncio
+from datetime import datetime, timedelta
+
+from airport_system.domain.enums import BaggageStatus
+from airport_system.repositories.baggage_repository import BaggageRepository
+from airport_system.repositories.journal import FileJournal
+from airport_system.services.baggage_scan_pipeline import ScanIngestionPipeline, ScanRecord
+from airport_system.services.baggage_service import BaggageService
+from airport_system.utils.time_utils import now_utc
+
+T0 = datetime(2030, 1, 1, 12, 0, 0)
+
+
+def _service() -> BaggageService:
+    service = BaggageService()
+    for i in range(5):
+        service.check_in_baggage(f"TAG{i}", "BKG1", 10.0, "SFO")
+    return service
+
+
+def _scans():
+    yield ScanRecord("TAG0", "BELT1", T0)
+    yield ScanRecord("TAG0", "BELT1", T0 + timedelta(seconds=1))
+    yield ScanRecord("TAG1", "BELT1", T0 + timedelta(seconds=1))
+    yield ScanRecord("GHOST", "BELT1", T0 + timedelta(seconds=2))
+    yield ScanRecord("TAG0", "BELT1", T0 + timedelta(seconds=9))
+    yield ScanRecord("TAG2", "BELT2", T0 + timedelta(seconds=10))
+
+
+class TestScanIngestionPipeline:
+    """Tests for ScanIngestionPipeline."""
+
+    def test_dedupes_batches_and_reports_misses(self):
+        """Test duplicates are dropped and misses go to the side stream."""
+        service = _service()
+        misses = []
+        pipeline = ScanIngestionPipeline(
+            service, batch_size=2, on_miss=misses.append, clock=lambda: T0 + timedelta(seconds=12)
+        )
+        metrics = pipeline.run(_scans())
+
+        assert metrics.received == 6
+        assert metrics.duplicates == 1
+        assert metrics.applied == 4
+        assert metrics.missed == 1
+        assert metrics.batches == 3
+        assert [m.tag_id for m in misses] == ["GHOST"]
+        assert metrics.last_lag_seconds == 2.0
+        assert metrics.max_lag_seconds == 12.0
+        assert service.count_by_status(BaggageStatus.LOADED) == 3
+        assert service.baggage.get("TAG2").location == "BELT2"
+
+    def test_async_source(self):
+        """Test the pipeline consumes an async iterator."""
+        service = _service()
+
+        async def source():
+            for record in _scans():
+                yield record
+
+        pipeline = ScanIngestionPipeline(service, clock=lambda: T0 + timedelta(seconds=12))
+        metrics = asyncio.run(pipeline.run_async(source()))
+        assert metrics.batches == 1
+        assert metrics.applied == 4
+        assert metrics.throughput() > 0
+
+    def test_max_delay_flushes_partial_batch_on_offer_and_poll(self):
+        """Test a partial batch is flushed once it is older than max_delay."""
+        now = [T0]
+        pipeline = ScanIngestionPipeline(
+            _service(), batch_size=100, max_delay=timedelta(seconds=2), clock=lambda: now[0]
+        )
+        pipeline.offer(ScanRecord("TAG0", "BELT1", T0))
+        assert pipeline.poll() is False
+        now[0] = T0 + timedelta(seconds=3)
+        pipeline.offer(ScanRecord("TAG1", "BELT1", now[0]))
+        assert pipeline.metrics.batches == 1 and pipeline.metrics.applied == 2
+
+        pipeline.offer(ScanRecord("TAG2", "BELT1", now[0]))
+        now[0] += timedelta(seconds=2)
+        assert pipeline.poll() is True
+        assert pipeline.metrics.batches == 2 and pipeline.metrics.applied == 3
+
+    def test_max_delay_flushes_while_async_source_is_idle(self):
+        """Test scans reach the repository while a slow live feed waits for its next scan."""
+        service = _service()
+        pipeline = ScanIngestionPipeline(service, batch_size=100, max_delay=timedelta(milliseconds=20))
+
+        async def source():
+            yield ScanRecord("TAG0", "BELT1")
+            yield ScanRecord("TAG1", "BELT1")
+            while pipeline.metrics.batches == 0:
+                await asyncio.sleep(0.005)
+            yield ScanRecord("TAG2", "BELT1")
+
+        metrics = asyncio.run(asyncio.wait_for(pipeline.run_async(source()), 5))
+        assert metrics.batches == 2
+        assert metrics.applied == 3
+        assert service.count_by_status(BaggageStatus.LOADED) == 3
+
+    def test_aware_timestamps_with_default_clock(self):
+        """Test records stamped with now_utc work with the default clock and naive records."""
+        service = _service()
+        pipeline = ScanIngestionPipeline(service)
+        metrics = pipeline.run([
+            ScanRecord("TAG0", "BELT1", now_utc()),
+            ScanRecord("TAG1", "BELT1"),
+            ScanRecord("TAG0", "BELT1", now_utc().replace(tzinfo=None)),
+        ])
+        assert metrics.duplicates == 1
+        assert metrics.applied == 2
+        assert 0 <= metrics.last_lag_seconds < 60
+
+    def test_batch_reaches_the_journal_in_one_append(self, tmp_path):
+        """Test a flushed micro-batch is written as one repository batch."""
+        class CountingJournal(FileJournal):
+            appends = 0
+
+            def append_many(self, records):
+                CountingJournal.appends += 1
+                super().append_many(records)
+
+        journal = CountingJournal(tmp_path)
+        service = BaggageService(baggage=BaggageRepository(journal=journal))
+        for i in range(5):
+            service.check_in_baggage(f"TAG{i}", "BKG1", 10.0, "SFO")
+        CountingJournal.appends = 0
+
+        ScanIngestionPipeline(service, batch_size=10, clock=lambda: T0).run(
+            ScanRecord(f"TAG{i % 5}", f"BELT{i}", T0 + timedelta(seconds=i)) for i in range(8)
+        )
+        assert CountingJournal.appends == 1
+        assert service.baggage.get("TAG0").location == "BELT5"
+        assert service.count_by_status(BaggageStatus.LOADED) == 5
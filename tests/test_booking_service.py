@@ -1,7 +1,17 @@
-from airport_system.domain.enums import BookingStatus
+from airport_system.domain.booking import Booking
+from airport_system.domain.enums import BookingStatus, PaymentStatus
 from airport_system.repositories.booking_repository import BookingRepository
 from airport_system.services.booking_service import BookingService
-from airport_system.exceptions import BookingAlreadyPaidError, BookingNotFoundError
+from airport_system.exceptions import BookingAlreadyPaidError, BookingNotFoundError, PaymentDeclinedError
+from airport_system.domain.payment import CardPayment, Money, Payment
+from airport_system.repositories.payment_ledger import PaymentLedger
+from airport_system.services.payment_service import PaymentService
+
+
+def _record_payment(service, payment_id, booking_id):
+    payment = Payment(payment_id, booking_id, Money(10.0), status=PaymentStatus.COMPLETED)
+    service.payments.add(payment_id, payment)
+    return payment
 
 
 def test_create_confirm_and_cancel_booking():
@@ -23,6 +33,7 @@ def test_mark_paid_and_not_found():
 
     booking = service.create_booking("P1", "F1")
     service.confirm_booking(booking.booking_id)
+    _record_payment(service, "PAY1", booking.booking_id)
     paid = service.mark_paid(booking.booking_id, "PAY1")
     assert paid.status == BookingStatus.COMPLETED
     assert "PAY1" in paid.payment_ids
@@ -40,6 +51,8 @@ def test_mark_paid_for_finalised_booking_raises():
 
     booking = service.create_booking("P1", "F1")
     service.confirm_booking(booking.booking_id)
+    _record_payment(service, "PAY1", booking.booking_id)
+    _record_payment(service, "PAY2", booking.booking_id)
     service.mark_paid(booking.booking_id, "PAY1")
 
     try:
@@ -58,3 +71,119 @@ def test_get_bookings_for_passenger():
     bookings = service.get_bookings_for_passenger("P1")
     ids = {b.booking_id for b in bookings}
     assert b1.booking_id in ids and b2.booking_id in ids
+
+def test_create_bookings_bulk_reports_per_row():
+    import csv
+    import io
+
+    repo = BookingRepository()
+    service = BookingService(bookings=repo, bulk_batch_size=2)
+    data = io.StringIO("P1,F1\n,F1\nP2,F1\nP3\nP4, F2\n")
+    results = service.create_bookings_bulk(csv.reader(data))
+
+    assert [r.index for r in results] == [0, 1, 2, 3, 4]
+    assert [r.ok for r in results] == [True, False, True, False, True]
+    assert isinstance(results[1].error, ValueError)
+    assert results[4].booking.flight_id == "F2"
+    assert len(repo.find_by_flight("F1")) == 2
+    assert len({r.booking.booking_id for r in results if r.ok}) == 3
+
+def test_confirm_and_cancel_bookings_bulk():
+    repo = BookingRepository()
+    service = BookingService(bookings=repo)
+    created = [r.booking for r in service.create_bookings_bulk([("P1", "F1"), ("P2", "F1")])]
+    ids = [b.booking_id for b in created]
+
+    confirmed = service.confirm_bookings_bulk(ids + ["UNKNOWN"])
+    assert [r.ok for r in confirmed] == [True, True, False]
+    assert isinstance(confirmed[2].error, BookingNotFoundError)
+
+    again = service.confirm_bookings_bulk(ids[:1])
+    assert isinstance(again[0].error, ValueError)
+
+    cancelled = service.cancel_bookings_bulk(ids)
+    assert all(r.ok and r.booking.status == BookingStatus.CANCELLED for r in cancelled)
+
+
+def test_bulk_reports_unexpected_errors_per_item(monkeypatch):
+    service = BookingService(bookings=BookingRepository())
+    ids = [r.booking.booking_id for r in service.create_bookings_bulk([("P1", "F1"), ("P2", "F1")])]
+    confirm = Booking.confirm
+
+    def flaky_confirm(booking):
+        if booking.booking_id == ids[0]:
+            raise RuntimeError("storage hiccup")
+        confirm(booking)
+
+    monkeypatch.setattr(Booking, "confirm", flaky_confirm)
+    results = service.confirm_bookings_bulk(ids)
+    assert isinstance(results[0].error, RuntimeError)
+    assert results[1].ok and results[1].booking.status == BookingStatus.CONFIRMED
+    assert service.bookings.get(ids[0]).status == BookingStatus.CREATED
+
+
+def test_mark_paid_through_payment_ledger():
+    ledger = PaymentLedger()
+    payments = PaymentService(ledger=ledger)
+    service = BookingService(bookings=BookingRepository(), payments=ledger)
+    booking = service.create_booking("P1", "F1")
+    card = CardPayment(card_number="4111111111111111", holder_name="Test User", expiration="12/30")
+    payment = payments.charge_card(booking.booking_id, Money(10.0), card)
+
+    try:
+        service.mark_paid(booking.booking_id, "PAY-UNKNOWN")
+    except PaymentDeclinedError:
+        pass
+    else:
+        assert False
+    paid = service.mark_paid(booking.booking_id, payment.payment_id)
+    # повтор того же платежа поглощается, а не отклоняется
+    assert service.mark_paid(booking.booking_id, payment.payment_id) is paid
+    assert paid.payment_ids == [payment.payment_id]
+
+def test_create_bookings_bulk_reports_non_iterable_rows():
+    service = BookingService(bookings=BookingRepository())
+    results = service.create_bookings_bulk([("P1", "F1"), None, 42])
+    assert [r.ok for r in results] == [True, False, False]
+    assert all(isinstance(r.error, TypeError) for r in results[1:])
+
+def test_bulk_transitions_write_the_journal_once_per_batch(tmp_path):
+    from airport_system.repositories import ConcurrentBookingRepository
+    from airport_system.repositories.journal import FileJournal
+
+    class CountingJournal(FileJournal):
+        appends = 0
+
+        def append_many(self, records):
+            records = list(records)
+            if records:
+                CountingJournal.appends += 1
+            super().append_many(records)
+
+    for make_repo in (BookingRepository, ConcurrentBookingRepository):
+        directory = tmp_path / make_repo.__name__
+        CountingJournal.appends = 0
+        service = BookingService(bookings=make_repo(journal=CountingJournal(directory)), bulk_batch_size=50)
+        created = service.create_bookings_bulk([(f"P{i}", "F1") for i in range(100)])
+        ids = [r.booking.booking_id for r in created]
+        assert CountingJournal.appends == 2
+
+        confirmed = service.confirm_bookings_bulk(ids + ["UNKNOWN"])
+        assert [r.ok for r in confirmed].count(True) == 100
+        assert isinstance(confirmed[-1].error, BookingNotFoundError)
+        assert CountingJournal.appends == 4
+        service.bookings.close()
+
+        restored = make_repo(journal=FileJournal(directory))
+        assert all(restored.get(booking_id).status == BookingStatus.CONFIRMED for booking_id in ids)
+        restored.close()
+
+def test_bulk_transitions_on_sqlite():
+    from airport_system.repositories.sqlite_repository import SqliteBookingRepository
+
+    service = BookingService(bookings=SqliteBookingRepository())
+    ids = [r.booking.booking_id for r in service.create_bookings_bulk([("P1", "F1"), ("P2", "F1")])]
+    service.confirm_bookings_bulk(ids[:1])
+    cancelled = service.cancel_bookings_bulk(ids + ["UNKNOWN"])
+    assert [r.ok for r in cancelled] == [True, True, False]
+    assert service.bookings.get(ids[0]).status == BookingStatus.CANCELLED
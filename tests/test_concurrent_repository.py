@@ -0,0 +1,178 @@
+"""Tests for lock-striped repositories and atomic compute/update_if."""
+import threading
+import pytest
+
+from airport_system.domain.booking import Booking
+from airport_system.domain.enums import BookingStatus, PaymentStatus
+from airport_system.domain.payment import Money, Payment
+from airport_system.exceptions import BookingAlreadyPaidError
+from airport_system.repositories import BookingRepository, ConcurrentBookingRepository
+from airport_system.repositories.journal import FileJournal
+from airport_system.services.booking_service import BookingService
+
+
+class TestComputePrimitives:
+    """Tests for compute and update_if on the plain repository."""
+
+    def test_compute_adds_updates_and_removes(self):
+        """Test compute covers insert, replace and delete."""
+        repo = BookingRepository()
+        repo.compute("B1", lambda current: Booking("B1", "P1", "F1"))
+        assert repo.find_by_passenger("P1")[0].booking_id == "B1"
+        repo.compute("B1", lambda current: Booking("B1", "P2", "F1"))
+        assert repo.find_by_passenger("P1") == []
+        repo.compute("B1", lambda current: None)
+        assert repo.get("B1") is None
+
+    def test_compute_exception_leaves_item(self):
+        """Test an exception inside compute writes nothing."""
+        repo = BookingRepository()
+        repo.add("B1", Booking("B1", "P1", "F1"))
+
+        def fail(current):
+            raise ValueError("nope")
+
+        with pytest.raises(ValueError):
+            repo.compute("B1", fail)
+        assert repo.get("B1") is not None
+
+    def test_update_if(self):
+        """Test update_if only mutates when the predicate holds."""
+        repo = BookingRepository()
+        repo.add("B1", Booking("B1", "P1", "F1"))
+        is_new = lambda b: b.status == BookingStatus.CREATED
+        assert repo.update_if("B1", is_new, lambda b: b.confirm()) is True
+        assert repo.update_if("B1", is_new, lambda b: b.confirm()) is False
+        assert repo.update_if("B2", is_new, lambda b: b.confirm()) is False
+
+
+class TestConcurrentRepository:
+    """Tests for ConcurrentRepository under a thread pool."""
+
+    def test_mark_paid_has_single_winner(self):
+        """Test racing payments for one booking succeed exactly once."""
+        repo = ConcurrentBookingRepository(stripes=4)
+        service = BookingService(bookings=repo)
+        booking = service.create_booking("P1", "F1")
+        for i in range(8):
+            service.payments.add(
+                f"PAY{i}", Payment(f"PAY{i}", booking.booking_id, Money(10.0), status=PaymentStatus.COMPLETED)
+            )
+        outcomes = []
+        barrier = threading.Barrier(8)
+
+        def pay(i: int) -> None:
+            barrier.wait()
+            try:
+                service.mark_paid(booking.booking_id, f"PAY{i}")
+                outcomes.append("paid")
+            except BookingAlreadyPaidError:
+                outcomes.append("rejected")
+
+        threads = [threading.Thread(target=pay, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert outcomes.count("paid") == 1
+        assert len(repo.get(booking.booking_id).payment_ids) == 1
+
+    def test_parallel_inserts_keep_indexes_consistent(self):
+        """Test concurrent adds across stripes keep the passenger index exact."""
+        repo = ConcurrentBookingRepository(stripes=8)
+
+        def insert(worker: int) -> None:
+            for i in range(200):
+                repo.add(f"B{worker}-{i}", Booking(f"B{worker}-{i}", f"P{i % 5}", "F1"))
+
+        threads = [threading.Thread(target=insert, args=(w,)) for w in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert repo.size() == 1200
+        assert sum(repo.count_by_index("passenger", f"P{p}") for p in range(5)) == 1200
+
+    def test_invalid_stripe_count(self):
+        """Test stripes must be positive."""
+        with pytest.raises(ValueError):
+            ConcurrentBookingRepository(stripes=0)
+
+
+class _BlockingJournal(FileJournal):
+    """Journal whose first append waits until the test lets it continue."""
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def append_many(self, records):
+        records = list(records)
+        if not self.entered.is_set():
+            self.entered.set()
+            self.release.wait(5)
+        super().append_many(records)
+
+
+class TestConcurrentJournal:
+    """Tests for journal writes outside the stripe locks."""
+
+    def test_journal_io_does_not_hold_the_stripe(self, tmp_path):
+        """Test a writer stuck in journal I/O does not block mutations of the same key."""
+        journal = _BlockingJournal(tmp_path)
+        repo = ConcurrentBookingRepository(stripes=1, journal=journal)
+        first = threading.Thread(target=repo.add, args=("B1", Booking("B1", "P1", "F1")))
+        first.start()
+        assert journal.entered.wait(5)
+
+        confirmed = threading.Event()
+
+        def confirm():
+            repo.update_if("B1", lambda b: True, lambda b: b.confirm())
+            confirmed.set()
+
+        second = threading.Thread(target=confirm)
+        second.start()
+        # изменение в памяти видно, пока первая запись ещё пишется в журнал
+        for _ in range(500):
+            if repo.get("B1").status == BookingStatus.CONFIRMED:
+                break
+            threading.Event().wait(0.01)
+        assert repo.get("B1").status == BookingStatus.CONFIRMED
+        assert not confirmed.is_set()
+        journal.release.set()
+        first.join(5)
+        second.join(5)
+        assert confirmed.is_set()
+        repo.close()
+
+        restored = ConcurrentBookingRepository(journal=FileJournal(tmp_path))
+        assert restored.get("B1").status == BookingStatus.CONFIRMED
+        restored.close()
+
+    def test_parallel_writes_replay_from_journal(self, tmp_path):
+        """Test records queued by many writers replay to the same state."""
+        repo = ConcurrentBookingRepository(stripes=8, journal=FileJournal(tmp_path, snapshot_every=150))
+
+        def work(worker: int) -> None:
+            for i in range(100):
+                booking_id = f"B{worker}-{i}"
+                repo.add(booking_id, Booking(booking_id, f"P{worker}", "F1"))
+                if i % 3 == 0:
+                    repo.update_if(booking_id, lambda b: True, lambda b: b.confirm())
+                if i % 5 == 0:
+                    repo.remove(booking_id)
+
+        threads = [threading.Thread(target=work, args=(w,)) for w in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        expected = {b.booking_id: b.status for b in repo.all()}
+        repo.close()
+
+        restored = ConcurrentBookingRepository(journal=FileJournal(tmp_path))
+        assert {b.booking_id: b.status for b in restored.all()} == expected
+        assert len(expected) == 320
+        restored.close()
@@ -0,0 +1,156 @@
+"""Tests for the cached multi-currency converter."""
+import json
+import os
+from decimal import Decimal
+
+import pytest
+
+from airport_system.domain.payment import CardPayment, Money
+from airport_system.exceptions import CurrencyMismatchError
+from airport_system.services.currency_converter import CurrencyConverter
+from airport_system.services.payment_service import PaymentService
+
+CARD = CardPayment("1234567890123456", "Ann", "12/30")
+
+
+def write_rates(path, rates, as_of="2030-01-01"):
+    path.write_text(
+        json.dumps({"base": "USD", "as_of": as_of, "rates": rates, "precision": {"JPY": 0}}),
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def rate_file(tmp_path):
+    path = tmp_path / "rates.json"
+    write_rates(path, {"EUR": "0.8", "JPY": "150"})
+    return path
+
+
+@pytest.fixture
+def converter(rate_file):
+    return CurrencyConverter.from_file(rate_file)
+
+
+class TestCurrencyConverter:
+    """Tests for CurrencyConverter conversions."""
+
+    def test_convert_through_base(self, converter):
+        """Test conversions to and from the base currency."""
+        assert converter.convert(Money(100.0, "USD"), "EUR") == Money(80.0, "EUR")
+        assert converter.convert(Money(10.0, "EUR"), "USD") == Money(12.5, "USD")
+        assert converter.rate("EUR", "USD") == Decimal("1.25")
+        same = Money(5.0, "USD")
+        assert converter.convert(same, "USD") is same
+
+    def test_zero_decimal_currency(self, converter):
+        """Test JPY amounts use the precision from the rate file."""
+        yen = converter.convert(Money(1.0, "USD"), "JPY")
+        assert yen.precision == 0 and yen.minor_units == 150
+        assert converter.convert(Money(8.0, "EUR"), "JPY") == Money(1500, "JPY", precision=0)
+        assert converter.convert(Money(1, "JPY", precision=0), "USD") == Money(0.01, "USD")
+
+    def test_rounds_half_up(self, converter):
+        """Test the converted minor units are rounded half-up exactly."""
+        # 0.01 EUR = 0.0125 USD -> 0.01; 0.02 EUR = 0.025 USD -> 0.03
+        assert converter.convert(Money(0.01, "EUR"), "USD").minor_units == 1
+        assert converter.convert(Money(0.02, "EUR"), "USD").minor_units == 3
+
+    def test_convert_many_and_sum(self, converter):
+        """Test batched conversion and a mixed-currency total."""
+        amounts = [Money(10.0, "USD"), Money(8.0, "EUR"), Money(150, "JPY", precision=0), Money(4.0, "EUR")]
+        converted = converter.convert_many(amounts, "USD")
+        assert [m.to_decimal() for m in converted] == [Decimal("10.00"), Decimal("10.00"), Decimal("1.00"), Decimal("5.00")]
+        assert converter.sum(amounts, "USD") == Money(26.0, "USD")
+
+    def test_target_amounts_are_rescaled(self, converter):
+        """Test amounts already in the target currency but at another precision are rescaled, not rejected."""
+        yen = Money(100, "JPY")
+        assert yen.precision == 2
+        assert converter.convert(yen, "JPY") == Money(100, "JPY", precision=0)
+        assert converter.sum([yen, Money(1.0, "USD")], "JPY") == Money(250, "JPY", precision=0)
+
+    def test_reload_swaps_rates_and_cache_together(self, converter, rate_file):
+        """Test a reader holding the old table keeps its own factors after a reload."""
+        converter.convert(Money(10.0, "USD"), "EUR")
+        old = converter.table
+        write_rates(rate_file, {"EUR": "0.5", "JPY": "150"}, as_of="2030-01-02")
+        stat = os.stat(rate_file)
+        os.utime(rate_file, (stat.st_atime, stat.st_mtime + 60))
+        assert converter.reload() is True
+        assert old.factor("USD", 2, "EUR") == (4, 5)
+        assert converter.table.factor("USD", 2, "EUR") == (1, 2)
+
+    def test_unknown_currency(self, converter):
+        """Test a currency missing from the table is rejected."""
+        with pytest.raises(CurrencyMismatchError):
+            converter.convert(Money(1.0, "GBP"), "USD")
+
+    def test_reload_replaces_cached_rates(self, converter, rate_file):
+        """Test reload only re-reads a changed file and drops cached factors."""
+        assert converter.reload() is False
+        assert converter.convert(Money(10.0, "USD"), "EUR") == Money(8.0, "EUR")
+        write_rates(rate_file, {"EUR": "0.5", "JPY": "150"}, as_of="2030-01-02")
+        stat = os.stat(rate_file)
+        os.utime(rate_file, (stat.st_atime, stat.st_mtime + 60))
+        assert converter.reload() is True
+        assert converter.table.as_of == "2030-01-02"
+        assert converter.convert(Money(10.0, "USD"), "EUR") == Money(5.0, "EUR")
+
+    def test_rejects_non_positive_rates(self, tmp_path):
+        """Test a rate file with a zero rate fails to load."""
+        path = tmp_path / "bad.json"
+        write_rates(path, {"EUR": "0"})
+        with pytest.raises(ValueError):
+            CurrencyConverter.from_file(path)
+
+
+class TestConvertingPaymentService:
+    """Tests for PaymentService with a converter."""
+
+    def test_foreign_charge_is_converted(self, converter):
+        """Test a EUR charge is taken in USD and remembers the original amount."""
+        service = PaymentService(currency="USD", converter=converter)
+        payment = service.charge_card("B1", Money(80.0, "EUR"), CARD)
+        assert payment.is_successful()
+        assert payment.amount == Money(100.0, "USD")
+        assert payment.metadata["original_currency"] == "EUR"
+        assert payment.metadata["original_amount"] == "8000"
+
+    def test_idempotent_retry_matches_original_amount(self, converter):
+        """Test a retry in the original currency returns the same payment."""
+        service = PaymentService(currency="USD", converter=converter)
+        first = service.charge_card("B1", Money(80.0, "EUR"), CARD, idempotency_key="k1")
+        again = service.charge_card("B1", Money(80.0, "EUR"), CARD, idempotency_key="k1")
+        assert again is first
+        with pytest.raises(ValueError):
+            service.charge_card("B1", Money(100.0, "USD"), CARD, idempotency_key="k1")
+
+    def test_bulk_converts_and_reports_unknown_currency(self, converter):
+        """Test bulk charges convert per item and fail only unknown currencies."""
+        service = PaymentService(currency="USD", converter=converter)
+        results = service.charge_cards_bulk(
+            [("B1", Money(8.0, "EUR"), CARD), ("B2", Money(1.0, "GBP"), CARD), ("B3", Money(300, "JPY", precision=0), CARD)]
+        )
+        assert [r.ok for r in results] == [True, False, True]
+        assert isinstance(results[1].error, CurrencyMismatchError)
+        assert results[0].payment.amount == Money(10.0, "USD")
+        assert results[2].payment.amount == Money(2.0, "USD")
+
+    def test_bulk_converts_each_batch_at_once(self, converter, monkeypatch):
+        """Test bulk charges convert foreign amounts with one convert_many call and no per-item convert."""
+        calls = []
+        convert_many = CurrencyConverter.convert_many
+        monkeypatch.setattr(CurrencyConverter, "convert", lambda *args: calls.append("convert"))
+        monkeypatch.setattr(
+            CurrencyConverter, "convert_many", lambda *args: calls.append("convert_many") or convert_many(*args)
+        )
+        service = PaymentService(currency="USD", converter=converter)
+        results = service.charge_cards_bulk([("B1", Money(8.0, "EUR"), CARD), ("B2", Money(4.0, "EUR"), CARD)])
+        assert [r.payment.amount for r in results] == [Money(10.0, "USD"), Money(5.0, "USD")]
+        assert calls == ["convert_many"]
+
+    def test_without_converter_still_rejects(self):
+        """Test the default service keeps rejecting foreign currencies."""
+        with pytest.raises(CurrencyMismatchError):
+            PaymentService(currency="USD").charge_card("B1", Money(80.0, "EUR"), CARD)
@@ -5,7 +5,8 @@ from datetime import datetime, timedelta
 from airport_system.domain.aircraft import Aircraft, Seat
 from airport_system.domain.flight import Flight
 from airport_system.domain.booking import Booking
-from airport_system.domain.enums import SeatClass, FlightStatus, BookingStatus
+from airport_system.domain.enums import SeatClass, FlightStatus, BookingStatus, PaymentStatus
+from airport_system.domain.payment import Money, Payment
 
 
 class TestSeatExtended:
@@ -34,6 +35,38 @@ class TestSeatExtended:
         assert seat.is_premium() is True
 
 
+class TestSeatMap:
+    """Tests for the bitset seat map behind Aircraft."""
+
+    def _aircraft(self) -> Aircraft:
+        seats = [Seat(f"{row}A", SeatClass.BUSINESS) for row in range(1, 4)]
+        seats += [Seat(f"{row}A", SeatClass.ECONOMY) for row in range(10, 20)]
+        return Aircraft(registration="R1", model="A350", seats=seats)
+
+    def test_counts_per_class_follow_seat_reserve(self):
+        """Test availability counts track Seat.reserve/release."""
+        aircraft = self._aircraft()
+        assert aircraft.available_seat_count() == 13
+        assert aircraft.available_seat_count(SeatClass.BUSINESS) == 3
+        aircraft.find_seat("2A").reserve()
+        aircraft.reserve_seat("10A")
+        assert aircraft.available_seat_count(SeatClass.BUSINESS) == 2
+        assert aircraft.available_seat_count(SeatClass.ECONOMY) == 9
+        assert aircraft.available_seat_count(SeatClass.FIRST) == 0
+        aircraft.release_seat("2A")
+        assert aircraft.seat_map.is_available("2A")
+        assert [s.seat_number for s in aircraft.available_seats()][:4] == ["1A", "2A", "3A", "11A"]
+
+    def test_unknown_and_duplicate_seats(self):
+        """Test lookups of unknown seats and duplicate seat numbers."""
+        aircraft = self._aircraft()
+        assert aircraft.find_seat("99Z") is None
+        with pytest.raises(ValueError):
+            aircraft.reserve_seat("99Z")
+        with pytest.raises(ValueError):
+            aircraft.add_seat(Seat("1A", SeatClass.ECONOMY))
+
+
 class TestAircraftExtended:
     """Extended tests for Aircraft class."""
 
@@ -115,12 +148,22 @@ class TestBookingExtended:
     def test_booking_add_payment(self):
         """Test adding payment to booking."""
         booking = Booking(booking_id="B1", passenger_id="P1", flight_id="F1")
-        booking.add_payment("PAY1")
+        payment = Payment("PAY1", "B1", Money(10.0), status=PaymentStatus.COMPLETED)
+        booking.add_payment(payment)
         assert "PAY1" in booking.payment_ids
         # Adding same payment again should not duplicate
-        booking.add_payment("PAY1")
+        booking.add_payment(payment)
         assert booking.payment_ids.count("PAY1") == 1
 
+    def test_booking_add_payment_rejects_unsettled(self):
+        """Test only completed payments of the booking are attached."""
+        booking = Booking(booking_id="B1", passenger_id="P1", flight_id="F1")
+        with pytest.raises(ValueError, match="not a completed payment"):
+            booking.add_payment(Payment("PAY1", "B1", Money(10.0)))
+        with pytest.raises(ValueError, match="not a completed payment"):
+            booking.add_payment(Payment("PAY2", "B2", Money(10.0), status=PaymentStatus.COMPLETED))
+        assert booking.payment_ids == []
+
     def test_booking_add_ticket_no_duplicate(self):
         """Test adding same ticket twice doesn't duplicate."""
         booking = Booking(booking_id="B1", passenger_id="P1", flight_id="F1")
@@ -150,5 +193,5 @@ class TestBookingExtended:
         """Test has_payments method."""
         booking = Booking(booking_id="B1", passenger_id="P1", flight_id="F1")
         assert booking.has_payments() is False
-        booking.add_payment("PAY1")
+        booking.add_payment(Payment("PAY1", "B1", Money(10.0), status=PaymentStatus.COMPLETED))
         assert booking.has_payments() is True
@@ -0,0 +1,152 @@
+"""Tests for the domain event bus."""
+import asyncio
+import typing
+from datetime import datetime, timedelta
+
+import pytest
+
+from airport_system.domain import events
+from airport_system.domain.aircraft import Aircraft
+from airport_system.domain.booking import Booking
+from airport_system.domain.enums import FlightStatus
+from airport_system.domain.flight import Flight
+from airport_system.domain.payment import Money, Payment
+from airport_system.repositories.flight_repository import FlightRepository
+from airport_system.services.baggage_service import BaggageService
+from airport_system.services import event_bus
+from airport_system.services.event_bus import EventBus
+from airport_system.services.flight_service import FlightService
+
+
+@pytest.fixture
+def bus():
+    bus = EventBus()
+    bus.attach()
+    yield bus
+    bus.detach()
+
+
+def _flight() -> Flight:
+    departure = datetime(2030, 1, 1, 10, 0)
+    return Flight("FL1", "SFO", "LAX", departure, departure + timedelta(hours=2), Aircraft("R1", "A320"))
+
+
+class TestEventBus:
+    """Tests for EventBus delivery."""
+
+    def test_domain_transitions_publish_typed_events(self, bus):
+        """Test state changes of domain objects reach subscribers."""
+        received = []
+        bus.subscribe(received.extend, batch_size=1)
+
+        booking = Booking("B1", "P1", "FL1")
+        booking.confirm()
+        booking.cancel()
+        service = FlightService(flights=FlightRepository())
+        service.schedule_flight(_flight())
+        service.flights.get("FL1").delay(30)
+        service.update_status("FL1", FlightStatus.DEPARTED)
+        service.update_status("FL1", FlightStatus.ARRIVED)
+        baggage = BaggageService()
+        baggage.check_in_baggage("T1", "B1", 10.0, "SFO")
+        baggage.mark_lost("T1")
+        Payment("PAY1", "B1", Money(10.0)).mark_completed()
+
+        assert [type(e).__name__ for e in received] == [
+            "BookingConfirmed", "BookingCancelled", "FlightDelayed", "FlightDeparted",
+            "FlightArrived", "BaggageCheckedIn", "BaggageLost", "PaymentCompleted",
+        ]
+        assert received[3].was_delayed is True
+        assert received[6].last_location == "SFO"
+
+    def test_batched_and_filtered_delivery(self, bus):
+        """Test subscribers get batches of the event types they asked for."""
+        batches = []
+        bus.subscribe(batches.append, events.BookingConfirmed, batch_size=2)
+        for i in range(5):
+            Booking(f"B{i}", "P1", "F1").confirm()
+        Booking("X", "P1", "F1").cancel()
+
+        assert [len(b) for b in batches] == [2, 2]
+        bus.flush()
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_bounded_queue_drops_oldest(self):
+        """Test an overflowing queue keeps the newest events and counts drops."""
+        bus = EventBus()
+        subscription = bus.subscribe_async(None, batch_size=2, max_queue=3)
+        for i in range(5):
+            bus.publish(events.FlightArrived(f"F{i}", datetime(2030, 1, 1)))
+        assert subscription.dropped == 2
+        assert subscription.pending() == 3
+
+    def test_async_subscriber(self, bus):
+        """Test an asyncio subscriber drains events in batches."""
+        batches = []
+
+        async def handler(batch):
+            batches.append([e.booking_id for e in batch])
+
+        async def scenario():
+            subscription = bus.subscribe_async(handler, events.BookingConfirmed, batch_size=3)
+            consumer = asyncio.create_task(subscription.run())
+            await asyncio.sleep(0)
+            for i in range(4):
+                Booking(f"B{i}", "P1", "F1").confirm()
+            await asyncio.sleep(0.01)
+            subscription.close()
+            await asyncio.wait_for(consumer, 1)
+            return subscription
+
+        subscription = asyncio.run(scenario())
+        assert sum(batches, []) == ["B0", "B1", "B2", "B3"]
+        assert subscription.delivered == 4
+
+    def test_no_events_after_detach(self):
+        """Test a detached bus no longer receives domain events."""
+        bus = EventBus()
+        received = []
+        bus.subscribe(received.extend, batch_size=1)
+        bus.attach()
+        bus.detach()
+        Booking("B1", "P1", "F1").confirm()
+        assert received == [] and not events.has_sinks()
+
+    def test_failing_subscriber_does_not_break_transitions(self, bus):
+        """Test a raising subscriber is isolated from the domain object and other subscribers."""
+        received = []
+
+        def broken(batch):
+            raise RuntimeError("sink down")
+
+        failing = bus.subscribe(broken, batch_size=1)
+        bus.subscribe(received.extend, batch_size=1)
+        booking = Booking("B1", "P1", "F1")
+        booking.confirm()
+        assert booking.status.name == "CONFIRMED"
+        assert failing.failed == 1 and failing.delivered == 0
+        assert [e.booking_id for e in received] == ["B1"]
+        assert received[0].occurred_at.tzinfo is not None
+
+    def test_publish_after_async_run_finished(self, bus):
+        """Test events published after the consumer loop closed are queued, not raised."""
+        async def handler(batch):
+            pass
+
+        subscription = bus.subscribe_async(handler, batch_size=1)
+
+        async def scenario():
+            consumer = asyncio.create_task(subscription.run())
+            await asyncio.sleep(0)
+            subscription.close()
+            await asyncio.wait_for(consumer, 1)
+
+        asyncio.run(scenario())
+        Booking("B1", "P1", "F1").confirm()
+        assert subscription.pending() == 1
+
+    def test_handler_annotations_resolve(self):
+        """Test the handler type aliases used in annotations are defined."""
+        hints = typing.get_type_hints(EventBus.subscribe_async)
+        assert hints["handler"] == event_bus.AsyncBatchHandler
+        assert typing.get_type_hints(EventBus.subscribe)["handler"] == event_bus.BatchHandler
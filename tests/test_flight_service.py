@@ -66,3 +66,30 @@ def test_upcoming_and_cancel_and_find_by_route():
 
     by_route = service.find_by_route("SFO", "LAX")
     assert any(f.flight_id == "FL3" for f in by_route)
+
+def test_departures_between_is_ordered_and_follows_delay():
+    repo = FlightRepository()
+    service = FlightService(flights=repo)
+    base = datetime(2030, 1, 1, 12, 0)
+    for i, hours in enumerate((3, 1, 2)):
+        flight = create_flight(f"FL{i}")
+        flight.departure_time = base + timedelta(hours=hours)
+        flight.arrival_time = flight.departure_time + timedelta(hours=2)
+        service.schedule_flight(flight)
+
+    window = service.departures_between(base, base + timedelta(hours=2, minutes=30))
+    assert [f.flight_id for f in window] == ["FL1", "FL2"]
+
+    repo.get("FL1").delay(180)
+    window = service.departures_between(base, base + timedelta(hours=2, minutes=30))
+    assert [f.flight_id for f in window] == ["FL2"]
+    later = service.upcoming_flights(base + timedelta(hours=3))
+    assert [f.flight_id for f in later] == ["FL0", "FL1"]
+
+def test_removed_flight_is_no_longer_tracked():
+    repo = FlightRepository()
+    flight = create_flight("FL1")
+    repo.add("FL1", flight)
+    repo.remove("FL1")
+    flight.delay(30)
+    assert repo.find_active(datetime(2000, 1, 1)) == []
@@ -0,0 +1,160 @@
+"""Tests for GateAllocationService."""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from airport_system.domain.aircraft import Aircraft
+from airport_system.domain.flight import Flight
+from airport_system.domain.terminal import Gate, Terminal
+from airport_system.exceptions import FlightNotFoundError
+from airport_system.services.gate_allocation_service import GateAllocationService
+from airport_system.services.gate_occupancy_service import GateOccupancyService
+
+BASE = datetime(2030, 3, 1, 6, 0)
+DOMESTIC = frozenset({"SFO", "LAX", "JFK"})
+
+
+def _flight(flight_id: str, minutes: int, destination: str = "LAX", registration: str = "", origin: str = "SFO") -> Flight:
+    departure = BASE + timedelta(minutes=minutes)
+    aircraft = Aircraft(registration or f"R-{flight_id}", "A320")
+    return Flight(flight_id, origin, destination, departure, departure + timedelta(hours=2), aircraft)
+
+
+def _service(domestic: int = 1, international: int = 1, **kwargs) -> GateAllocationService:
+    gates = [Gate(f"D{i}", "T1") for i in range(domestic)]
+    gates += [Gate(f"I{i}", "T1", supports_international=True) for i in range(international)]
+    return GateAllocationService([Terminal("T1", gates=gates)], domestic_airports=DOMESTIC, **kwargs)
+
+
+def _assert_conflict_free(service: GateAllocationService, flights, buffer: timedelta) -> None:
+    gate_ids = {gate.gate_id for gate in map(service.gate_for, (f.flight_id for f in flights)) if gate is not None}
+    for gate_id in gate_ids:
+        slots = service.occupancy.timeline(gate_id).occupied_between(datetime.min, datetime.max)
+        for (_, end, _), (start, _, _) in zip(slots, slots[1:]):
+            assert end + buffer <= start
+        for _, _, flight_id in slots:
+            assert service.gate_for(flight_id).gate_id == gate_id
+
+
+class TestGateAllocationService:
+    """Tests for conflict-free gate allocation."""
+
+    def test_international_flights_use_international_gates(self):
+        """Test international flights never land on domestic-only gates."""
+        service = _service()
+        flights = [_flight("INT", 0, "CDG"), _flight("DOM", 0)]
+        assert service.allocate(flights) == {"INT": "I0", "DOM": "D0"}
+
+    def test_domestic_overflow_uses_international_gate_then_remote(self):
+        """Test domestic flights spill to international gates and then remote stands."""
+        service = _service()
+        assignments = service.allocate([_flight("A", 0), _flight("B", 5), _flight("C", 10)])
+        assert assignments == {"A": "D0", "B": "I0"}
+        assert service.remote_flights() == ["C"]
+
+    def test_buffer_is_respected(self):
+        """Test consecutive occupants are kept a buffer apart."""
+        service = _service(international=0, buffer=timedelta(minutes=10))
+        flights = [_flight("A", 0), _flight("B", 50), _flight("C", 60)]
+        assert service.allocate(flights) == {"A": "D0", "C": "D0"}
+        assert service.remote_flights() == ["B"]
+
+    def test_same_aircraft_keeps_gate(self):
+        """Test an aircraft's next movement prefers its previous gate."""
+        service = GateAllocationService(
+            [Terminal("T1", gates=[Gate("G1", "T1"), Gate("G2", "T1")])], airport_code="SFO"
+        )
+        inbound = _flight("IN", 0, destination="SFO", registration="N1", origin="LAX")
+        # освобождает G2 позже, чем IN освобождает G1: best-fit выбрал бы G2
+        filler = _flight("X", 180, destination="JFK")
+        outbound = _flight("OUT", 120 + 120, destination="LAX", registration="N1")
+        service.allocate([inbound, filler, outbound])
+        assert service.gate_for("IN") is service.gate_for("OUT")
+        assert service.tow_count() == 0
+
+    def test_delay_reassigns_only_the_delayed_flight(self):
+        """Test a delay moves the flight when its gate becomes busy."""
+        service = _service(domestic=2, international=0)
+        first, second = _flight("A", 0), _flight("B", 60)
+        other = _flight("C", -60)
+        assert service.allocate([first, second, other]) == {"A": "D0", "B": "D0", "C": "D0"}
+
+        first.delay(30)
+        assert service.gate_for("A").gate_id == "D1"
+        assert service.gate_for("B").gate_id == "D0"
+        _assert_conflict_free(service, [first, second, other], service.buffer)
+
+        service.apply()
+        assert first.gate_id == "D1" and first.terminal_code == "T1"
+
+    def test_delay_to_remote_and_release(self):
+        """Test a flight with no free gate after a delay goes remote; release stops tracking."""
+        service = _service(international=0)
+        first, second = _flight("A", 0), _flight("B", 120)
+        service.allocate([first, second])
+        first.delay(100)
+        assert service.remote_flights() == ["A"]
+        service.release()
+        first.delay(10)
+        with pytest.raises(FlightNotFoundError):
+            service.reassign(first)
+
+    def test_delay_moves_flight_off_closed_gate(self):
+        """Test a reassignment never keeps or picks a gate closed since allocation."""
+        service = _service(domestic=2, international=0)
+        flight = _flight("A", 0)
+        assert service.allocate([flight]) == {"A": "D0"}
+        service.terminals[0].gates[0].close()
+        flight.delay(120)
+        assert service.gate_for("A").gate_id == "D1"
+        service.terminals[0].gates[1].close()
+        flight.delay(10)
+        assert service.remote_flights() == ["A"]
+
+    def test_zero_turnaround(self):
+        """Test flights without a turnaround still get a short window and share a gate."""
+        service = _service(international=0, turnaround=timedelta(0), buffer=timedelta(0))
+        assert service.allocate([_flight("A", 0), _flight("B", 1), _flight("C", 1)]) == {"A": "D0", "B": "D0"}
+        assert service.remote_flights() == ["C"]
+
+    def test_shared_occupancy(self):
+        """Test the plan is booked in a shared occupancy service and respects its other bookings."""
+        terminal = Terminal("T1", gates=[Gate("D0", "T1"), Gate("D1", "T1")])
+        occupancy = GateOccupancyService([terminal])
+        occupancy.book("D0", "MAINT", BASE - timedelta(hours=1), BASE + timedelta(hours=1))
+        service = GateAllocationService([terminal], occupancy=occupancy)
+        flight = _flight("A", 0)
+        assert service.allocate([flight]) == {"A": "D1"}
+        assert occupancy.gate_of("A") == "D1"
+
+        terminal.add_gate(Gate("D2", "T1"))
+        terminal.gates[1].assign_flight("OTHER")
+        flight.delay(5)
+        assert service.gate_for("A").gate_id == "D2"
+        service.release()
+        assert occupancy.gate_of("A") is None
+        assert occupancy.gate_of("MAINT") == "D0"
+
+    def test_large_day_is_linearithmic_and_conflict_free(self, monkeypatch):
+        """Test 300 gates and 2000 movements allocate with one free check per movement."""
+        rng = random.Random(3)
+        gates = [Gate(f"G{i}", f"T{i % 5}", supports_international=i % 3 == 0) for i in range(300)]
+        terminals = [Terminal(f"T{t}", gates=[g for g in gates if g.terminal_code == f"T{t}"]) for t in range(5)]
+        service = GateAllocationService(terminals, domestic_airports=DOMESTIC)
+        flights = [
+            _flight(f"F{i}", rng.randrange(0, 18 * 60), rng.choice(["LAX", "JFK", "CDG"]), registration=f"N{i % 700}")
+            for i in range(2000)
+        ]
+        checks = []
+        is_free = GateOccupancyService.is_free
+        monkeypatch.setattr(GateOccupancyService, "is_free", lambda *args: checks.append(1) or is_free(*args))
+        assignments = service.allocate(flights)
+        monkeypatch.undo()
+        assert len(checks) == len(assignments)
+        assert len(assignments) + len(service.remote_flights()) == 2000
+        _assert_conflict_free(service, flights, service.buffer)
+        for flight in flights:
+            gate = service.gate_for(flight.flight_id)
+            if gate is not None and flight.destination == "CDG":
+                assert gate.supports_international
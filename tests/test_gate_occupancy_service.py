@@ -0,0 +1,112 @@
+"""Tests for GateOccupancyService."""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from airport_system.domain.terminal import Gate, GateTimeline, Terminal
+from airport_system.services.gate_occupancy_service import GateOccupancyService
+
+DAY = datetime(2030, 6, 1)
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return DAY + timedelta(hours=hour, minutes=minute)
+
+
+@pytest.fixture
+def service():
+    terminals = [
+        Terminal("T1", gates=[Gate("A1", "T1"), Gate("A2", "T1", supports_international=True)]),
+        Terminal("T2", gates=[Gate("B1", "T2")]),
+    ]
+    service = GateOccupancyService(terminals)
+    service.book("A1", "FL1", _at(13), _at(14, 30))
+    service.book("A2", "FL2", _at(15), _at(16))
+    service.book("B1", "FL3", _at(8), _at(9))
+    return service
+
+
+class TestGateOccupancyService:
+    """Tests for airport-wide gate occupancy queries."""
+
+    def test_free_gates_for_window(self, service):
+        """Test which gates are free from 14:00 to 15:30."""
+        assert [g.gate_id for g in service.free_gates(_at(14), _at(15, 30))] == ["B1"]
+        assert [g.gate_id for g in service.free_gates(_at(10), _at(12), international=True)] == ["A2"]
+
+    def test_batched_windows_and_closed_gates(self, service):
+        """Test several windows at once; closed gates are never free."""
+        service.terminals[1].gates[0].close()
+        results = service.free_gates_many([(_at(8), _at(9)), (_at(16), _at(17))])
+        assert [[g.gate_id for g in gates] for gates in results] == [["A1", "A2"], ["A1", "A2"]]
+
+    def test_booking_conflicts_and_release(self, service):
+        """Test double bookings are rejected and release frees the slot."""
+        with pytest.raises(ValueError):
+            service.book("A1", "FL9", _at(14), _at(15))
+        with pytest.raises(ValueError):
+            service.book("B1", "FL1", _at(18), _at(19))
+        with pytest.raises(KeyError):
+            service.book("Z9", "FL9", _at(18), _at(19))
+        assert service.gate_of("FL1") == "A1"
+        assert service.release("FL1") is True
+        assert service.gate_of("FL1") is None
+        service.book("A1", "FL9", _at(14), _at(15))
+
+    def test_free_windows(self, service):
+        """Test free gaps per gate over an afternoon."""
+        windows = service.free_windows(_at(12), _at(18), min_length=timedelta(hours=2))
+        assert windows == {
+            "A1": [(_at(14, 30), _at(18))],
+            "A2": [(_at(12), _at(15)), (_at(16), _at(18))],
+            "B1": [(_at(12), _at(18))],
+        }
+
+    def test_tracks_gates_added_later_and_held_gates(self, service):
+        """Test a new gate is picked up and a gate holding an unplanned flight is busy."""
+        service.terminals[1].add_gate(Gate("B2", "T2"))
+        assert [g.gate_id for g in service.free_gates(_at(8), _at(9))] == ["A1", "A2", "B2"]
+        service.book("B2", "FL4", _at(10), _at(11))
+        assert service.gate_of("FL4") == "B2"
+
+        gate = service.terminals[0].gates[0]
+        gate.assign_flight("FL8")
+        assert not service.is_free("A1", _at(8), _at(9))
+        assert "A1" not in service.free_windows(_at(8), _at(12))
+        gate.clear_flight()
+        assert service.is_free("A1", _at(8), _at(9))
+        gate.assign_flight("FL1")
+        assert service.is_free("A1", _at(8), _at(9))
+
+    def test_replaced_gate_is_tracked(self, service):
+        """Test removing one gate and adding another keeps the gate list current."""
+        terminal = service.terminals[1]
+        terminal.gates.remove(terminal.gates[0])
+        terminal.add_gate(Gate("B2", "T2"))
+        assert [g.gate_id for g in service.free_gates(_at(8), _at(9))] == ["A1", "A2", "B2"]
+        assert service.release("FL3") is True
+
+    def test_batched_queries_probe_each_gate_once_per_window(self, monkeypatch):
+        """Test a batch of 2000 windows over 300 gates costs one bisection probe per gate and window."""
+        rng = random.Random(11)
+        gates = [Gate(f"G{i}", "T1") for i in range(300)]
+        service = GateOccupancyService([Terminal("T1", gates=gates)])
+        for i, gate in enumerate(gates):
+            for slot in range(8):
+                start = _at(6 + slot * 2, rng.randrange(0, 60))
+                service.book(gate.gate_id, f"F{i}-{slot}", start, start + timedelta(minutes=50))
+        windows = []
+        for _ in range(2000):
+            start = _at(6, rng.randrange(0, 16 * 60))
+            windows.append((start, start + timedelta(minutes=rng.randrange(10, 90))))
+        probes = []
+        is_free = GateTimeline.is_free
+        monkeypatch.setattr(GateTimeline, "is_free", lambda *args: probes.append(1) or is_free(*args))
+        results = service.free_gates_many(windows)
+        monkeypatch.undo()
+        assert len(probes) == len(gates) * len(windows)
+        start, end = windows[0]
+        assert [g.gate_id for g in results[0]] == [
+            g.gate_id for g in gates if service.timeline(g.gate_id).is_free(start, end)
+        ]
@@ -0,0 +1,80 @@
+"""Tests for journal-backed repository persistence."""
+from datetime import datetime
+
+from airport_system.domain.aircraft import Aircraft
+from airport_system.domain.booking import Booking
+from airport_system.domain.enums import BookingStatus
+from airport_system.domain.flight import Flight
+from airport_system.repositories import BookingRepository, FileJournal, FlightRepository
+from airport_system.services.booking_service import BookingService
+
+
+def _booking(booking_id: str, passenger_id: str = "P1") -> Booking:
+    return Booking(booking_id=booking_id, passenger_id=passenger_id, flight_id="F1")
+
+
+class TestFileJournal:
+    """Tests for FileJournal and journaled repositories."""
+
+    def test_state_survives_restart(self, tmp_path):
+        """Test adds, mutations and removals are replayed on startup."""
+        repo = BookingRepository(journal=FileJournal(tmp_path))
+        service = BookingService(bookings=repo)
+        kept = service.create_booking("P1", "F1")
+        dropped = service.create_booking("P1", "F2")
+        service.confirm_booking(kept.booking_id)
+        repo.remove(dropped.booking_id)
+        repo.close()
+
+        restored = BookingRepository(journal=FileJournal(tmp_path))
+        assert [b.booking_id for b in restored.find_by_passenger("P1")] == [kept.booking_id]
+        assert restored.get(kept.booking_id).status == BookingStatus.CONFIRMED
+        restored.close()
+
+    def test_snapshot_compacts_journal(self, tmp_path):
+        """Test periodic snapshots truncate the log and keep the state."""
+        repo = BookingRepository(journal=FileJournal(tmp_path, snapshot_every=3))
+        for i in range(4):
+            repo.add(f"B{i}", _booking(f"B{i}"))
+        repo.close()
+
+        journal = FileJournal(tmp_path)
+        assert journal.snapshot_path.exists()
+        items = journal.load()
+        journal.close()
+        assert sorted(items) == ["B0", "B1", "B2", "B3"]
+
+    def test_torn_tail_is_discarded(self, tmp_path):
+        """Test a partially written last record does not break startup."""
+        repo = BookingRepository(journal=FileJournal(tmp_path))
+        repo.add("B1", _booking("B1"))
+        repo.close()
+        with open(tmp_path / "journal.log", "ab") as fh:
+            fh.write(b"\x10\x00\x00\x00garbage")
+
+        restored = BookingRepository(journal=FileJournal(tmp_path))
+        restored.add("B2", _booking("B2"))
+        restored.close()
+
+        again = BookingRepository(journal=FileJournal(tmp_path))
+        assert sorted(b.booking_id for b in again.all()) == ["B1", "B2"]
+        again.close()
+
+    def test_flight_delay_is_journaled(self, tmp_path):
+        """Test in-place changes reported by observable items are persisted."""
+        aircraft = Aircraft(registration="R1", model="A320")
+        flight = Flight(
+            flight_id="FL1", origin="SFO", destination="LAX",
+            departure_time=datetime(2030, 1, 1, 10, 0),
+            arrival_time=datetime(2030, 1, 1, 12, 0),
+            aircraft=aircraft,
+        )
+        repo = FlightRepository(journal=FileJournal(tmp_path))
+        repo.add("FL1", flight)
+        flight.delay(90)
+        repo.close()
+
+        restored = FlightRepository(journal=FileJournal(tmp_path))
+        assert restored.get("FL1").departure_time == datetime(2030, 1, 1, 11, 30)
+        assert restored.find_active(datetime(2030, 1, 1, 11, 0))[0].flight_id == "FL1"
+        restored.close()
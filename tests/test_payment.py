@@ -1,7 +1,9 @@
 """Extended tests for Money, CardPayment, and Payment models."""
+import pickle
+
 import pytest
 
-from airport_system.domain.payment import Money, CardPayment, Payment
+from airport_system.domain.payment import Money, CardPayment, Payment, sum_money, totals_by_currency
 from airport_system.domain.enums import PaymentStatus
 
 
@@ -230,3 +232,59 @@ class TestPayment:
         payment.add_metadata("gateway", "stripe")
         assert payment.metadata["transaction_id"] == "TXN123"
         assert payment.metadata["gateway"] == "stripe"
+
+
+class TestMoneyMinorUnits:
+    """Tests for the integer minor-unit representation of Money."""
+
+    def test_amount_is_stored_exactly(self):
+        """Test conversion to minor units rounds the written value."""
+        assert Money(amount=1.005).minor_units == 101
+        assert Money(amount="19.99").minor_units == 1999
+        assert Money(amount=5, currency="JPY", precision=0).minor_units == 5
+        assert Money.from_minor(1999).amount == 19.99
+        assert str(Money(amount=0.1).add(Money(amount=0.2)).to_decimal()) == "0.30"
+
+    def test_split_sums_to_total(self):
+        """Test splitting distributes the remainder cents."""
+        shares = Money(amount=100.0).split(3)
+        assert [s.minor_units for s in shares] == [3334, 3333, 3333]
+        assert sum_money(shares) == Money(amount=100.0)
+
+    def test_allocate_ratios(self):
+        """Test proportional allocation stays exact."""
+        shares = Money(amount=10.0).allocate_ratios([1, 1, 1, 0])
+        assert [s.minor_units for s in shares] == [334, 333, 333, 0]
+        with pytest.raises(ValueError):
+            Money(amount=10.0).allocate_ratios([0, 0])
+
+    def test_allocate_ratios_uses_largest_remainders(self):
+        """Test leftover units follow the fractional parts and skip zero ratios."""
+        assert [s.minor_units for s in Money.from_minor(1).allocate_ratios([0, 1, 1])] == [0, 1, 0]
+        assert [s.minor_units for s in Money.from_minor(10).allocate_ratios([1, 2, 3])] == [2, 3, 5]
+        assert [s.minor_units for s in Money.from_minor(-7).allocate_ratios([1, 1, 0])] == [-3, -4, 0]
+
+    def test_unpickles_amount_written_before_minor_units(self):
+        """Test Money pickled with the old float ``amount`` field still loads."""
+        old = Money.__new__(Money)
+        old.__dict__.update({"amount": 12.34, "currency": "EUR", "precision": 2})
+        restored = pickle.loads(pickle.dumps(old))
+        assert restored == Money(amount="12.34", currency="EUR")
+        assert pickle.loads(pickle.dumps(Money(amount=1.5))) == Money(amount=1.5)
+
+    def test_operators_and_mismatch(self):
+        """Test + and - and rejection of mixed currencies."""
+        assert (Money(amount=1.1) + Money(amount=2.2)).minor_units == 330
+        assert (Money(amount=1.1) - Money(amount=2.2)).minor_units == -110
+        with pytest.raises(ValueError):
+            Money(amount=1.0) + Money(amount=1.0, precision=3)
+
+    def test_sum_and_totals_by_currency(self):
+        """Test aggregate helpers over many amounts."""
+        amounts = [Money(amount=0.01)] * 1000 + [Money(amount=2.5, currency="EUR")]
+        totals = totals_by_currency(amounts)
+        assert totals["USD"].minor_units == 1000
+        assert totals["EUR"] == Money(amount=2.5, currency="EUR")
+        assert sum_money([], currency="EUR") == Money(amount=0, currency="EUR")
+        with pytest.raises(ValueError):
+            sum_money(amounts)
@@ -0,0 +1,92 @@
+"""Tests for batched payment gateways against a local fake HTTP server."""
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from airport_system.domain.enums import PaymentStatus
+from airport_system.domain.payment import CardPayment, Money
+from airport_system.exceptions import PaymentDeclinedError, PaymentGatewayError
+from airport_system.services.payment_gateway import HttpPaymentGateway
+from airport_system.services.payment_service import PaymentService
+from airport_system.utils.time_utils import now_utc
+
+GOOD = CardPayment("1234567890123456", "Ann", "12/30")
+BAD = CardPayment("123", "Bob", "12/30")
+
+
+class _FakeGatewayHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        batch = json.loads(self.rfile.read(length))["authorizations"]
+        self.server.batches.append(len(batch))
+        results = [
+            {"payment_id": item["payment_id"], "approved": item["amount"] < 10000 and len(item["card_number"]) == 16}
+            for item in batch
+        ]
+        body = json.dumps({"results": results}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def gateway_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGatewayHandler)
+    server.batches = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/authorize", server
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpPaymentGateway:
+    """Tests for HttpPaymentGateway batching."""
+
+    def test_bulk_charge_uses_one_request_per_batch(self, gateway_url):
+        """Test each batch is a single HTTP call with per-item outcomes."""
+        url, server = gateway_url
+        service = PaymentService(gateway=HttpPaymentGateway(url), batch_size=3)
+        items = [("B1", Money(10.0), GOOD), ("B2", Money(10.0), BAD), ("B3", Money(20000.0), GOOD),
+                 ("B4", Money(5.0, "EUR"), GOOD), ("B5", Money(7.0), GOOD)]
+        results = service.charge_cards_bulk(items)
+
+        assert [r.index for r in results] == [0, 1, 2, 3, 4]
+        assert [r.ok for r in results] == [True, False, False, False, True]
+        assert isinstance(results[1].error, PaymentDeclinedError)
+        assert results[1].payment.status == PaymentStatus.DECLINED
+        assert results[3].payment is None
+        assert server.batches == [3, 1]
+
+    def test_charge_card_through_http(self, gateway_url):
+        """Test single charges also go through the gateway."""
+        url, _ = gateway_url
+        service = PaymentService(gateway=HttpPaymentGateway(url))
+        assert service.charge_card("B1", Money(10.0), GOOD).status == PaymentStatus.COMPLETED
+        with pytest.raises(PaymentDeclinedError):
+            service.charge_card("B1", Money(10.0), BAD)
+
+    def test_unreachable_gateway_declines_the_batch(self, gateway_url):
+        """Test a failed gateway call is reported for every item and leaves nothing pending."""
+        url, server = gateway_url
+        server.shutdown()
+        server.server_close()
+        service = PaymentService(gateway=HttpPaymentGateway(url, timeout=1.0))
+        results = service.charge_cards_bulk([("B1", Money(10.0), GOOD), ("B2", Money(10.0), GOOD)])
+        assert all(isinstance(r.error, PaymentGatewayError) for r in results)
+        assert all(r.payment.status == PaymentStatus.DECLINED for r in results)
+        assert all(p.status == PaymentStatus.DECLINED for p in service.ledger.all())
+        with pytest.raises(PaymentGatewayError):
+            service.split_payment("B3", Money(10.0), 2, GOOD)
+        assert service.ledger.find_by_booking("B3")
+        assert all(p.status == PaymentStatus.DECLINED for p in service.ledger.find_by_booking("B3"))
+        assert service.ledger.prune(now_utc() + timedelta(seconds=1)) == 4
+        assert list(service.ledger.all()) == []
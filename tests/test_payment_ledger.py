@@ -0,0 +1,116 @@
+"""Tests for the idempotent payment ledger."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from airport_system.domain.enums import PaymentStatus
+from airport_system.domain.payment import CardPayment, Money, Payment
+from airport_system.exceptions import PaymentDeclinedError
+from airport_system.repositories.journal import FileJournal
+from airport_system.repositories.payment_ledger import PaymentLedger
+from airport_system.services.payment_gateway import InProcessGateway
+from airport_system.services.payment_service import PaymentService
+from airport_system.utils.time_utils import now_utc
+
+GOOD = CardPayment("1234567890123456", "Ann", "12/30")
+BAD = CardPayment("123", "Bob", "12/30")
+
+
+class TestPaymentLedger:
+    """Tests for PaymentLedger lookups."""
+
+    def test_claim_deduplicates_by_key(self):
+        """Test the first claim creates the payment and retries get it back."""
+        ledger = PaymentLedger()
+        first, created = ledger.claim("key-1", lambda: Payment("PAY1", "B1", Money(10.0)))
+        again, created_again = ledger.claim("key-1", lambda: Payment("PAY2", "B1", Money(10.0)))
+        assert created and not created_again
+        assert again is first and first.idempotency_key == "key-1"
+        assert ledger.size() == 1
+        assert ledger.find_by_idempotency_key("missing") is None
+
+    def test_bulk_lookup_by_booking(self):
+        """Test payments are grouped per booking."""
+        ledger = PaymentLedger()
+        ledger.add_many([
+            ("PAY1", Payment("PAY1", "B1", Money(10.0))),
+            ("PAY2", Payment("PAY2", "B2", Money(20.0))),
+            ("PAY3", Payment("PAY3", "B1", Money(30.0))),
+        ])
+        found = ledger.find_by_bookings(["B1", "B2", "B3"])
+        assert [p.payment_id for p in found["B1"]] == ["PAY1", "PAY3"]
+        assert [p.payment_id for p in found["B2"]] == ["PAY2"]
+        assert found["B3"] == []
+
+
+class TestIdempotentCharges:
+    """Tests for PaymentService retries through the ledger."""
+
+    def test_retry_with_same_key_does_not_charge_twice(self):
+        """Test a retried charge returns the original payment without a gateway call."""
+        gateway = InProcessGateway()
+        service = PaymentService(gateway=gateway)
+        first = service.charge_card("B1", Money(10.0), GOOD, idempotency_key="k1")
+        for _ in range(5):
+            assert service.charge_card("B1", Money(10.0), GOOD, idempotency_key="k1") is first
+        assert gateway.calls == 1
+        assert [status for _, status in first.status_history] == [PaymentStatus.PENDING, PaymentStatus.COMPLETED]
+        assert service.payments_for_bookings(["B1"])["B1"] == [first]
+
+    def test_retry_of_declined_charge_is_declined_again(self):
+        """Test a declined key stays declined without re-authorising."""
+        gateway = InProcessGateway()
+        service = PaymentService(gateway=gateway)
+        for _ in range(2):
+            with pytest.raises(PaymentDeclinedError):
+                service.charge_card("B1", Money(10.0), BAD, idempotency_key="k1")
+        assert gateway.calls == 1
+
+    def test_key_reused_for_other_payment(self):
+        """Test reusing a key with a different amount is rejected."""
+        service = PaymentService()
+        service.charge_card("B1", Money(10.0), GOOD, idempotency_key="k1")
+        with pytest.raises(ValueError):
+            service.charge_card("B1", Money(20.0), GOOD, idempotency_key="k1")
+
+    def test_refund_is_idempotent_and_recorded(self):
+        """Test repeated refunds keep one refund in the status history."""
+        service = PaymentService()
+        payment = service.charge_card("B1", Money(10.0), GOOD)
+        service.refund_payment(payment)
+        service.refund_payment(payment)
+        assert [status for _, status in payment.status_history] == [
+            PaymentStatus.PENDING, PaymentStatus.COMPLETED, PaymentStatus.REFUNDED,
+        ]
+        assert service.ledger.get(payment.payment_id) is payment
+
+
+class TestJournaledLedger:
+    """Tests for ledger durability and pruning."""
+
+    def test_settled_status_survives_restart(self, tmp_path):
+        """Test a retry after recovery returns the settled payment without a new authorization."""
+        service = PaymentService(ledger=PaymentLedger(journal=FileJournal(tmp_path)))
+        paid = service.charge_card("B1", Money(10.0), GOOD, idempotency_key="k1")
+        bulk = service.charge_cards_bulk([("B2", Money(5.0), GOOD), ("B3", Money(5.0), BAD)])
+        service.ledger.close()
+
+        gateway = InProcessGateway()
+        restarted = PaymentService(gateway=gateway, ledger=PaymentLedger(journal=FileJournal(tmp_path)))
+        again = restarted.charge_card("B1", Money(10.0), GOOD, idempotency_key="k1")
+        assert again.payment_id == paid.payment_id and again.status == PaymentStatus.COMPLETED
+        assert gateway.calls == 0
+        assert restarted.ledger.get(bulk[0].payment.payment_id).status == PaymentStatus.COMPLETED
+        assert restarted.ledger.get(bulk[1].payment.payment_id).status == PaymentStatus.DECLINED
+        restarted.ledger.close()
+
+    def test_prune_drops_only_settled_payments(self):
+        """Test pruning keeps pending payments and forgets settled keys."""
+        ledger = PaymentLedger()
+        service = PaymentService(ledger=ledger)
+        service.charge_card("B1", Money(10.0), GOOD, idempotency_key="k1")
+        ledger.add("PAY-PENDING", Payment("PAY-PENDING", "B2", Money(10.0)))
+        assert ledger.prune(datetime(2000, 1, 1, tzinfo=timezone.utc)) == 0
+        assert ledger.prune(now_utc() + timedelta(seconds=1)) == 1
+        assert ledger.find_by_idempotency_key("k1") is None
+        assert ledger.size() == 1
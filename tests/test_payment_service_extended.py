@@ -3,6 +3,7 @@ import pytest
 
 from airport_system.domain.payment import CardPayment, Money, Payment
 from airport_system.domain.enums import PaymentStatus
+from airport_system.services.payment_gateway import InProcessGateway
 from airport_system.services.payment_service import PaymentService
 from airport_system.exceptions import CurrencyMismatchError, InsufficientFundsError, PaymentDeclinedError
 
@@ -174,3 +175,56 @@ class TestPaymentServiceTransfer:
         amount = Money(amount=15000.0, currency="USD")  # Exceeds limit
         with pytest.raises(PaymentDeclinedError):
             service.transfer_between_cards(from_card, to_card, amount)
+
+
+class TestPaymentServiceBulk:
+    """Tests for PaymentService.charge_cards_bulk."""
+
+    def test_bulk_charge_partial_success(self):
+        """Test per-item outcomes with one gateway call per batch."""
+        gateway = InProcessGateway()
+        service = PaymentService(currency="USD", gateway=gateway, batch_size=2)
+        card = CardPayment(card_number="1234567890123456", holder_name="John Doe", expiration="12/25")
+        bad_card = CardPayment(card_number="1234", holder_name="John Doe", expiration="12/25")
+        results = service.charge_cards_bulk([
+            ("BKG1", Money(amount=50.0, currency="USD"), card),
+            ("BKG2", Money(amount=0.0, currency="USD"), card),
+            ("BKG3", Money(amount=50.0, currency="USD"), bad_card),
+            ("BKG4", Money(amount=50.0, currency="USD"), card),
+        ])
+        assert [r.ok for r in results] == [True, False, False, True]
+        assert isinstance(results[1].error, InsufficientFundsError)
+        assert isinstance(results[2].error, PaymentDeclinedError)
+        assert len({r.payment.payment_id for r in results if r.payment}) == 3
+        assert gateway.calls == 2
+
+    def test_split_payment_keeps_every_cent(self):
+        """Test an uneven split still sums to the total."""
+        service = PaymentService(currency="USD")
+        card = CardPayment(card_number="1234567890123456", holder_name="John Doe", expiration="12/25")
+        payments = service.split_payment("BKG1", Money(amount=100.0, currency="USD"), 3, card)
+        assert [p.amount.amount for p in payments] == [33.34, 33.33, 33.33]
+        assert service.settlement_totals() == {"USD": Money(amount=100.0, currency="USD")}
+
+    def test_split_payment_declined_raises(self):
+        """Test split payment surfaces a decline."""
+        service = PaymentService(currency="USD")
+        card = CardPayment(card_number="1234", holder_name="John Doe", expiration="12/25")
+        with pytest.raises(PaymentDeclinedError):
+            service.split_payment("BKG1", Money(amount=90.0, currency="USD"), 3, card)
+
+    def test_split_payment_refunds_charged_parts_on_decline(self):
+        """Test shares charged before a declined one are refunded, not left completed."""
+
+        class DeclineLast(InProcessGateway):
+            def authorize_many(self, requests):
+                approvals = super().authorize_many(requests)
+                return approvals[:-1] + [False]
+
+        service = PaymentService(currency="USD", gateway=DeclineLast())
+        card = CardPayment(card_number="1234567890123456", holder_name="John Doe", expiration="12/25")
+        with pytest.raises(PaymentDeclinedError):
+            service.split_payment("BKG1", Money(amount=90.0, currency="USD"), 3, card)
+        statuses = sorted(p.status.name for p in service.payments_for_bookings(["BKG1"])["BKG1"])
+        assert statuses == ["DECLINED", "REFUNDED", "REFUNDED"]
+        assert service.settlement_totals() == {}
@@ -88,3 +88,47 @@ class TestBookingRepository:
         
         with pytest.raises(BookingNotFoundError):
             repo.get_required("NONEXISTENT")
+
+
+class TestSecondaryIndexes:
+    """Tests for declarative hash indexes on repositories."""
+
+    def test_index_follows_update(self):
+        """Test re-keying an item moves it between index buckets."""
+        repo = BookingRepository()
+        booking = Booking(booking_id="B1", passenger_id="P1", flight_id="F1")
+        repo.add("B1", booking)
+        booking.passenger_id = "P2"
+        repo.update("B1", booking)
+
+        assert repo.find_by_passenger("P1") == []
+        assert repo.find_by_passenger("P2") == [booking]
+
+    def test_index_follows_remove(self):
+        """Test removed items disappear from indexes."""
+        repo = BookingRepository()
+        repo.add("B1", Booking(booking_id="B1", passenger_id="P1", flight_id="F1"))
+        repo.add("B2", Booking(booking_id="B2", passenger_id="P1", flight_id="F1"))
+        repo.remove("B1")
+
+        assert [b.booking_id for b in repo.find_by_passenger("P1")] == ["B2"]
+        assert repo.count_by_index("flight", "F1") == 1
+        assert repo.size() == 1
+
+    def test_update_unknown_item_raises(self):
+        """Test update requires an existing item."""
+        repo = BookingRepository()
+        with pytest.raises(KeyError):
+            repo.update("B1", Booking(booking_id="B1", passenger_id="P1", flight_id="F1"))
+
+    def test_add_index_on_populated_repository(self):
+        """Test an index registered later covers existing items."""
+        repo = BookingRepository()
+        repo.add("B1", Booking(booking_id="B1", passenger_id="P1", flight_id="F1"))
+        repo.add_index("passenger_flight", "passenger_id", "flight_id")
+
+        assert len(repo.find_by_index("passenger_flight", ("P1", "F1"))) == 1
+        with pytest.raises(ValueError):
+            repo.add_index("passenger_flight", "passenger_id")
+        with pytest.raises(KeyError):
+            repo.find_by_index("unknown", "P1")
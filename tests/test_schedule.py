@@ -1,7 +1,9 @@
 """Extended tests for DailySchedule and AirportSchedule models."""
 from datetime import datetime, timedelta, date
 
-from airport_system.domain.schedule import DailySchedule, AirportSchedule
+import random
+
+from airport_system.domain.schedule import DailySchedule, AirportSchedule, IntervalSchedule
 from airport_system.domain.aircraft import Aircraft
 from airport_system.domain.flight import Flight
 
@@ -150,3 +152,169 @@ class TestAirportSchedule:
         # Should not raise
         schedule.remove_flight("NONEXISTENT")
         assert schedule.total_flights() == 1
+
+
+class TestIntervalSchedule:
+    """Tests for the interval-indexed IntervalSchedule."""
+
+    def test_between_includes_airborne_flights(self):
+        """Test a window returns flights departing or still in the air."""
+        schedule = IntervalSchedule()
+        base = datetime(2030, 1, 1, 10, 0)
+        schedule.add_flight(_create_flight("FL1", "SFO", "LAX", base))
+        schedule.add_flight(_create_flight("FL2", "SFO", "JFK", base + timedelta(hours=3)))
+        schedule.add_flight(_create_flight("FL3", "LAX", "SFO", base + timedelta(hours=6)))
+
+        window = schedule.between(base + timedelta(hours=1), base + timedelta(hours=4))
+        assert [f.flight_id for f in window] == ["FL1", "FL2"]
+        assert schedule.between(base + timedelta(hours=2), base + timedelta(hours=3)) == []
+
+    def test_overnight_flight_belongs_to_both_days(self):
+        """Test a flight crossing midnight is returned for both dates."""
+        schedule = IntervalSchedule()
+        schedule.add_flight(_create_flight("RED", "SFO", "JFK", datetime(2030, 1, 1, 23, 0)))
+        assert [f.flight_id for f in schedule.flights_on(date(2030, 1, 1))] == ["RED"]
+        assert [f.flight_id for f in schedule.flights_on(date(2030, 1, 2))] == ["RED"]
+        assert schedule.flights_on(date(2030, 1, 3)) == []
+
+    def test_origin_destination_and_removal(self):
+        """Test route lookups and removal by id."""
+        schedule = IntervalSchedule()
+        base = datetime(2030, 1, 1, 10, 0)
+        schedule.add_flight(_create_flight("FL2", "SFO", "JFK", base + timedelta(hours=1)))
+        schedule.add_flight(_create_flight("FL1", "SFO", "LAX", base))
+        schedule.add_flight(_create_flight("FL3", "LAX", "JFK", base))
+
+        assert [f.flight_id for f in schedule.flights_from("SFO")] == ["FL1", "FL2"]
+        assert [f.flight_id for f in schedule.flights_to("JFK")] == ["FL3", "FL2"]
+        assert schedule.remove_flight("FL2").flight_id == "FL2"
+        assert schedule.remove_flight("FL2") is None
+        assert "FL2" not in schedule and schedule.size() == 2
+        assert [f.flight_id for f in schedule.flights_to("JFK")] == ["FL3"]
+
+    def test_delay_rekeys_flight(self):
+        """Test a delay moves the flight to its new interval."""
+        schedule = IntervalSchedule()
+        flight = _create_flight("FL1", "SFO", "LAX", datetime(2030, 1, 1, 22, 0))
+        schedule.add_flight(flight)
+        flight.delay(180)
+        assert schedule.flights_on(date(2030, 1, 1)) == []
+        assert schedule.flights_on(date(2030, 1, 2)) == [flight]
+        schedule.remove_flight("FL1")
+        flight.delay(10)
+        assert schedule.size() == 0
+
+    def test_matches_linear_scan(self):
+        """Test window queries agree with a brute-force scan."""
+        rng = random.Random(7)
+        schedule = IntervalSchedule()
+        base = datetime(2030, 1, 1)
+        flights = []
+        for i in range(300):
+            flight = _create_flight(f"FL{i}", "SFO", "LAX", base + timedelta(minutes=rng.randrange(0, 5000)))
+            flight.arrival_time = flight.departure_time + timedelta(minutes=rng.randrange(30, 900))
+            flights.append(flight)
+            schedule.add_flight(flight)
+        for flight in flights[::3]:
+            schedule.remove_flight(flight.flight_id)
+        remaining = [f for i, f in enumerate(flights) if i % 3]
+        for _ in range(50):
+            start = base + timedelta(minutes=rng.randrange(0, 5000))
+            end = start + timedelta(minutes=rng.randrange(1, 600))
+            expected = {f.flight_id for f in remaining if f.departure_time < end and f.arrival_time > start}
+            assert {f.flight_id for f in schedule.between(start, end)} == expected
+
+
+class TestAirportScheduleRebucketing:
+    """Tests for position-tracked removal and re-bucketing."""
+
+    def test_remove_keeps_positions_consistent(self):
+        """Test swap-removal leaves every remaining flight removable."""
+        schedule = AirportSchedule()
+        base = datetime(2030, 1, 1, 8, 0)
+        for i in range(5):
+            schedule.add_flight(_create_flight(f"FL{i}", "SFO", "LAX", base + timedelta(minutes=i)))
+
+        assert schedule.remove_flight("FL1").flight_id == "FL1"
+        assert schedule.remove_flight("FL1") is None
+        assert {f.flight_id for f in schedule.flights_on(base.date())} == {"FL0", "FL2", "FL3", "FL4"}
+        for flight_id in ("FL4", "FL0", "FL3", "FL2"):
+            schedule.remove_flight(flight_id)
+        assert schedule.total_flights() == 0
+
+    def test_delay_past_midnight_moves_bucket(self):
+        """Test a delay that crosses midnight moves the flight to the next day."""
+        schedule = AirportSchedule()
+        flight = _create_flight("FL1", "SFO", "LAX", datetime(2030, 1, 1, 23, 0))
+        other = _create_flight("FL2", "SFO", "JFK", datetime(2030, 1, 1, 9, 0))
+        schedule.add_flight(flight)
+        schedule.add_flight(other)
+
+        flight.delay(90)
+        assert schedule.flights_on(date(2030, 1, 1)) == [other]
+        assert schedule.flights_on(date(2030, 1, 2)) == [flight]
+        assert schedule.total_flights() == 2
+
+        schedule.remove_flight("FL1")
+        flight.delay(24 * 60)
+        assert schedule.total_flights() == 1
+
+    def test_readding_flight_does_not_duplicate(self):
+        """Test adding the same flight id again replaces the entry."""
+        schedule = AirportSchedule()
+        flight = _create_flight("FL1", "SFO", "LAX", datetime(2030, 1, 1, 9, 0))
+        schedule.add_flight(flight)
+        schedule.add_flight(flight)
+        assert schedule.total_flights() == 1
+
+    def test_days_passed_to_constructor_are_indexed(self):
+        """Test flights given in ``days`` can be removed and follow delays."""
+        day = date(2030, 1, 1)
+        first = _create_flight("FL1", "SFO", "LAX", datetime(2030, 1, 1, 9, 0))
+        second = _create_flight("FL2", "SFO", "JFK", datetime(2030, 1, 1, 23, 0))
+        schedule = AirportSchedule(days={day: DailySchedule(day, [first, second])})
+
+        assert schedule.remove_flight("FL1") is first
+        second.delay(120)
+        assert schedule.flights_on(day) == []
+        assert schedule.flights_on(date(2030, 1, 2)) == [second]
+
+    def test_flights_added_to_a_day_directly(self):
+        """Test flights added through a day's add_flight are indexed as they arrive."""
+        schedule = AirportSchedule()
+        base = datetime(2030, 1, 1, 8, 0)
+        schedule.add_flight(_create_flight("FL1", "SFO", "LAX", base))
+        direct = _create_flight("FL2", "SFO", "JFK", base)
+        schedule.days[base.date()].add_flight(direct)
+        schedule.days[base.date()].add_flight(direct)
+        assert schedule.total_flights() == 2
+
+        direct.delay(24 * 60)
+        assert schedule.flights_on(base.date() + timedelta(days=1)) == [direct]
+        assert schedule.remove_flight("FL2") is direct
+        assert schedule.remove_flight("FL1").flight_id == "FL1"
+        assert schedule.total_flights() == 0
+
+    def test_misses_do_not_rescan(self):
+        """Test unknown ids and stale observer callbacks never walk the day lists."""
+
+        class CountingList(list):
+            iterations = 0
+
+            def __iter__(self):
+                CountingList.iterations += 1
+                return super().__iter__()
+
+        schedule = AirportSchedule()
+        base = datetime(2030, 1, 1, 8, 0)
+        flights = [_create_flight(f"FL{i}", "SFO", "LAX", base) for i in range(3)]
+        for flight in flights:
+            schedule.add_flight(flight)
+        day = schedule.days[base.date()]
+        day.flights = CountingList(day.flights)
+
+        assert schedule.remove_flight("FL0") is flights[0]
+        assert schedule.remove_flight("NOPE") is None
+        flights[0].delay(24 * 60)
+        assert CountingList.iterations == 0
+        assert schedule.total_flights() == 2
@@ -0,0 +1,125 @@
+"""Tests for per-flight seat inventories."""
+import threading
+import pytest
+from datetime import datetime, timedelta
+
+from airport_system.domain.aircraft import Aircraft, Seat
+from airport_system.domain.enums import SeatClass
+from airport_system.domain.flight import Flight
+from airport_system.exceptions import FlightNotFoundError, SeatUnavailableError
+from airport_system.services.seat_inventory_service import SeatInventoryService
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = datetime(2030, 1, 1, 12, 0)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _aircraft() -> Aircraft:
+    seats = [Seat(f"{row}{letter}", SeatClass.ECONOMY) for row in range(10, 13) for letter in "ABCDEF"]
+    seats += [Seat("1A", SeatClass.BUSINESS), Seat("1C", SeatClass.BUSINESS)]
+    return Aircraft(registration="R1", model="A320", seats=seats)
+
+
+def _flight(flight_id: str, aircraft: Aircraft) -> Flight:
+    departure = datetime(2030, 1, 1, 15, 0)
+    return Flight(flight_id, "SFO", "LAX", departure, departure + timedelta(hours=2), aircraft)
+
+
+class TestSeatInventoryService:
+    """Tests for SeatInventoryService."""
+
+    def test_flights_sharing_aircraft_have_separate_inventories(self):
+        """Test a hold on one flight leaves the other flight and the aircraft untouched."""
+        aircraft = _aircraft()
+        service = SeatInventoryService()
+        service.open_flight(_flight("F1", aircraft))
+        service.open_flight(_flight("F2", aircraft))
+        service.hold_seats("F1", ["10A", "10B"])
+
+        assert service.available_count("F1", SeatClass.ECONOMY) == 16
+        assert service.available_count("F2", SeatClass.ECONOMY) == 18
+        assert aircraft.available_seat_count() == 20
+
+    def test_multi_seat_hold_is_atomic(self):
+        """Test a hold fails as a whole if any seat is taken."""
+        service = SeatInventoryService()
+        service.open_flight(_flight("F1", _aircraft()))
+        service.hold_seats("F1", ["10C"])
+        with pytest.raises(SeatUnavailableError):
+            service.hold_seats("F1", ["10B", "10C"])
+        with pytest.raises(SeatUnavailableError):
+            service.hold_seats("F1", ["99Z"])
+        assert service.available_count("F1") == 19
+
+    def test_hold_expiry_and_confirmation(self):
+        """Test unconfirmed holds expire and confirmed ones stay sold."""
+        clock = _Clock()
+        service = SeatInventoryService(hold_ttl=timedelta(minutes=10), clock=clock)
+        service.open_flight(_flight("F1", _aircraft()))
+        kept = service.hold_seats("F1", ["10A"])
+        lapsed = service.hold_seats("F1", ["10B"])
+        service.confirm_hold(kept)
+
+        clock.now += timedelta(minutes=11)
+        assert service.available_count("F1", SeatClass.ECONOMY) == 17
+        with pytest.raises(SeatUnavailableError):
+            service.confirm_hold(lapsed)
+        with pytest.raises(SeatUnavailableError):
+            service.hold_seats("F1", ["10A"])
+
+    def test_adjacent_search(self):
+        """Test finding and holding adjacent seats in a class."""
+        service = SeatInventoryService()
+        service.open_flight(_flight("F1", _aircraft()))
+        service.hold_seats("F1", ["10B", "11D"])
+
+        # 10C и 10D разделены проходом (схема ABC DEF)
+        assert service.find_adjacent("F1", 2, SeatClass.ECONOMY) == ["10D", "10E"]
+        hold = service.hold_adjacent("F1", 3, SeatClass.ECONOMY)
+        assert hold.seat_numbers == ("10D", "10E", "10F")
+        assert service.hold_adjacent("F1", 3, SeatClass.ECONOMY).seat_numbers == ("11A", "11B", "11C")
+        assert service.find_adjacent("F1", 2, SeatClass.BUSINESS) is None
+        with pytest.raises(SeatUnavailableError):
+            service.hold_adjacent("F1", 4, SeatClass.ECONOMY)
+
+    def test_adjacent_search_follows_aircraft_layout(self):
+        """Test seat blocks come from the aircraft layout, skipping letters it does not use."""
+        seats = [Seat(f"20{letter}", SeatClass.ECONOMY) for letter in "ACDEFGHK"]
+        aircraft = Aircraft(registration="R2", model="B777", seats=seats, seat_layout="AC DEFG HK")
+        service = SeatInventoryService()
+        service.open_flight(_flight("F1", aircraft))
+        assert service.find_adjacent("F1", 4, SeatClass.ECONOMY) == ["20D", "20E", "20F", "20G"]
+        service.hold_seats("F1", ["20A"])
+        assert service.find_adjacent("F1", 2, SeatClass.ECONOMY) == ["20D", "20E"]
+        service.hold_seats("F1", ["20E"])
+        assert service.find_adjacent("F1", 2, SeatClass.ECONOMY) == ["20F", "20G"]
+        service.hold_seats("F1", ["20F"])
+        assert service.find_adjacent("F1", 2, SeatClass.ECONOMY) == ["20H", "20K"]
+
+    def test_concurrent_holds_never_double_book(self):
+        """Test racing holds on the same seat produce exactly one winner."""
+        service = SeatInventoryService()
+        service.open_flight(_flight("F1", _aircraft()))
+        wins = []
+
+        def worker() -> None:
+            try:
+                wins.append(service.hold_seats("F1", ["11A", "11B"]))
+            except SeatUnavailableError:
+                pass
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(wins) == 1
+
+    def test_unknown_flight(self):
+        """Test operations on a flight without inventory raise."""
+        with pytest.raises(FlightNotFoundError):
+            SeatInventoryService().available_count("NOPE")
@@ -0,0 +1,90 @@
+"""Tests for the SQLite-backed repositories."""
+import pytest
+from datetime import datetime, timedelta
+
+from airport_system.domain.aircraft import Aircraft
+from airport_system.domain.booking import Booking
+from airport_system.domain.enums import BaggageStatus, BookingStatus, FlightStatus
+from airport_system.domain.flight import Flight
+from airport_system.repositories import (
+    SqliteBaggageRepository,
+    SqliteBookingRepository,
+    SqliteFlightRepository,
+)
+from airport_system.services.baggage_service import BaggageService
+from airport_system.services.booking_service import BookingService
+from airport_system.services.flight_service import FlightService
+
+
+def _flight(flight_id: str, departure: datetime, origin: str = "SFO", destination: str = "LAX") -> Flight:
+    aircraft = Aircraft(registration="R1", model="A320")
+    return Flight(
+        flight_id=flight_id, origin=origin, destination=destination,
+        departure_time=departure, arrival_time=departure + timedelta(hours=2),
+        aircraft=aircraft,
+    )
+
+
+class TestSqliteRepositories:
+    """Tests for SQLite repositories as drop-in replacements."""
+
+    def test_booking_service_persists_across_connections(self, tmp_path):
+        """Test BookingService works unchanged and state survives reopening."""
+        path = str(tmp_path / "airport.db")
+        repo = SqliteBookingRepository(path)
+        service = BookingService(bookings=repo)
+        b1 = service.create_booking("P1", "F1")
+        service.create_booking("P2", "F1")
+        service.confirm_booking(b1.booking_id)
+        repo.close()
+
+        reopened = SqliteBookingRepository(path)
+        found = reopened.find_by_passenger("P1")
+        assert [b.booking_id for b in found] == [b1.booking_id]
+        assert found[0].status == BookingStatus.CONFIRMED
+        assert reopened.size() == 2
+        reopened.close()
+
+    def test_bulk_upsert_and_identity_map(self):
+        """Test add_many writes a batch and get returns the same object."""
+        repo = SqliteBookingRepository()
+        repo.add_many((f"B{i}", Booking(f"B{i}", f"P{i % 3}", "F1")) for i in range(30))
+        assert repo.size() == 30
+        assert len(repo.find_by_passenger("P0")) == 10
+        assert repo.get("B1") is repo.get("B1")
+        assert "B1" in repo and "B99" not in repo
+        repo.remove("B1")
+        assert repo.get("B1") is None
+        with pytest.raises(KeyError):
+            repo.update("B1", Booking("B1", "P1", "F1"))
+
+    def test_flight_queries_follow_delay(self):
+        """Test route and departure queries use columns kept up to date."""
+        repo = SqliteFlightRepository()
+        service = FlightService(flights=repo)
+        base = datetime(2030, 1, 1, 8, 0)
+        service.schedule_flight(_flight("FL1", base + timedelta(hours=1)))
+        service.schedule_flight(_flight("FL2", base + timedelta(hours=2)))
+        service.schedule_flight(_flight("FL3", base + timedelta(hours=3), "JFK", "SFO"))
+
+        assert [f.flight_id for f in service.find_by_route("SFO", "LAX")] == ["FL1", "FL2"]
+        repo.get("FL1").delay(150)
+        assert [f.flight_id for f in service.upcoming_flights(base + timedelta(hours=2))] == ["FL2", "FL3", "FL1"]
+        service.cancel_flight("FL2")
+        window = repo.find_departing_between(base, base + timedelta(hours=2, minutes=30))
+        assert [(f.flight_id, f.status) for f in window] == [("FL2", FlightStatus.CANCELLED)]
+
+    def test_baggage_service_on_sqlite(self):
+        """Test BaggageService can use the SQLite baggage store."""
+        service = BaggageService(baggage=SqliteBaggageRepository())
+        service.check_in_baggage("TAG1", "BKG1", 10.0, "SFO")
+        service.check_in_baggage("TAG2", "BKG1", 12.0, "SFO")
+        service.load_to_aircraft("TAG1", "BELT")
+        assert service.count_by_status(BaggageStatus.LOADED) == 1
+        assert len(service.find_by_booking("BKG1")) == 2
+        service.retag_baggage("TAG2", "TAG3", booking_id="BKG2")
+        assert "TAG2" not in service.baggage
+        assert [i.tag.tag_id for i in service.find_by_booking("BKG2")] == ["TAG3"]
+        with pytest.raises(ValueError):
+            service.retag_baggage("TAG1", "TAG3")
+        assert service.baggage.get("TAG1").tag.tag_id == "TAG1"
@@ -0,0 +1,265 @@
+"""Tests for batch and streaming airport statistics."""
+from datetime import datetime, timedelta
+
+from airport_system.domain import events
+from airport_system.domain.aircraft import Aircraft, Seat
+from airport_system.domain.enums import FlightStatus, PaymentStatus, SeatClass
+from airport_system.domain.payment import Money, Payment
+from airport_system.domain.flight import Flight
+from airport_system.domain.terminal import Gate, Terminal
+from airport_system.repositories import BaggageRepository, BookingRepository, FlightRepository
+from airport_system.repositories.sqlite_repository import (
+    SqliteBaggageRepository,
+    SqliteBookingRepository,
+    SqliteFlightRepository,
+)
+from airport_system.services.baggage_service import BaggageService
+from airport_system.services.booking_service import BookingService
+from airport_system.services.event_bus import EventBus
+from airport_system.services.statistics_aggregator import RunningMax, StatisticsAggregator
+from airport_system.services.statistics_service import StatisticsService
+
+DAY = datetime(2030, 5, 1)
+
+
+def _flight(flight_id: str, hours: int, destination: str = "LAX") -> Flight:
+    aircraft = Aircraft("R1", "A320", seats=[Seat(f"{i}A", SeatClass.ECONOMY) for i in range(1, 5)])
+    departure = DAY + timedelta(hours=hours)
+    return Flight(flight_id, "SFO", destination, departure, departure + timedelta(hours=2), aircraft, distance_km=500)
+
+
+def _build(flights=None, bookings=None, baggage=None):
+    flights = FlightRepository() if flights is None else flights
+    bookings = BookingRepository() if bookings is None else bookings
+    baggage = BaggageRepository() if baggage is None else baggage
+    schedule = [_flight("F1", 8), _flight("F2", 10, "CDG"), _flight("F3", 30), _flight("F4", 80)]
+    schedule[0].depart()
+    schedule[1].delay(40)
+    schedule[1].depart()
+    schedule[2].cancel()
+    for flight in schedule:
+        flights.add(flight.flight_id, flight)
+
+    booking_service = BookingService(bookings=bookings)
+    baggage_service = BaggageService(baggage=baggage)
+    for passenger, flight_id in [("P1", "F1"), ("P2", "F1"), ("P3", "F2"), ("P4", "F3"), ("P5", "F4")]:
+        booking = booking_service.create_booking(passenger, flight_id)
+        baggage_service.check_in_baggage(f"T-{passenger}", booking.booking_id, 10.0, "SFO")
+    cancelled = booking_service.create_booking("P6", "F1")
+    booking_service.cancel_booking(cancelled.booking_id)
+    baggage_service.mark_lost("T-P3")
+    return flights, bookings, baggage
+
+
+class TestStatisticsService:
+    """Tests for columnar AirportStatistics computation."""
+
+    def test_compute_for_date_range(self):
+        """Test figures for a two-day window."""
+        flights, bookings, baggage = _build()
+        terminal = Terminal("T1", gates=[Gate("A1", "T1"), Gate("A2", "T1")])
+        service = StatisticsService(
+            flights, bookings, baggage, terminals=[terminal], domestic_airports=frozenset({"SFO", "LAX"})
+        )
+        stats = service.compute(DAY, DAY + timedelta(days=2))
+
+        assert stats.year == 2030
+        assert stats.total_flights == 3
+        assert stats.cancelled_flights == 1
+        assert stats.on_time_flights == 1
+        assert stats.avg_delay_minutes == 20.0
+        assert stats.international_flights == 1
+        assert stats.domestic_flights == 2
+        assert stats.total_passengers == 4
+        assert stats.max_daily_flights == 2
+        assert stats.max_daily_passengers == 3
+        assert stats.avg_load_factor == round((2 / 4 + 1 / 4 + 1 / 4) / 3, 4)
+        assert stats.lost_baggage_items == 1
+        assert stats.handled_baggage_items == 4
+        assert stats.baggage_loss_rate() == 25.0
+        assert stats.terminals == 1 and stats.gates == 2
+
+    def test_empty_range(self):
+        """Test a range without flights yields zeros."""
+        flights, bookings, baggage = _build()
+        stats = StatisticsService(flights, bookings, baggage).compute(DAY - timedelta(days=10), DAY)
+        assert stats.total_flights == 0
+        assert stats.avg_delay_minutes == 0.0
+        assert stats.avg_load_factor == 0.0
+        assert stats.on_time_percents() == 0.0
+
+    def test_columns(self):
+        """Test the column arrays line up with the flights."""
+        flights, bookings, baggage = _build()
+        columns = StatisticsService(flights, bookings, baggage).flight_columns(DAY, DAY + timedelta(days=1))
+        assert columns.flight_ids == ["F1", "F2"]
+        assert list(columns.delay_minutes) == [0, 40]
+        assert list(columns.status) == [FlightStatus.DEPARTED.value, FlightStatus.DEPARTED.value]
+        assert list(columns.flown) == [1, 1]
+        assert list(columns.load_factor) == [0.5, 0.25]
+        assert list(columns.passengers) == [2, 1]
+
+    def test_punctuality_covers_only_flown_flights(self):
+        """Test a scheduled flight is neither on time nor part of the average delay."""
+        flights, bookings, baggage = _build()
+        stats = StatisticsService(flights, bookings, baggage).compute(DAY, DAY + timedelta(days=4))
+        assert stats.total_flights == 4
+        assert stats.on_time_flights == 1
+        assert stats.avg_delay_minutes == 20.0
+
+    def test_without_domestic_airports_flights_are_unclassified(self):
+        """Test no domestic set reports neither domestic nor international flights."""
+        stats = StatisticsService(*_build()).compute(DAY, DAY + timedelta(days=2))
+        assert stats.domestic_flights == 0
+        assert stats.international_flights == 0
+
+    def test_sqlite_matches_in_memory(self):
+        """Test the bulk index lookups give the same figures on SQLite."""
+        expected = StatisticsService(*_build()).compute(DAY, DAY + timedelta(days=4))
+        repos = _build(SqliteFlightRepository(), SqliteBookingRepository(), SqliteBaggageRepository())
+        assert StatisticsService(*repos).compute(DAY, DAY + timedelta(days=4)) == expected
+
+    def test_rows_fetched_in_bulk(self):
+        """Test bookings and bags are fetched once per repository, not per flight."""
+        flights, bookings, baggage = _build()
+        calls = []
+        bookings.find_by_flight = baggage.find_by_booking = lambda key: calls.append(key)
+        StatisticsService(flights, bookings, baggage).compute(DAY, DAY + timedelta(days=4))
+        assert calls == []
+
+    def test_grouped_lookup_spans_parameter_chunks(self):
+        """Test a grouped SQLite lookup with more keys than one query may bind."""
+        repo = SqliteBookingRepository()
+        service = BookingService(bookings=repo)
+        for index in range(3):
+            service.create_booking(f"P{index}", "F1")
+        grouped = repo.find_by_flights(["F1"] + [f"X{index}" for index in range(1200)])
+        assert len(grouped["F1"]) == 3
+        assert grouped["X7"] == []
+
+
+class TestRunningMax:
+    """Tests for the O(1) running maximum."""
+
+    def test_maximum_follows_increments_and_decrements(self):
+        """Test the maximum drops once its last holder shrinks."""
+        running = RunningMax()
+        for key in ("a", "a", "a", "b", "b"):
+            running.increment(key)
+        assert running.maximum == 3
+        running.decrement("a")
+        assert running.maximum == 2
+        running.decrement("a")
+        running.decrement("b")
+        assert running.maximum == 1
+        assert running.get("a") == 1
+        running.decrement("c")
+        assert running.maximum == 1
+
+
+class TestStatisticsAggregator:
+    """Tests for streaming statistics maintained from domain events."""
+
+    def test_events_update_snapshot(self):
+        """Test flight, booking and baggage events reach the snapshot."""
+        flights, bookings, baggage = FlightRepository(), BookingRepository(), BaggageRepository()
+        for flight in (_flight("F1", 8), _flight("F2", 10), _flight("F3", 30)):
+            flights.add(flight.flight_id, flight)
+        aggregator = StatisticsAggregator(flights=flights)
+        bus = EventBus()
+        bus.subscribe(aggregator.handle, batch_size=1)
+        bus.attach()
+        try:
+            booking_service = BookingService(bookings=bookings)
+            confirmed = []
+            for passenger, flight_id in [("P1", "F1"), ("P2", "F1"), ("P3", "F2"), ("P4", "F3")]:
+                booking = booking_service.create_booking(passenger, flight_id)
+                booking_service.confirm_booking(booking.booking_id)
+                confirmed.append(booking)
+            assert aggregator.daily_passengers.maximum == 3
+
+            booking_service.cancel_booking(confirmed[0].booking_id)
+            booking_service.cancel_booking(confirmed[1].booking_id)
+
+            flights.get("F1").depart()
+            flights.get("F2").delay(30)
+            flights.get("F2").delay(10)
+            flights.get("F2").depart()
+            flights.get("F3").cancel()
+
+            baggage_service = BaggageService(baggage=baggage)
+            baggage_service.check_in_baggage("T1", confirmed[2].booking_id, 10.0, "SFO")
+            baggage_service.check_in_baggage("T2", confirmed[3].booking_id, 10.0, "SFO")
+            baggage_service.mark_lost("T1")
+            baggage_service.mark_lost("T1")
+        finally:
+            bus.detach()
+
+        stats = aggregator.snapshot(2030)
+        assert stats.total_flights == 3
+        assert stats.on_time_flights == 1
+        assert stats.cancelled_flights == 1
+        assert stats.avg_delay_minutes == 20.0
+        assert stats.total_passengers == 2
+        assert stats.max_daily_passengers == 1
+        assert stats.max_daily_flights == 2
+        assert stats.lost_baggage_items == 1
+        assert stats.handled_baggage_items == 2
+
+    def test_cancelling_unconfirmed_booking_is_ignored(self):
+        """Test only confirmed bookings count as passengers."""
+        aggregator = StatisticsAggregator()
+        aggregator.apply(events.BookingCancelled("B1", "P1", "F1"))
+        aggregator.apply(events.BookingConfirmed("B2", "P2", "F1"))
+        assert aggregator.passengers == 1
+        assert aggregator.daily_passengers.maximum == 0
+
+    def test_on_time_uses_delay_minutes(self):
+        """Test on-time and the average delay follow delay_minutes like the batch engine."""
+        aggregator = StatisticsAggregator()
+        aggregator.apply(events.FlightDeparted("F1", DAY, was_delayed=False, delay_minutes=15))
+        aggregator.apply(events.FlightDeparted("F2", DAY, was_delayed=False))
+        stats = aggregator.snapshot(2030)
+        assert stats.on_time_flights == 1
+        assert stats.avg_delay_minutes == 7.5
+
+    def test_paid_bookings_are_counted_once(self):
+        """Test a booking paid without confirmation counts, and a confirmed one is not counted twice."""
+        flights = FlightRepository()
+        flights.add("F1", _flight("F1", 8))
+        aggregator = StatisticsAggregator(flights=flights)
+        bus = EventBus()
+        bus.subscribe(aggregator.handle, batch_size=1)
+        bus.attach()
+        try:
+            service = BookingService(bookings=BookingRepository())
+            paid = service.create_booking("P1", "F1")
+            service.payments.add("PAY1", Payment("PAY1", paid.booking_id, Money(10.0), status=PaymentStatus.COMPLETED))
+            service.mark_paid(paid.booking_id, "PAY1")
+            confirmed = service.create_booking("P2", "F1")
+            service.confirm_booking(confirmed.booking_id)
+            service.payments.add(
+                "PAY2", Payment("PAY2", confirmed.booking_id, Money(10.0), status=PaymentStatus.COMPLETED)
+            )
+            service.mark_paid(confirmed.booking_id, "PAY2")
+        finally:
+            bus.detach()
+        assert aggregator.passengers == 2
+        assert aggregator.daily_passengers.maximum == 2
+        assert aggregator._open_bookings == {}
+
+    def test_state_is_dropped_once_final(self):
+        """Test departed flights and found bags leave no tracked state behind."""
+        aggregator = StatisticsAggregator()
+        aggregator.apply(events.BookingConfirmed("B1", "P1", "F1"))
+        aggregator.apply(events.FlightDeparted("F1", DAY))
+        aggregator.apply(events.BookingCancelled("B1", "P1", "F1"))
+        assert aggregator.passengers == 1
+        assert aggregator._open_bookings == {}
+
+        aggregator.apply(events.BaggageLost("T1", "SFO"))
+        aggregator.apply(events.BaggageLost("T1"))
+        assert aggregator.lost_baggage_items == 1
+        aggregator.apply(events.BaggageLoaded("T1", "BELT-1"))
+        assert aggregator.lost_baggage_items == 0
+        assert aggregator._lost_tags == set()
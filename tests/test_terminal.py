@@ -1,7 +1,10 @@
 """Extended tests for Terminal, Gate, and BoardingPass models."""
+import pickle
+from datetime import datetime, timedelta
+
 import pytest
 
-from airport_system.domain.terminal import Gate, Terminal, BoardingPass
+from airport_system.domain.terminal import Gate, GateTimeline, Terminal, BoardingPass
 from airport_system.domain.enums import SecurityLevel
 
 
@@ -165,3 +168,77 @@ class TestBoardingPass:
         )
         bp.change_gate("G5")
         assert bp.gate_id == "G5"
+
+
+class TestTerminalGatePool:
+    """Tests for the terminal free-gate pools."""
+
+    def test_pool_follows_gate_transitions(self):
+        """Test assign/clear/open/close keep the free count in sync."""
+        gate1 = Gate(gate_id="G1", terminal_code="T1")
+        gate2 = Gate(gate_id="G2", terminal_code="T1", supports_international=True)
+        terminal = Terminal(code="T1", gates=[gate1, gate2])
+        assert terminal.available_gates_count() == 2
+
+        gate1.assign_flight("FL1")
+        assert terminal.available_gates_count(international=False) == 0
+        gate2.close()
+        assert terminal.available_gates_count() == 0
+        assert terminal.find_free_gate() is None
+        gate2.open()
+        gate1.clear_flight()
+        assert terminal.available_gates_count(international=True) == 1
+        assert terminal.available_gates_count() == 2
+
+    def test_acquire_prefers_domestic_gates(self):
+        """Test domestic flights keep international gates free when possible."""
+        domestic = Gate(gate_id="D1", terminal_code="T1")
+        international = Gate(gate_id="I1", terminal_code="T1", supports_international=True)
+        terminal = Terminal(code="T1", gates=[international, domestic])
+
+        assert terminal.acquire_gate("FL1", international=True) is international
+        assert terminal.acquire_gate("FL2", international=True) is None
+        assert terminal.acquire_gate("FL3") is domestic
+        assert domestic.current_flight_id == "FL3"
+        terminal.release_gate("I1")
+        assert terminal.acquire_gate("FL4") is international
+
+    def test_pool_rebuilt_after_pickle(self):
+        """Test unpickled terminals still track their gates."""
+        terminal = Terminal(code="T1", gates=[Gate(gate_id="G1", terminal_code="T1")])
+        restored = pickle.loads(pickle.dumps(terminal))
+        restored.get_gate("G1").assign_flight("FL1")
+        assert restored.available_gates_count() == 0
+        assert terminal.available_gates_count() == 1
+
+
+class TestGateTimeline:
+    """Tests for GateTimeline occupancy intervals."""
+
+    def test_book_rejects_overlaps_and_respects_buffer(self):
+        """Test bookings cannot overlap, including the buffer."""
+        timeline = GateTimeline("G1")
+        timeline.book(datetime(2030, 1, 1, 10), datetime(2030, 1, 1, 11), "FL1")
+        with pytest.raises(ValueError):
+            timeline.book(datetime(2030, 1, 1, 10, 30), datetime(2030, 1, 1, 12), "FL2")
+        with pytest.raises(ValueError):
+            timeline.book(datetime(2030, 1, 1, 11, 5), datetime(2030, 1, 1, 12), "FL2", timedelta(minutes=10))
+        timeline.book(datetime(2030, 1, 1, 11), datetime(2030, 1, 1, 12), "FL2")
+        assert timeline.count() == 2
+
+    def test_release_and_free_windows(self):
+        """Test free windows are the gaps between occupancies."""
+        timeline = GateTimeline("G1")
+        timeline.book(datetime(2030, 1, 1, 9), datetime(2030, 1, 1, 10), "FL1")
+        timeline.book(datetime(2030, 1, 1, 12), datetime(2030, 1, 1, 13), "FL2")
+        windows = timeline.free_windows(datetime(2030, 1, 1, 9, 30), datetime(2030, 1, 1, 14))
+        assert windows == [
+            (datetime(2030, 1, 1, 10), datetime(2030, 1, 1, 12)),
+            (datetime(2030, 1, 1, 13), datetime(2030, 1, 1, 14)),
+        ]
+        assert timeline.free_windows(
+            datetime(2030, 1, 1, 9, 30), datetime(2030, 1, 1, 14), min_length=timedelta(hours=2)
+        ) == [(datetime(2030, 1, 1, 10), datetime(2030, 1, 1, 12))]
+        assert timeline.release("FL2") is True
+        assert timeline.release("FL2") is False
+        assert timeline.is_free(datetime(2030, 1, 1, 10), datetime(2030, 1, 1, 14))
@@ -1,8 +1,13 @@
 """Tests for utility modules: time_utils, validation, id_generator."""
+import multiprocessing
+import os
+import threading
 from datetime import datetime, timezone
 
 import pytest
 
+from airport_system.utils import id_generator
+from airport_system.utils.id_generator import MAX_SEQUENCE, MAX_WORKER_ID, SnowflakeGenerator, next_id, next_ids
 from airport_system.utils.time_utils import now_utc, to_iso
 from airport_system.utils.validation import ensure_not_empty, ensure_positive
 
@@ -65,3 +70,95 @@ def test_ensure_positive_negative():
     """Test ensure_positive with negative number raises ValueError."""
     with pytest.raises(ValueError, match="test_field must be positive"):
         ensure_positive(-5.0, "test_field")
+
+
+def test_snowflake_ids_are_unique_and_ordered():
+    """Test ids from one generator increase and carry their timestamp."""
+    ticks = iter([1_800_000_000_000] * 3 + [1_800_000_000_001] * 10)
+    generator = SnowflakeGenerator(worker_id=7, clock=lambda: next(ticks))
+    first = generator.next_int()
+    block = generator.next_block(5)
+    assert block == list(range(first + 1, first + 6))
+    assert SnowflakeGenerator.timestamp_ms(first) == 1_800_000_000_000
+
+
+def test_snowflake_sequence_rolls_into_next_millisecond():
+    """Test exhausting the per-millisecond sequence moves to the next tick."""
+    ticks = iter([1_800_000_000_000] * 2 + [1_800_000_000_001] * 5)
+    generator = SnowflakeGenerator(worker_id=1, clock=lambda: next(ticks))
+    ids = generator.next_block(MAX_SEQUENCE + 3)
+    assert len(set(ids)) == len(ids) == MAX_SEQUENCE + 3
+    assert ids == sorted(ids)
+    assert SnowflakeGenerator.timestamp_ms(ids[-1]) == 1_800_000_000_001
+
+
+def test_snowflake_workers_never_collide():
+    """Test different worker ids at the same instant yield different ids."""
+    clock = lambda: 1_800_000_000_000
+    a = SnowflakeGenerator(worker_id=1, clock=clock).next_block(100)
+    b = SnowflakeGenerator(worker_id=2, clock=clock).next_block(100)
+    assert not set(a) & set(b)
+    with pytest.raises(ValueError):
+        SnowflakeGenerator(worker_id=MAX_WORKER_ID + 1)
+
+
+def test_snowflake_thread_safety():
+    """Test concurrent callers never receive the same id."""
+    generator = SnowflakeGenerator(worker_id=3)
+    results = []
+
+    def work() -> None:
+        results.extend(generator.next_int() for _ in range(2000))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(results)) == 8000
+
+
+def test_next_ids_prefix():
+    """Test module-level helpers keep the prefix format."""
+    ids = next_ids("BKG", 3)
+    assert len(set(ids)) == 3 and all(i.startswith("BKG") for i in ids)
+    assert next_id("PAY").startswith("PAY")
+
+
+def _child_ids(queue, worker_id):
+    if worker_id is None:
+        try:
+            next_ids("C", 1)
+        except RuntimeError as exc:
+            queue.put((None, str(exc)))
+        return
+    id_generator.configure(worker_id)
+    queue.put((worker_id, next_ids("C", 50)))
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_children_must_configure_their_own_worker_ids():
+    """Test a forked child refuses the inherited worker id and works once configured."""
+    parent_ids = next_ids("C", 50)
+    parent_worker = id_generator._current().worker_id
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    worker_ids = [(parent_worker + offset) & MAX_WORKER_ID for offset in (1, 2)] + [None]
+    children = [context.Process(target=_child_ids, args=(queue, worker_id)) for worker_id in worker_ids]
+    for child in children:
+        child.start()
+    results = [queue.get(timeout=10) for _ in children]
+    for child in children:
+        child.join(10)
+    refused = [message for worker_id, message in results if worker_id is None]
+    assert len(refused) == 1 and "configure()" in refused[0]
+    all_ids = parent_ids + [i for worker_id, ids in results if worker_id is not None for i in ids]
+    assert len(set(all_ids)) == len(all_ids) == 150
+
+
+def test_worker_id_from_environment(monkeypatch):
+    """Test the worker id can be given through the environment."""
+    monkeypatch.setattr(id_generator, "_generator", None)
+    monkeypatch.setenv(id_generator.WORKER_ID_ENV, "42")
+    next_id("X")
+    assert id_generator._current().worker_id == 42